@@ -0,0 +1,66 @@
+"""
+Micro-benchmark voor de HTML parser backends
+
+Beschrijving:
+Meet de parse-kosten per pagina voor elke geïnstalleerde backend
+(selectolax, lxml, html.parser), zowel voor de volledige pagina als beperkt
+tot een gebied (productformulier, producttabel).
+
+Gebruik:
+    python benchmarks/parser_benchmark.py [pad/naar/pagina.html] [--herhalingen N]
+
+Zonder pad wordt login_response.html uit de projectmap gebruikt.
+"""
+import os
+import sys
+import time
+import argparse
+
+# Zorg dat we modules kunnen importeren vanuit de projectmap
+project_pad = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_pad)
+
+from modules.html_backend import maak_soup, beschikbare_backends, GEBIEDEN
+
+def meet(html, backend, gebied, herhalingen):
+    """
+    Meet de gemiddelde parsetijd van één pagina
+    
+    Args:
+        html (str): De te parsen pagina
+        backend (str): Naam van de backend
+        gebied (str): Naam van het gebied of None voor de volledige pagina
+        herhalingen (int): Aantal keer dat de pagina geparsed wordt
+    
+    Returns:
+        float: Gemiddelde tijd per pagina in milliseconden
+    """
+    # Eén keer opwarmen (imports, regex compilatie)
+    maak_soup(html, gebied=gebied, backend=backend)
+    
+    start = time.perf_counter()
+    for _ in range(herhalingen):
+        maak_soup(html, gebied=gebied, backend=backend)
+    return (time.perf_counter() - start) / herhalingen * 1000
+
+def main():
+    """Voer de benchmark uit en toon de resultaten als tabel"""
+    parser = argparse.ArgumentParser(description="Benchmark van de HTML parser backends")
+    parser.add_argument('pagina', nargs='?', default=os.path.join(project_pad, 'login_response.html'))
+    parser.add_argument('--herhalingen', type=int, default=50)
+    args = parser.parse_args()
+    
+    with open(args.pagina, 'r', encoding='utf-8', errors='replace') as f:
+        html = f.read()
+    
+    print(f"Pagina: {args.pagina} ({len(html) / 1024:.1f} KB), {args.herhalingen} herhalingen")
+    print(f"{'backend':<14}{'gebied':<20}{'ms/pagina':>12}")
+    print("-" * 46)
+    
+    for backend in beschikbare_backends():
+        for gebied in [None] + list(GEBIEDEN):
+            ms = meet(html, backend, gebied, args.herhalingen)
+            print(f"{backend:<14}{gebied or 'volledige pagina':<20}{ms:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+Doorvoer benchmark voor de RentPro synchronisatie
+
+Beschrijving:
+Start de lokale stand-in server (modules/rentpro/stand_in_server.py) in een apart
+proces en stuurt daar de echte code tegenaan: RentproHandler.haal_producten_op
+voor het ophalen, en de upload acties (bijwerken en aanmaken) voor het uploaden.
+Voor elke combinatie van catalogusgrootte, gelijktijdigheid en gesimuleerde
+vertraging worden gemeten: producten per seconde, p50/p95 latentie van de HTTP
+verzoeken en het piekgeheugen (RSS) van het proces.
+
+De resultaten worden als JSON opgeslagen in benchmarks/resultaten, zodat runs over
+de tijd vergeleken kunnen worden (--vergelijk toont het verschil met een eerdere run).
+
+Gebruik:
+    python benchmarks/sync_benchmark.py [--producten 200 1000] [--gelijktijdig 4 8 16]
+        [--vertraging 0 20 50] [--taken ophalen bijwerken aanmaken] [--vergelijk vorige.json]
+
+Met --delta meet 'ophalen' de delta sync tegen een tijdelijke productcatalogus: de
+eerste meting vult de catalogus, een volgende (bijvoorbeeld --taken ophalen ophalen)
+haalt alleen gewijzigde producten op.
+
+Het piekgeheugen wordt gemeten met psutil als dat geïnstalleerd is, anders via /proc (Linux).
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import platform
+import threading
+import tempfile
+import subprocess
+
+import pandas as pd
+
+# Zorg dat we modules kunnen importeren vanuit de projectmap
+project_pad = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_pad)
+
+try:
+    import psutil
+    PSUTIL_BESCHIKBAAR = True
+except ImportError:
+    PSUTIL_BESCHIKBAAR = False
+
+from modules.excel_handler import excelHandler
+from modules.rentpro_handler import rentproHandler
+from modules.actions.rentpro_upload import _upload_rijen
+from modules.rentpro.catalog import ProductCatalog
+import modules.actions.rentpro_upload as rentpro_upload
+
+TAKEN = ('ophalen', 'bijwerken', 'aanmaken')
+
+# Kolommen die RentproHandler.haal_producten_op vult (zie ExcelManager.update_product_row)
+SYNC_KOLOMMEN = ['ProductID', 'Naam', 'Beschrijving', 'Prijs', 'Categorie', 'Voorraad', 'Afbeelding', 'Bijgewerkt']
+
+# Kolommen voor de upload acties, met de veld-ID's in de tweede kopregel (dataframe rij 0)
+UPLOAD_KOLOMMEN = ['ProductID', 'Productnaam', 'Voorraad', 'Prijs']
+UPLOAD_VELD_IDS = ['', 'Product_Name', 'Stock', 'ProductPrice']
+
+GEBRUIKER = 'benchmark'
+WACHTWOORD = 'benchmark'
+
+def huidig_rss():
+    """
+    Geef het huidige geheugengebruik (RSS) van dit proces
+    
+    Returns:
+        int: RSS in bytes of None als het niet gemeten kan worden
+    """
+    if PSUTIL_BESCHIKBAAR:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class RssMeter(threading.Thread):
+    """
+    Meet op de achtergrond het hoogste geheugengebruik tijdens een scenario
+    """
+    
+    def __init__(self, interval=0.02):
+        """
+        Args:
+            interval (float): Seconden tussen twee metingen
+        """
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.piek = huidig_rss()
+        self._gestopt = threading.Event()
+    
+    def run(self):
+        """Meet tot stop() wordt aangeroepen"""
+        while not self._gestopt.wait(self.interval):
+            rss = huidig_rss()
+            if rss is not None and (self.piek is None or rss > self.piek):
+                self.piek = rss
+    
+    def stop(self):
+        """Stop het meten en geef de piek in MB (of None)"""
+        self._gestopt.set()
+        self.join()
+        return round(self.piek / (1024 * 1024), 1) if self.piek is not None else None
+
+class LatentieMeter:
+    """
+    Houdt de duur van elk HTTP verzoek van de transport laag bij
+    """
+    
+    def __init__(self, transport):
+        """
+        Args:
+            transport (AsyncTransport): Transport van de API handler
+        """
+        self.transport = transport
+        self.metingen = []
+    
+    def __enter__(self):
+        """Vervang transport.request door een versie die de duur meet"""
+        origineel = self.transport.request
+        
+        async def gemeten_request(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await origineel(*args, **kwargs)
+            finally:
+                self.metingen.append(time.perf_counter() - start)
+        
+        self.transport.request = gemeten_request
+        return self
+    
+    def __exit__(self, *_):
+        """Herstel het transport"""
+        # Verwijder het instantie-attribuut zodat de methode van de klasse weer geldt
+        del self.transport.request
+    
+    def percentiel(self, p):
+        """Geef het p-de percentiel van de latentie in milliseconden (nearest rank)"""
+        if not self.metingen:
+            return None
+        gesorteerd = sorted(self.metingen)
+        index = min(len(gesorteerd) - 1, max(0, int(round(p / 100 * len(gesorteerd) + 0.5)) - 1))
+        return round(gesorteerd[index] * 1000, 2)
+
+def vrije_poort():
+    """Vraag het besturingssysteem om een vrije poort"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def start_server(producten, vertraging_ms, args):
+    """
+    Start de stand-in server in een apart proces, zodat de server niet meetelt in de meting
+    
+    Returns:
+        tuple: (subprocess.Popen, base url)
+    """
+    poort = vrije_poort()
+    proces = subprocess.Popen(
+        [
+            sys.executable, '-m', 'modules.rentpro.stand_in_server',
+            '--poort', str(poort), '--producten', str(producten),
+            '--vertraging', str(vertraging_ms / 1000), '--spreiding', str(vertraging_ms / 1000 * args.spreiding),
+            '--foutkans', str(args.foutkans), '--opvulling-kb', str(args.opvulling_kb),
+            *(['--zonder-compressie'] if args.zonder_compressie else []),
+            '--gebruiker', GEBRUIKER, '--wachtwoord', WACHTWOORD
+        ],
+        cwd=project_pad, stdout=subprocess.DEVNULL
+    )
+    
+    # Wacht tot de server verbindingen accepteert
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proces.poll() is not None:
+            raise RuntimeError("Stand-in server is direct gestopt")
+        try:
+            with socket.create_connection(('127.0.0.1', poort), timeout=0.2):
+                return proces, f"http://127.0.0.1:{poort}"
+        except OSError:
+            time.sleep(0.1)
+    proces.terminate()
+    raise RuntimeError("Stand-in server start niet")
+
+def open_sheet(kolommen, rijen):
+    """Zet een dataframe klaar alsof het als Excel bestand geopend is"""
+    df = pd.DataFrame(rijen, columns=kolommen, dtype=object)
+    excelHandler.huidigDataFrame = df
+    excelHandler.kolomNamen = list(kolommen)
+    excelHandler.huidigBestand = 'benchmark.xlsx'
+    return df
+
+def bereid_handler_voor(url, gelijktijdig, args):
+    """Log in op de stand-in server en stel de handler in voor een scenario"""
+    api_handler = rentproHandler.api_handler
+    # Geen response cache, opgeslagen sessies en afbeeldingen: meet het netwerkpad en vervuil de echte opslag niet
+    api_handler.cache = None
+    api_handler.sessie_store = None
+    rentproHandler.afbeeldingen = None
+    if api_handler.concurrency is not None:
+        if args.aimd:
+            api_handler.concurrency.maximum = gelijktijdig
+            api_handler.concurrency.limiet = min(api_handler.concurrency.limiet, gelijktijdig)
+        else:
+            # Vaste gelijktijdigheid, zodat elk meetpunt precies het ingestelde niveau gebruikt
+            api_handler.concurrency = None
+            api_handler.transport.concurrency = None
+    rentproHandler.max_gelijktijdige_verzoeken = gelijktijdig
+    rentproHandler.gebruik_api_mode = True
+    rentproHandler.gebruik_mockdata = False
+    rentproHandler.ingelogd = True
+    
+    # De upload acties lezen de inloggegevens uit config/rentpro.ini; wijs ze naar de stand-in server
+    rentpro_upload.laad_inloggegevens = lambda: {'gebruikersnaam': GEBRUIKER, 'wachtwoord': WACHTWOORD, 'url': url}
+    
+    async def _login():
+        try:
+            return await api_handler.login(GEBRUIKER, WACHTWOORD, url, forceer=True)
+        finally:
+            await api_handler.close()
+    
+    if not asyncio.run(_login()):
+        raise RuntimeError(f"Inloggen op de stand-in server ({url}) mislukt")
+
+def voer_scenario(taak, producten, gelijktijdig, ronde):
+    """
+    Voer één meting uit
+    
+    Args:
+        taak (str): 'ophalen', 'bijwerken' of 'aanmaken'
+        producten (int): Aantal producten (rijen) in de sheet
+        gelijktijdig (int): Maximum aantal producten tegelijk
+        ronde (int): Volgnummer van de meting, zodat elke upload echt iets wijzigt
+    
+    Returns:
+        dict: Meetresultaat
+    """
+    if taak == 'ophalen':
+        df = open_sheet(SYNC_KOLOMMEN, [[str(i)] + [''] * 7 for i in range(1, producten + 1)])
+    else:
+        rijen = [UPLOAD_VELD_IDS] + [
+            [str(i), f"Product {i} r{ronde}", str((i + ronde) % 250), f"{i % 500 + 1},{ronde % 100:02d}"]
+            for i in range(1, producten + 1)
+        ]
+        df = open_sheet(UPLOAD_KOLOMMEN, rijen)
+    
+    transport = rentproHandler.api_handler.transport
+    rss = RssMeter()
+    rss.start()
+    with LatentieMeter(transport) as latentie:
+        start = time.perf_counter()
+        if taak == 'ophalen':
+            async def _ophalen():
+                try:
+                    return await rentproHandler.haal_producten_op(True)
+                finally:
+                    await rentproHandler.close()
+            
+            asyncio.run(_ophalen())
+            succesvol = int((df['Naam'] != '').sum())
+        else:
+            statistieken, _ = _upload_rijen(
+                UPLOAD_KOLOMMEN[1:],
+                product_id_kolom='ProductID' if taak == 'bijwerken' else None,
+                max_gelijktijdig=gelijktijdig
+            )
+            succesvol = statistieken['succesvol'] if statistieken else 0
+        duur = time.perf_counter() - start
+    
+    return {
+        'taak': taak,
+        'producten': producten,
+        'gelijktijdig': gelijktijdig,
+        'duur_s': round(duur, 3),
+        'succesvol': succesvol,
+        'mislukt': producten - succesvol,
+        'producten_per_seconde': round(succesvol / duur, 2) if duur > 0 else 0.0,
+        'verzoeken': len(latentie.metingen),
+        'latentie_p50_ms': latentie.percentiel(50),
+        'latentie_p95_ms': latentie.percentiel(95),
+        'piek_rss_mb': rss.stop(),
+        # Verkeer van de laatste bulktaak (de handler zet de tellers aan het begin op nul)
+        'mb_over_de_lijn': round(transport.statistieken['bytes_ontvangen'] / 1048576, 2),
+        'mb_uitgepakt': round(transport.statistieken['bytes_uitgepakt'] / 1048576, 2),
+        'verbindingen_geopend': transport.statistieken['verbindingen_geopend']
+    }
+
+def git_versie():
+    """Geef de huidige git commit (kort), of None buiten een git repository"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_pad,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def scenario_sleutel(resultaat):
+    """Sleutel om hetzelfde meetpunt in twee runs te vinden"""
+    return (resultaat['taak'], resultaat['producten'], resultaat['gelijktijdig'], resultaat['vertraging_ms'])
+
+def toon_resultaten(resultaten, vorige=None):
+    """Toon de resultaten als tabel, met het verschil ten opzichte van een vorige run"""
+    vorige_per_sleutel = {scenario_sleutel(r): r for r in (vorige or [])}
+    
+    print(f"{'taak':<11}{'producten':>10}{'gelijkt.':>9}{'vertr.ms':>9}{'prod/s':>9}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'rss MB':>9}{'lijn MB':>9}{'verb.':>7}{'mislukt':>9}{'vs vorig':>10}")
+    print("-" * 110)
+    for r in resultaten:
+        verschil = ""
+        eerder = vorige_per_sleutel.get(scenario_sleutel(r))
+        if eerder and eerder['producten_per_seconde']:
+            verschil = f"{(r['producten_per_seconde'] / eerder['producten_per_seconde'] - 1) * 100:+.1f}%"
+        print(
+            f"{r['taak']:<11}{r['producten']:>10}{r['gelijktijdig']:>9}{r['vertraging_ms']:>9}"
+            f"{r['producten_per_seconde']:>9.1f}{r['latentie_p50_ms'] or 0:>9.1f}{r['latentie_p95_ms'] or 0:>9.1f}"
+            f"{r['piek_rss_mb'] or 0:>9.1f}{r['mb_over_de_lijn']:>9.2f}{r['verbindingen_geopend']:>7}"
+            f"{r['mislukt']:>9}{verschil:>10}"
+        )
+
+def main():
+    """Voer alle scenario's uit en sla de resultaten op als JSON"""
+    parser = argparse.ArgumentParser(description="Doorvoer benchmark van de RentPro synchronisatie")
+    parser.add_argument('--producten', type=int, nargs='+', default=[200, 1000], help="Catalogusgroottes")
+    parser.add_argument('--gelijktijdig', type=int, nargs='+', default=[4, 8, 16], help="Gelijktijdigheidsniveaus")
+    parser.add_argument('--vertraging', type=int, nargs='+', default=[0, 20, 50], help="Serververtraging in ms")
+    parser.add_argument('--taken', nargs='+', choices=TAKEN, default=list(TAKEN))
+    parser.add_argument('--spreiding', type=float, default=0.2, help="Willekeurige extra vertraging (fractie)")
+    parser.add_argument('--foutkans', type=float, default=0.0, help="Kans op een 503 van de server")
+    parser.add_argument('--opvulling-kb', type=int, default=30, help="Extra paginagrootte van de server")
+    parser.add_argument('--aimd', action='store_true', help="Laat de AIMD controller de limiet bepalen (tot het niveau)")
+    parser.add_argument('--zonder-compressie', action='store_true', help="Laat de server pagina's ongecomprimeerd sturen")
+    parser.add_argument('--delta', action='store_true', help="Meet het ophalen met delta sync (tijdelijke catalogus)")
+    parser.add_argument('--uitvoer', help="JSON bestand voor de resultaten (standaard in benchmarks/resultaten)")
+    parser.add_argument('--vergelijk', help="JSON bestand van een eerdere run om mee te vergelijken")
+    args = parser.parse_args()
+    
+    # De echte catalogus blijft buiten de meting; delta sync krijgt een tijdelijke catalogus voor de hele run
+    rentproHandler.catalogus = None
+    rentproHandler.api_instellingen['delta_sync'] = args.delta
+    if args.delta:
+        rentproHandler.catalogus = ProductCatalog(
+            os.path.join(tempfile.mkdtemp(prefix='rentpro_benchmark_'), 'catalogus.sqlite')
+        )
+    
+    resultaten = []
+    ronde = 0
+    for vertraging_ms in args.vertraging:
+        # Eén server per vertraging, met genoeg producten voor de grootste catalogus
+        proces, url = start_server(max(args.producten), vertraging_ms, args)
+        try:
+            for producten in args.producten:
+                for gelijktijdig in args.gelijktijdig:
+                    bereid_handler_voor(url, gelijktijdig, args)
+                    for taak in args.taken:
+                        ronde += 1
+                        print(f"[{taak}] {producten} producten, {gelijktijdig} gelijktijdig, {vertraging_ms} ms vertraging...")
+                        resultaat = voer_scenario(taak, producten, gelijktijdig, ronde)
+                        resultaat['vertraging_ms'] = vertraging_ms
+                        resultaten.append(resultaat)
+        finally:
+            proces.terminate()
+            proces.wait()
+    
+    run = {
+        'tijdstip': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'git': git_versie(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'instellingen': {
+            'spreiding': args.spreiding, 'foutkans': args.foutkans,
+            'opvulling_kb': args.opvulling_kb, 'aimd': args.aimd,
+            'compressie': not args.zonder_compressie, 'delta': args.delta,
+            'transport': type(rentproHandler.api_handler.transport).__name__,
+            'parse_processen': rentproHandler.api_handler.parse_pool.processen,
+            'parse_werkers': rentproHandler.api_handler.parse_pool.werkers
+        },
+        'resultaten': resultaten
+    }
+    
+    uitvoer = args.uitvoer or os.path.join(
+        project_pad, 'benchmarks', 'resultaten', f"sync_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(uitvoer)), exist_ok=True)
+    with open(uitvoer, 'w', encoding='utf-8') as f:
+        json.dump(run, f, indent=2)
+    
+    vorige = None
+    if args.vergelijk:
+        with open(args.vergelijk, 'r', encoding='utf-8') as f:
+            vorige = json.load(f).get('resultaten')
+    
+    print()
+    toon_resultaten(resultaten, vorige)
+    print(f"\nResultaten opgeslagen in {uitvoer}")
+
+if __name__ == "__main__":
+    main()
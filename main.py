@@ -5,7 +5,7 @@ Een applicatie in 1001 Nachten-stijl voor het bewerken van Excel-bestanden
 import os
 import sys
 import traceback
-import tkinter as tk
+import multiprocessing
 
 # Zorg dat we modules kunnen importeren
 if getattr(sys, 'frozen', False):
@@ -18,14 +18,16 @@ else:
 # Voeg applicatiemap toe aan sys.path
 sys.path.insert(0, application_path)
 
-# Importeer modules
-from modules.logger import logger
+# Alles met bijwerkingen (logger, stdout redirect, GUI, opruimen) gebeurt pas in main():
+# parse processen (zie modules/rentpro/parse_pool.py) importeren dit bestand opnieuw bij het starten
 
 # Exceptie handler voor onafgehandelde excepties
 def exceptie_handler(exc_type, exc_value, exc_traceback):
     """
     Globale exceptie handler die alle onafgehandelde excepties naar het logbestand schrijft
     """
+    from modules.logger import logger
+    
     # Formatteer de exceptie met volledige traceback
     exceptie_details = ''.join(traceback.format_exception(exc_type, exc_value, exc_traceback))
     logger.logFout(f"Onafgehandelde exceptie:\n{exceptie_details}")
@@ -62,27 +64,30 @@ class LogRedirector:
             self.buffer = ""
         self.originele_stream.flush()
 
-# Installeer de globale exceptie handler
-sys.excepthook = exceptie_handler
-
-# Redirect stdout en stderr naar het logbestand
-sys.stdout = LogRedirector(logger.logInfo, sys.__stdout__)
-sys.stderr = LogRedirector(logger.logFout, sys.__stderr__)
-
-from modules.gui import ExcelladinApp
-from modules.helpers import clean_pycache
-
-import ctypes
-if os.name == 'nt':  # Als we op Windows draaien
-    # Verberg het console venster
-    console_venster = ctypes.windll.kernel32.GetConsoleWindow()
-    ctypes.windll.user32.ShowWindow(console_venster, 0)
-
-# Verwijder Python cache bestanden
-clean_pycache()
-
 def main():
     """Start de Excelladin Reloaded applicatie"""
+    import tkinter as tk
+    from modules.logger import logger
+    
+    # Installeer de globale exceptie handler
+    sys.excepthook = exceptie_handler
+    
+    # Redirect stdout en stderr naar het logbestand
+    sys.stdout = LogRedirector(logger.logInfo, sys.__stdout__)
+    sys.stderr = LogRedirector(logger.logFout, sys.__stderr__)
+    
+    from modules.gui import ExcelladinApp
+    from modules.helpers import clean_pycache
+    
+    import ctypes
+    if os.name == 'nt':  # Als we op Windows draaien
+        # Verberg het console venster
+        console_venster = ctypes.windll.kernel32.GetConsoleWindow()
+        ctypes.windll.user32.ShowWindow(console_venster, 0)
+    
+    # Verwijder Python cache bestanden
+    clean_pycache()
+    
     logger.logInfo("Excelladin Reloaded wordt opgestart")
     
     # Patch functionaliteit verwijderd om stabiliteitsproblemen te voorkomen
@@ -101,4 +106,6 @@ def main():
         logger.logInfo("Applicatie afgesloten")
 
 if __name__ == "__main__":
+    # In de executable start een parse proces anders opnieuw de hele applicatie
+    multiprocessing.freeze_support()
     main()
@@ -16,6 +16,7 @@ from modules.actions.rentpro_upload import (
     RentProBulkUploadActie,
     RentProUpdateActie
 )
+from modules.actions.rentpro_sync import RentProSynchroniserenActie, RentProCatalogiVerversenActie
 
 class ActieResultaat:
     """Resultaat van een actie"""
@@ -260,6 +261,10 @@ BESCHIKBARE_ACTIES = {
     "rentProUpload": RentProUploadActie(),
     "rentProBulkUpload": RentProBulkUploadActie(),
     "rentProUpdate": RentProUpdateActie(),
+    
+    # RentPro synchronisatie
+    "rentProSynchroniseren": RentProSynchroniserenActie(),
+    "rentProCatalogiVerversen": RentProCatalogiVerversenActie(),
 }
 
 def haalActieOp(actieNaam):
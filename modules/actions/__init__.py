@@ -10,6 +10,7 @@ from modules.actions.rentpro_upload import (
     RentProBulkUploadActie,
     RentProUpdateActie
 )
+from modules.actions.rentpro_sync import RentProSynchroniserenActie, RentProCatalogiVerversenActie
 
 # Importeer de benodigde variabelen en functies uit het actions.py bestand
 import sys
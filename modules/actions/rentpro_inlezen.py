@@ -1,12 +1,98 @@
 """
 RentPro inlezen module voor Excelladin Reloaded
 Verantwoordelijk voor het inlezen van data uit RentPro
+
+Producten worden zonder browser ingelezen: de Product/Edit pagina's worden via HTTP
+gelijktijdig opgehaald en geparsed (zie modules/rentpro/pipeline.py). Zoeken gaat via
+het zoekformulier van het productoverzicht; gevonden producten worden al opgehaald
+terwijl de volgende resultaatpagina nog laadt. De koppeling tussen kolommen en
+formuliervelden komt uit de tweede kopregel van de sheet, net als bij het uploaden.
 """
 import asyncio
 from modules.logger import logger
 from modules.excel_handler import excelHandler
 from modules.actions.base import ActieBasis, ActieResultaat
-from modules.actions.rentpro import RentProConnector, run_async
+from modules.rentpro.config import laad_inloggegevens
+from modules.rentpro_handler import rentproHandler
+
+def _lees_in(doelKolommen, rijen=None, product_ids=None, zoekterm=None, max_resultaten=None):
+    """
+    Haal producten op uit RentPro en vul de doelkolommen, één product per rij
+    
+    Args:
+        doelKolommen (list): Kolommen die gevuld worden
+        rijen (tuple): Optioneel, tuple met (startRij, eindRij)
+        product_ids (list, optional): Product IDs om in te lezen, in volgorde vanaf de eerste rij
+        zoekterm (str, optional): Zoekterm; de gevonden producten worden vanaf de eerste rij ingelezen
+        max_resultaten (int, optional): Maximum aantal zoekresultaten
+    
+    Returns:
+        tuple: (statistieken dict of None, foutmelding of None)
+    """
+    veld_mapping, eerste_datarij = rentproHandler.excel_manager.get_field_mapping()
+    if not veld_mapping:
+        return None, "Geen veld-ID's gevonden: de tweede kopregel moet de RentPro veld-ID's bevatten"
+    
+    mapping = {kolom: veld_mapping[kolom] for kolom in doelKolommen if kolom in veld_mapping}
+    for kolom in doelKolommen:
+        if kolom not in veld_mapping:
+            logger.logWaarschuwing(f"Geen veld-ID voor kolom '{kolom}', kolom wordt overgeslagen")
+    if not mapping:
+        return None, "Geen van de doelkolommen heeft een RentPro veld-ID"
+    kolom_indexen = {kolom: excelHandler.kolomNamen.index(kolom) for kolom in mapping}
+    
+    # Bepaal het bereik, de rij met veld-ID's is geen product
+    if rijen:
+        startRij, eindRij = rijen
+    else:
+        startRij, eindRij = 0, excelHandler.haalRijAantal() - 1
+    startRij = max(startRij, eerste_datarij)
+    aantalRijen = eindRij - startRij + 1
+    if aantalRijen <= 0:
+        return None, "Geen rijen beschikbaar om producten in te lezen"
+    
+    if product_ids is not None and len(product_ids) > aantalRijen:
+        return None, f"Niet genoeg rijen beschikbaar. Nodig: {len(product_ids)}, Beschikbaar: {aantalRijen}"
+    if zoekterm is not None and (not max_resultaten or max_resultaten > aantalRijen):
+        if max_resultaten:
+            logger.logWaarschuwing(
+                f"Maximaal {aantalRijen} resultaten passen in de beschikbare rijen, "
+                f"niet alle {max_resultaten} worden ingelezen"
+            )
+        max_resultaten = aantalRijen
+    
+    credentials = laad_inloggegevens()
+    if not credentials:
+        return None, "Geen RentPro inloggegevens gevonden in config/rentpro.ini"
+    
+    def _schrijf(rij_index, product_data):
+        velden = product_data.get('velden', {})
+        gevuld = False
+        for kolom, veld_id in mapping.items():
+            if veld_id in velden:
+                gevuld = excelHandler.setCellValue(rij_index, kolom_indexen[kolom], velden[veld_id]) or gevuld
+        return gevuld
+    
+    async def _voer_uit():
+        try:
+            logger.logInfo("Verbinden met RentPro...")
+            if not await rentproHandler.api_handler.login(
+                credentials['gebruikersnaam'], credentials['wachtwoord'], credentials['url']
+            ):
+                return None
+            if zoekterm is not None:
+                logger.logInfo(f"Zoeken naar producten met zoekterm: {zoekterm}...")
+                return await rentproHandler.zoek_producten_in(zoekterm, _schrijf, startRij, max_resultaten)
+            return await rentproHandler.lees_producten_in(
+                [(startRij + i, str(product_id)) for i, product_id in enumerate(product_ids)], _schrijf
+            )
+        finally:
+            await rentproHandler.api_handler.close()
+    
+    statistieken = asyncio.run(_voer_uit())
+    if statistieken is None:
+        return None, "Kon niet verbinden met RentPro"
+    return statistieken, None
 
 class RentProInlezenActie(ActieBasis):
     """Actie om product data in te lezen vanuit RentPro"""
@@ -28,7 +114,7 @@ class RentProInlezenActie(ActieBasis):
                 - product_id (str): ID van het product om in te lezen
                 - doelKolommen (list): Lijst met kolomnamen om te vullen
             rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
-            
+        
         Returns:
             ActieResultaat: Resultaat van de actie
         """
@@ -60,62 +146,18 @@ class RentProInlezenActie(ActieBasis):
                         f"Doelkolom '{kolom}' bestaat niet in het bestand"
                     )
             
-            # Maak RentPro connector
-            connector = RentProConnector()
-            
-            # Verbind met RentPro
-            logger.logInfo("Verbinden met RentPro...")
-            if not run_async(connector.verbind()):
-                return ActieResultaat(
-                    False,
-                    "Kon niet verbinden met RentPro"
-                )
-            
-            # Haal product data op
+            # Schrijf het product in de eerste rij van het bereik
             logger.logInfo(f"Ophalen product data voor ID: {product_id}...")
-            product_data = run_async(connector.lees_product_data(product_id))
+            statistieken, fout = _lees_in(doelKolommen, rijen, product_ids=[product_id])
+            if fout:
+                return ActieResultaat(False, fout)
             
-            if not product_data:
-                run_async(connector.sluit())
+            if not statistieken['succesvol']:
                 return ActieResultaat(
                     False,
                     f"Kon geen data ophalen voor product ID: {product_id}"
                 )
             
-            # Lees veldmappings
-            try:
-                veld_mappings = connector.lees_veld_mappings()
-            except Exception as e:
-                run_async(connector.sluit())
-                return ActieResultaat(
-                    False,
-                    f"Fout bij lezen veldmappings: {e}"
-                )
-            
-            # Omgekeerde mapping maken (veld_id -> kolomnaam)
-            omgekeerde_mapping = {v: k for k, v in veld_mappings.items()}
-            
-            # Bepaal het aantal rijen
-            if rijen:
-                startRij, eindRij = rijen
-                aantalRijen = eindRij - startRij + 1
-                rij_index = startRij
-            else:
-                aantalRijen = 1
-                rij_index = 0  # Standaard naar eerste rij schrijven
-            
-            # Vul Excel met product data
-            for kolom in doelKolommen:
-                if kolom in veld_mappings:
-                    veld_id = veld_mappings[kolom]
-                    if veld_id in product_data:
-                        waarde = product_data[veld_id]
-                        excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
-                        logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}'")
-            
-            # Sluit browser
-            run_async(connector.sluit())
-            
             return ActieResultaat(
                 True,
                 f"Product data succesvol ingelezen voor product ID: {product_id}"
@@ -145,7 +187,7 @@ class RentProMeerdereInlezenActie(ActieBasis):
                 - product_ids (list): Lijst met product IDs om in te lezen
                 - doelKolommen (list): Lijst met kolomnamen om te vullen
             rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
-            
+        
         Returns:
             ActieResultaat: Resultaat van de actie
         """
@@ -177,72 +219,15 @@ class RentProMeerdereInlezenActie(ActieBasis):
                         f"Doelkolom '{kolom}' bestaat niet in het bestand"
                     )
             
-            # Bepaal het aantal rijen
-            if rijen:
-                startRij, eindRij = rijen
-                aantalRijen = eindRij - startRij + 1
-            else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
-            
-            # Controleer of er genoeg rijen zijn
-            if len(product_ids) > aantalRijen:
-                return ActieResultaat(
-                    False,
-                    f"Niet genoeg rijen beschikbaar. Nodig: {len(product_ids)}, Beschikbaar: {aantalRijen}"
-                )
-            
-            # Maak RentPro connector
-            connector = RentProConnector()
-            
-            # Verbind met RentPro
-            logger.logInfo("Verbinden met RentPro...")
-            if not run_async(connector.verbind()):
-                return ActieResultaat(
-                    False,
-                    "Kon niet verbinden met RentPro"
-                )
-            
-            # Lees veldmappings
-            try:
-                veld_mappings = connector.lees_veld_mappings()
-            except Exception as e:
-                run_async(connector.sluit())
-                return ActieResultaat(
-                    False,
-                    f"Fout bij lezen veldmappings: {e}"
-                )
-            
-            # Omgekeerde mapping maken (veld_id -> kolomnaam)
-            omgekeerde_mapping = {v: k for k, v in veld_mappings.items()}
-            
-            # Verwerk elk product
-            for i, product_id in enumerate(product_ids):
-                rij_index = startRij + i
-                
-                # Haal product data op
-                logger.logInfo(f"Ophalen product data voor ID: {product_id}...")
-                product_data = run_async(connector.lees_product_data(product_id))
-                
-                if not product_data:
-                    logger.logWaarschuwing(f"Kon geen data ophalen voor product ID: {product_id}")
-                    continue
-                
-                # Vul Excel met product data
-                for kolom in doelKolommen:
-                    if kolom in veld_mappings:
-                        veld_id = veld_mappings[kolom]
-                        if veld_id in product_data:
-                            waarde = product_data[veld_id]
-                            excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
-                            logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}' voor rij {rij_index+1}")
-            
-            # Sluit browser
-            run_async(connector.sluit())
+            # Haal alle producten gelijktijdig op, elk product in zijn eigen rij
+            statistieken, fout = _lees_in(doelKolommen, rijen, product_ids=list(product_ids))
+            if fout:
+                return ActieResultaat(False, fout)
             
             return ActieResultaat(
-                True,
-                f"Product data succesvol ingelezen voor {len(product_ids)} producten"
+                statistieken['succesvol'] > 0,
+                f"Product data succesvol ingelezen voor {statistieken['succesvol']} van {len(product_ids)} producten"
+                + (f", {statistieken['mislukt']} mislukt (zie log)" if statistieken['mislukt'] else "")
             )
         
         except Exception as e:
@@ -270,7 +255,7 @@ class RentProZoekInlezenActie(ActieBasis):
                 - doelKolommen (list): Lijst met kolomnamen om te vullen
                 - max_resultaten (int): Maximum aantal resultaten om in te lezen
             rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
-            
+        
         Returns:
             ActieResultaat: Resultaat van de actie
         """
@@ -303,136 +288,23 @@ class RentProZoekInlezenActie(ActieBasis):
                         f"Doelkolom '{kolom}' bestaat niet in het bestand"
                     )
             
-            # Bepaal het aantal rijen
-            if rijen:
-                startRij, eindRij = rijen
-                aantalRijen = eindRij - startRij + 1
-            else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
-            
-            # Maak RentPro connector
-            connector = RentProConnector()
-            
-            # Verbind met RentPro
-            logger.logInfo("Verbinden met RentPro...")
-            if not run_async(connector.verbind()):
-                return ActieResultaat(
-                    False,
-                    "Kon niet verbinden met RentPro"
-                )
-            
-            # Navigeer naar productpagina
-            logger.logInfo("Navigeren naar productpagina...")
-            if not run_async(connector.navigeer_naar_producten()):
-                run_async(connector.sluit())
-                return ActieResultaat(
-                    False,
-                    "Kon niet navigeren naar productpagina"
-                )
-            
-            # Zoek producten
-            logger.logInfo(f"Zoeken naar producten met zoekterm: {zoekterm}...")
-            
-            # Implementeer zoekfunctionaliteit
-            # Dit is een voorbeeld en moet worden aangepast aan de werkelijke RentPro interface
-            search_results = run_async(self._zoek_producten(connector, zoekterm, max_resultaten))
+            # Zoek via HTTP; elk resultaat wordt direct opgehaald terwijl het zoeken doorloopt
+            statistieken, fout = _lees_in(doelKolommen, rijen, zoekterm=zoekterm, max_resultaten=max_resultaten)
+            if fout:
+                return ActieResultaat(False, fout)
             
-            if not search_results:
-                run_async(connector.sluit())
+            if not statistieken['totaal']:
                 return ActieResultaat(
                     False,
                     f"Geen producten gevonden met zoekterm: {zoekterm}"
                 )
             
-            # Lees veldmappings
-            try:
-                veld_mappings = connector.lees_veld_mappings()
-            except Exception as e:
-                run_async(connector.sluit())
-                return ActieResultaat(
-                    False,
-                    f"Fout bij lezen veldmappings: {e}"
-                )
-            
-            # Controleer of er genoeg rijen zijn
-            if len(search_results) > aantalRijen:
-                logger.logWaarschuwing(f"Meer resultaten gevonden ({len(search_results)}) dan beschikbare rijen ({aantalRijen}). Alleen de eerste {aantalRijen} resultaten worden ingelezen.")
-                search_results = search_results[:aantalRijen]
-            
-            # Verwerk elk gevonden product
-            for i, product_id in enumerate(search_results):
-                rij_index = startRij + i
-                
-                # Haal product data op
-                logger.logInfo(f"Ophalen product data voor ID: {product_id}...")
-                product_data = run_async(connector.lees_product_data(product_id))
-                
-                if not product_data:
-                    logger.logWaarschuwing(f"Kon geen data ophalen voor product ID: {product_id}")
-                    continue
-                
-                # Vul Excel met product data
-                for kolom in doelKolommen:
-                    if kolom in veld_mappings:
-                        veld_id = veld_mappings[kolom]
-                        if veld_id in product_data:
-                            waarde = product_data[veld_id]
-                            excelHandler.bewerkKolom(kolom, [waarde], (rij_index, rij_index))
-                            logger.logInfo(f"Kolom '{kolom}' gevuld met waarde '{waarde}' voor rij {rij_index+1}")
-            
-            # Sluit browser
-            run_async(connector.sluit())
-            
             return ActieResultaat(
-                True,
-                f"Product data succesvol ingelezen voor {len(search_results)} producten"
+                statistieken['mislukt'] == 0,
+                f"Product data succesvol ingelezen voor {statistieken['succesvol']} producten"
+                + (f", {statistieken['mislukt']} mislukt (zie log)" if statistieken['mislukt'] else "")
             )
         
         except Exception as e:
             logger.logFout(f"Fout bij uitvoeren RentProZoekInlezenActie: {e}")
             return ActieResultaat(False, f"Fout bij uitvoeren actie: {e}")
-    
-    async def _zoek_producten(self, connector, zoekterm, max_resultaten):
-        """
-        Zoek producten in RentPro
-        
-        Args:
-            connector (RentProConnector): De RentPro connector
-            zoekterm (str): Zoekterm om producten te vinden
-            max_resultaten (int): Maximum aantal resultaten
-            
-        Returns:
-            list: Lijst met product IDs
-        """
-        try:
-            # Vul het zoekveld in
-            await connector.page.waitForSelector('#searchString')
-            await connector.page.type('#searchString', zoekterm)
-            
-            # Klik op de zoekknop
-            await connector.page.click('#searchButton')
-            
-            # Wacht op resultaten
-            await connector.page.waitForSelector('.product-list-item')
-            
-            # Verzamel product IDs
-            product_ids = await connector.page.evaluate(f'''
-                () => {{
-                    const items = document.querySelectorAll('.product-list-item');
-                    const ids = [];
-                    
-                    for (let i = 0; i < items.length && i < {max_resultaten}; i++) {{
-                        const id = items[i].getAttribute('data-product-id');
-                        if (id) ids.push(id);
-                    }}
-                    
-                    return ids;
-                }}
-            ''')
-            
-            return product_ids
-        
-        except Exception as e:
-            logger.logFout(f"Fout bij zoeken naar producten: {e}")
-            return []
@@ -0,0 +1,210 @@
+"""
+RentPro synchronisatie module voor Excelladin Reloaded
+Verantwoordelijk voor het synchroniseren van de sheet met RentPro in twee richtingen
+
+Wijzigingen in de sheet gaan naar RentPro, wijzigingen in RentPro komen in de sheet.
+Welke kant gewijzigd is volgt uit een vergelijking met de laatst gesynchroniseerde
+stand (zie modules/rentpro/merge_sync.py); als beide kanten hetzelfde veld anders
+gewijzigd hebben wordt dat als conflict gemeld, tenzij een voorkeur is opgegeven.
+
+De lokale productcatalogi van meerdere RentPro omgevingen (zie modules/rentpro/tenants.py)
+kunnen in één actie tegelijk ververst worden.
+"""
+import asyncio
+from modules.logger import logger
+from modules.excel_handler import excelHandler
+from modules.actions.base import ActieBasis, ActieResultaat
+from modules.rentpro.config import laad_inloggegevens
+from modules.rentpro.merge_sync import CONFLICT_OPTIES
+from modules.rentpro.tenants import voer_uit_per_tenant, STANDAARD_TENANT
+from modules.rentpro.config import laad_tenants
+from modules.rentpro_handler import rentproHandler
+
+class RentProSynchroniserenActie(ActieBasis):
+    """Actie om de sheet en RentPro in twee richtingen te synchroniseren"""
+    
+    def __init__(self):
+        """Initialiseer de RentPro synchronisatie actie"""
+        super().__init__(
+            naam="rentProSynchroniseren",
+            beschrijving="Synchroniseert productdata tussen Excel en RentPro in twee richtingen",
+            categorie="Synchroniseren met RentPro"
+        )
+    
+    def voerUit(self, parameters, rijen=None):
+        """
+        Implementatie van de actie
+        
+        Args:
+            parameters (dict): Parameters voor de actie, moet bevatten:
+                - product_id_kolom (str): Kolomnaam met product IDs
+                - bronKolommen (list): Lijst met kolomnamen om te synchroniseren
+                - bij_conflict (str): Optioneel, 'melden', 'rentpro' of 'sheet'
+                - volledig (bool): Optioneel, alle producten in RentPro controleren in plaats van
+                  alleen die met een gewijzigde rij in het productoverzicht
+            rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
+        
+        Returns:
+            ActieResultaat: Resultaat van de actie
+        """
+        try:
+            # Controleer verplichte parameters
+            verplicht = ["product_id_kolom", "bronKolommen"]
+            for param in verplicht:
+                if param not in parameters:
+                    return ActieResultaat(
+                        False, 
+                        f"Ontbrekende parameter: {param}"
+                    )
+            
+            product_id_kolom = parameters["product_id_kolom"]
+            bronKolommen = parameters["bronKolommen"]
+            bij_conflict = parameters.get("bij_conflict")
+            if bij_conflict is not None and bij_conflict not in CONFLICT_OPTIES:
+                return ActieResultaat(
+                    False, 
+                    f"Ongeldige waarde voor bij_conflict: '{bij_conflict}' (kies uit {', '.join(CONFLICT_OPTIES)})"
+                )
+            
+            # Controleer of er een bestand is geopend
+            if not excelHandler.isBestandGeopend():
+                return ActieResultaat(
+                    False, 
+                    "Kan actie niet uitvoeren: Geen Excel-bestand geopend"
+                )
+            
+            # Controleer of alle kolommen bestaan
+            if product_id_kolom not in excelHandler.kolomNamen:
+                return ActieResultaat(
+                    False, 
+                    f"Kolom '{product_id_kolom}' met product IDs bestaat niet in het bestand"
+                )
+            
+            for kolom in bronKolommen:
+                if kolom not in excelHandler.kolomNamen:
+                    return ActieResultaat(
+                        False, 
+                        f"Bronkolom '{kolom}' bestaat niet in het bestand"
+                    )
+            
+            veld_mapping, eerste_datarij = rentproHandler.excel_manager.get_field_mapping()
+            if not veld_mapping:
+                return ActieResultaat(
+                    False, 
+                    "Geen veld-ID's gevonden: de tweede kopregel moet de RentPro veld-ID's bevatten"
+                )
+            
+            mapping = {kolom: veld_mapping[kolom] for kolom in bronKolommen if kolom in veld_mapping}
+            for kolom in bronKolommen:
+                if kolom not in veld_mapping:
+                    logger.logWaarschuwing(f"Geen veld-ID voor kolom '{kolom}', kolom wordt overgeslagen")
+            if not mapping:
+                return ActieResultaat(False, "Geen van de bronkolommen heeft een RentPro veld-ID")
+            
+            # Bepaal het bereik, de rij met veld-ID's is geen product
+            if rijen:
+                startRij, eindRij = rijen
+            else:
+                startRij, eindRij = 0, excelHandler.haalRijAantal() - 1
+            startRij = max(startRij, eerste_datarij)
+            
+            id_kolom_index = excelHandler.kolomNamen.index(product_id_kolom)
+            opdrachten = []
+            for rij_index in range(startRij, eindRij + 1):
+                product_id = excelHandler.getCellValue(rij_index, id_kolom_index)
+                if isinstance(product_id, float) and product_id.is_integer():
+                    product_id = int(product_id)
+                if not product_id:
+                    logger.logWaarschuwing(f"Geen product ID gevonden voor rij {rij_index+1}")
+                    continue
+                # Lege cellen tellen mee: een leeggemaakte cel is ook een wijziging
+                velden = rentproHandler.excel_manager.get_field_values(rij_index, mapping, met_lege=True)
+                opdrachten.append((rij_index, str(product_id), velden))
+            
+            if not opdrachten:
+                return ActieResultaat(False, "Geen rijen met een product ID gevonden")
+            
+            credentials = laad_inloggegevens()
+            if not credentials:
+                return ActieResultaat(False, "Geen RentPro inloggegevens gevonden in config/rentpro.ini")
+            
+            def _schrijf(rij_index, veld_id, waarde):
+                return rentproHandler.excel_manager.update_field_value(rij_index, mapping, veld_id, waarde)
+            
+            async def _voer_uit():
+                try:
+                    logger.logInfo("Verbinden met RentPro...")
+                    if not await rentproHandler.api_handler.login(
+                        credentials['gebruikersnaam'], credentials['wachtwoord'], credentials['url']
+                    ):
+                        return None
+                    return await rentproHandler.synchroniseer_producten(
+                        opdrachten, _schrijf, bij_conflict, parameters.get("volledig", False)
+                    )
+                finally:
+                    await rentproHandler.api_handler.close()
+            
+            statistieken = asyncio.run(_voer_uit())
+            if statistieken is None:
+                return ActieResultaat(False, "Synchroniseren met RentPro mislukt (zie log)")
+            
+            conflicten = len(statistieken['conflicten'])
+            return ActieResultaat(
+                statistieken['mislukt'] == 0 and conflicten == 0,
+                f"{statistieken['binnengehaald']} velden uit RentPro overgenomen, "
+                f"{statistieken['verstuurd']} velden naar RentPro verstuurd"
+                + (f", {conflicten} conflicten (zie log)" if conflicten else "")
+                + (f", {statistieken['mislukt']} mislukt (zie log)" if statistieken['mislukt'] else "")
+            )
+        
+        except Exception as e:
+            logger.logFout(f"Fout bij uitvoeren RentProSynchroniserenActie: {e}")
+            return ActieResultaat(False, f"Fout bij uitvoeren actie: {e}")
+
+class RentProCatalogiVerversenActie(ActieBasis):
+    """Actie om de productcatalogi van meerdere RentPro omgevingen tegelijk te verversen"""
+    
+    def __init__(self):
+        """Initialiseer de actie voor het verversen van de catalogi"""
+        super().__init__(
+            naam="rentProCatalogiVerversen",
+            beschrijving="Ververst de lokale productcatalogus van meerdere RentPro omgevingen tegelijk",
+            categorie="Synchroniseren met RentPro"
+        )
+    
+    def voerUit(self, parameters, rijen=None):
+        """
+        Implementatie van de actie
+        
+        Args:
+            parameters (dict): Parameters voor de actie, kan bevatten:
+                - tenants (list): Optioneel, namen van de omgevingen ('standaard' voor [RentPro]),
+                  standaard alle [Tenant ...] secties uit config/rentpro.ini
+                - volledig (bool): Optioneel, de details van alle producten opnieuw ophalen
+            rijen (tuple): Niet gebruikt, de catalogus staat los van de sheet
+        
+        Returns:
+            ActieResultaat: Resultaat van de actie
+        """
+        try:
+            tenants = parameters.get("tenants") or laad_tenants() or [STANDAARD_TENANT]
+            volledig = parameters.get("volledig", False)
+            
+            resultaten = asyncio.run(
+                voer_uit_per_tenant(lambda handler: handler.ververs_catalogus(volledig), tenants)
+            )
+            
+            mislukt = [tenant for tenant, resultaat in resultaten.items() if resultaat is None]
+            samenvatting = ", ".join(
+                f"{tenant}: {resultaat['opgehaald']} producten opgehaald"
+                for tenant, resultaat in resultaten.items() if resultaat is not None
+            )
+            return ActieResultaat(
+                not mislukt,
+                (samenvatting or "Geen catalogus ververst")
+                + (f"; mislukt: {', '.join(mislukt)} (zie log)" if mislukt else "")
+            )
+        
+        except Exception as e:
+            logger.logFout(f"Fout bij uitvoeren RentProCatalogiVerversenActie: {e}")
+            return ActieResultaat(False, f"Fout bij uitvoeren actie: {e}")
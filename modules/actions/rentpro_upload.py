@@ -1,12 +1,92 @@
 """
 RentPro upload module voor Excelladin Reloaded
 Verantwoordelijk voor het uploaden van data naar RentPro
+
+Producten worden zonder browser opgeslagen: het Product/Edit formulier wordt via
+HTTP opgehaald, aangevuld met de waarden uit Excel en direct gepost (zie
+modules/rentpro/upload_engine.py). De koppeling tussen kolommen en formuliervelden
+komt uit de tweede kopregel van de sheet, zoals in Importsheet/Import_template.csv.
 """
 import asyncio
 from modules.logger import logger
 from modules.excel_handler import excelHandler
 from modules.actions.base import ActieBasis, ActieResultaat
-from modules.actions.rentpro import RentProConnector, run_async
+from modules.rentpro.config import laad_inloggegevens
+from modules.rentpro_handler import rentproHandler
+
+def _upload_rijen(bronKolommen, rijen=None, product_id_kolom=None, max_gelijktijdig=None):
+    """
+    Verzamel de Excel data en sla de producten gelijktijdig op in RentPro
+    
+    Args:
+        bronKolommen (list): Kolommen die naar RentPro gaan
+        rijen (tuple): Optioneel, tuple met (startRij, eindRij)
+        product_id_kolom (str, optional): Kolom met product IDs (bijwerken), None om nieuwe producten aan te maken
+        max_gelijktijdig (int, optional): Maximum aantal producten dat tegelijk verstuurd wordt
+    
+    Returns:
+        tuple: (statistieken dict of None, foutmelding of None)
+    """
+    veld_mapping, eerste_datarij = rentproHandler.excel_manager.get_field_mapping()
+    if not veld_mapping:
+        return None, "Geen veld-ID's gevonden: de tweede kopregel moet de RentPro veld-ID's bevatten"
+    
+    mapping = {kolom: veld_mapping[kolom] for kolom in bronKolommen if kolom in veld_mapping}
+    for kolom in bronKolommen:
+        if kolom not in veld_mapping:
+            logger.logWaarschuwing(f"Geen veld-ID voor kolom '{kolom}', kolom wordt overgeslagen")
+    if not mapping:
+        return None, "Geen van de bronkolommen heeft een RentPro veld-ID"
+    
+    # Bepaal het bereik, de rij met veld-ID's is geen product
+    if rijen:
+        startRij, eindRij = rijen
+    else:
+        startRij, eindRij = 0, excelHandler.haalRijAantal() - 1
+    startRij = max(startRij, eerste_datarij)
+    
+    id_kolom_index = excelHandler.kolomNamen.index(product_id_kolom) if product_id_kolom else None
+    
+    opdrachten = []
+    for rij_index in range(startRij, eindRij + 1):
+        product_id = None
+        if id_kolom_index is not None:
+            product_id = excelHandler.getCellValue(rij_index, id_kolom_index)
+            if isinstance(product_id, float) and product_id.is_integer():
+                product_id = int(product_id)
+            if not product_id:
+                logger.logWaarschuwing(f"Geen product ID gevonden voor rij {rij_index+1}")
+                continue
+            product_id = str(product_id)
+        
+        velden = rentproHandler.excel_manager.get_field_values(rij_index, mapping)
+        if not velden:
+            logger.logWaarschuwing(f"Geen data gevonden voor rij {rij_index+1}")
+            continue
+        opdrachten.append((rij_index, product_id, velden))
+    
+    if not opdrachten:
+        return None, "Geen rijen met data gevonden"
+    
+    credentials = laad_inloggegevens()
+    if not credentials:
+        return None, "Geen RentPro inloggegevens gevonden in config/rentpro.ini"
+    
+    async def _voer_uit():
+        try:
+            logger.logInfo("Verbinden met RentPro...")
+            if not await rentproHandler.api_handler.login(
+                credentials['gebruikersnaam'], credentials['wachtwoord'], credentials['url']
+            ):
+                return None
+            return await rentproHandler.upload_producten(opdrachten, max_gelijktijdig)
+        finally:
+            await rentproHandler.api_handler.close()
+    
+    statistieken = asyncio.run(_voer_uit())
+    if statistieken is None:
+        return None, "Kon niet verbinden met RentPro"
+    return statistieken, None
 
 class RentProUploadActie(ActieBasis):
     """Actie om product data te uploaden naar RentPro"""
@@ -58,77 +138,15 @@ class RentProUploadActie(ActieBasis):
                         f"Bronkolom '{kolom}' bestaat niet in het bestand"
                     )
             
-            # Bepaal het aantal rijen
-            if rijen:
-                startRij, eindRij = rijen
-                aantalRijen = eindRij - startRij + 1
-            else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
-            
-            # Maak RentPro connector
-            connector = RentProConnector()
-            
-            # Verbind met RentPro
-            logger.logInfo("Verbinden met RentPro...")
-            if not run_async(connector.verbind()):
-                return ActieResultaat(
-                    False,
-                    "Kon niet verbinden met RentPro"
-                )
-            
-            # Lees veldmappings
-            try:
-                veld_mappings = connector.lees_veld_mappings()
-            except Exception as e:
-                run_async(connector.sluit())
-                return ActieResultaat(
-                    False,
-                    f"Fout bij lezen veldmappings: {e}"
-                )
-            
-            # Verwerk elke rij
-            for rij_index in range(startRij, eindRij + 1):
-                # Navigeer naar nieuw product pagina
-                logger.logInfo(f"Navigeren naar nieuw product pagina voor rij {rij_index+1}...")
-                if not run_async(connector.navigeer_naar_nieuw_product()):
-                    logger.logWaarschuwing(f"Kon niet navigeren naar nieuw product pagina voor rij {rij_index+1}")
-                    continue
-                
-                # Verzamel data uit Excel
-                rij_data = {}
-                for kolom in bronKolommen:
-                    waarden = excelHandler.haalKolomOp(kolom, (rij_index, rij_index))
-                    if waarden and waarden[0]:  # Controleer of er een waarde is
-                        rij_data[kolom] = waarden[0]
-                
-                # Controleer of er data is
-                if not rij_data:
-                    logger.logWaarschuwing(f"Geen data gevonden voor rij {rij_index+1}")
-                    continue
-                
-                # Vul formulier in
-                logger.logInfo(f"Invullen formulier voor rij {rij_index+1}...")
-                for kolom, waarde in rij_data.items():
-                    if kolom in veld_mappings:
-                        veld_id = veld_mappings[kolom]
-                        logger.logInfo(f"Invullen veld '{veld_id}' met waarde '{waarde}'")
-                        run_async(connector.vul_product_veld(veld_id, waarde))
-                
-                # Sla product op
-                logger.logInfo(f"Opslaan product voor rij {rij_index+1}...")
-                if not run_async(connector.klik_opslaan()):
-                    logger.logWaarschuwing(f"Kon product niet opslaan voor rij {rij_index+1}")
-                    continue
-                
-                logger.logInfo(f"Product succesvol opgeslagen voor rij {rij_index+1}")
-            
-            # Sluit browser
-            run_async(connector.sluit())
+            # Sla alle rijen als nieuwe producten op
+            statistieken, fout = _upload_rijen(bronKolommen, rijen)
+            if fout:
+                return ActieResultaat(False, fout)
             
             return ActieResultaat(
-                True,
-                f"Product data succesvol geüpload voor rijen {startRij+1} t/m {eindRij+1}"
+                statistieken['mislukt'] == 0,
+                f"{statistieken['succesvol']} van {statistieken['totaal']} producten geüpload"
+                + (f", {statistieken['mislukt']} mislukt (zie log)" if statistieken['mislukt'] else "")
             )
         
         except Exception as e:
@@ -153,7 +171,7 @@ class RentProBulkUploadActie(ActieBasis):
         Args:
             parameters (dict): Parameters voor de actie, moet bevatten:
                 - bronKolommen (list): Lijst met kolomnamen om te gebruiken als bron
-                - batch_grootte (int): Aantal producten per batch
+                - batch_grootte (int): Optioneel, maximum aantal producten dat tegelijk verstuurd wordt
             rijen (tuple): Optioneel, tuple met (startRij, eindRij) om alleen een bereik te bewerken
             
         Returns:
@@ -170,7 +188,7 @@ class RentProBulkUploadActie(ActieBasis):
                     )
             
             bronKolommen = parameters["bronKolommen"]
-            batch_grootte = parameters.get("batch_grootte", 10)
+            batch_grootte = parameters.get("batch_grootte")
             
             # Controleer of er een bestand is geopend
             if not excelHandler.isBestandGeopend():
@@ -187,85 +205,15 @@ class RentProBulkUploadActie(ActieBasis):
                         f"Bronkolom '{kolom}' bestaat niet in het bestand"
                     )
             
-            # Bepaal het aantal rijen
-            if rijen:
-                startRij, eindRij = rijen
-                aantalRijen = eindRij - startRij + 1
-            else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
-            
-            # Maak RentPro connector
-            connector = RentProConnector()
-            
-            # Verbind met RentPro
-            logger.logInfo("Verbinden met RentPro...")
-            if not run_async(connector.verbind()):
-                return ActieResultaat(
-                    False,
-                    "Kon niet verbinden met RentPro"
-                )
-            
-            # Lees veldmappings
-            try:
-                veld_mappings = connector.lees_veld_mappings()
-            except Exception as e:
-                run_async(connector.sluit())
-                return ActieResultaat(
-                    False,
-                    f"Fout bij lezen veldmappings: {e}"
-                )
-            
-            # Verwerk in batches
-            totaal_verwerkt = 0
-            for batch_start in range(startRij, eindRij + 1, batch_grootte):
-                batch_eind = min(batch_start + batch_grootte - 1, eindRij)
-                
-                logger.logInfo(f"Verwerken batch rijen {batch_start+1} t/m {batch_eind+1}...")
-                
-                # Verwerk elke rij in de batch
-                for rij_index in range(batch_start, batch_eind + 1):
-                    # Navigeer naar nieuw product pagina
-                    logger.logInfo(f"Navigeren naar nieuw product pagina voor rij {rij_index+1}...")
-                    if not run_async(connector.navigeer_naar_nieuw_product()):
-                        logger.logWaarschuwing(f"Kon niet navigeren naar nieuw product pagina voor rij {rij_index+1}")
-                        continue
-                    
-                    # Verzamel data uit Excel
-                    rij_data = {}
-                    for kolom in bronKolommen:
-                        waarden = excelHandler.haalKolomOp(kolom, (rij_index, rij_index))
-                        if waarden and waarden[0]:  # Controleer of er een waarde is
-                            rij_data[kolom] = waarden[0]
-                    
-                    # Controleer of er data is
-                    if not rij_data:
-                        logger.logWaarschuwing(f"Geen data gevonden voor rij {rij_index+1}")
-                        continue
-                    
-                    # Vul formulier in
-                    logger.logInfo(f"Invullen formulier voor rij {rij_index+1}...")
-                    for kolom, waarde in rij_data.items():
-                        if kolom in veld_mappings:
-                            veld_id = veld_mappings[kolom]
-                            logger.logInfo(f"Invullen veld '{veld_id}' met waarde '{waarde}'")
-                            run_async(connector.vul_product_veld(veld_id, waarde))
-                    
-                    # Sla product op
-                    logger.logInfo(f"Opslaan product voor rij {rij_index+1}...")
-                    if not run_async(connector.klik_opslaan()):
-                        logger.logWaarschuwing(f"Kon product niet opslaan voor rij {rij_index+1}")
-                        continue
-                    
-                    logger.logInfo(f"Product succesvol opgeslagen voor rij {rij_index+1}")
-                    totaal_verwerkt += 1
-            
-            # Sluit browser
-            run_async(connector.sluit())
+            # Sla alle rijen als nieuwe producten op, batch_grootte producten tegelijk
+            statistieken, fout = _upload_rijen(bronKolommen, rijen, max_gelijktijdig=batch_grootte)
+            if fout:
+                return ActieResultaat(False, fout)
             
             return ActieResultaat(
-                True,
-                f"{totaal_verwerkt} producten succesvol geüpload"
+                statistieken['mislukt'] == 0,
+                f"{statistieken['succesvol']} producten succesvol geüpload"
+                + (f", {statistieken['mislukt']} mislukt (zie log)" if statistieken['mislukt'] else "")
             )
         
         except Exception as e:
@@ -330,93 +278,16 @@ class RentProUpdateActie(ActieBasis):
                         f"Bronkolom '{kolom}' bestaat niet in het bestand"
                     )
             
-            # Bepaal het aantal rijen
-            if rijen:
-                startRij, eindRij = rijen
-                aantalRijen = eindRij - startRij + 1
-            else:
-                aantalRijen = excelHandler.haalRijAantal()
-                startRij, eindRij = 0, aantalRijen - 1
-            
-            # Maak RentPro connector
-            connector = RentProConnector()
-            
-            # Verbind met RentPro
-            logger.logInfo("Verbinden met RentPro...")
-            if not run_async(connector.verbind()):
-                return ActieResultaat(
-                    False,
-                    "Kon niet verbinden met RentPro"
-                )
-            
-            # Lees veldmappings
-            try:
-                veld_mappings = connector.lees_veld_mappings()
-            except Exception as e:
-                run_async(connector.sluit())
-                return ActieResultaat(
-                    False,
-                    f"Fout bij lezen veldmappings: {e}"
-                )
-            
-            # Haal product IDs op
-            product_ids = excelHandler.haalKolomOp(product_id_kolom, rijen)
-            
-            # Verwerk elke rij
-            totaal_verwerkt = 0
-            for i, product_id in enumerate(product_ids):
-                rij_index = startRij + i
-                
-                # Controleer of product ID geldig is
-                if not product_id:
-                    logger.logWaarschuwing(f"Geen product ID gevonden voor rij {rij_index+1}")
-                    continue
-                
-                # Navigeer naar product pagina
-                logger.logInfo(f"Navigeren naar product pagina voor ID {product_id} (rij {rij_index+1})...")
-                
-                # Haal huidige product data op
-                product_data = run_async(connector.lees_product_data(product_id))
-                
-                if not product_data:
-                    logger.logWaarschuwing(f"Kon geen data ophalen voor product ID: {product_id}")
-                    continue
-                
-                # Verzamel data uit Excel
-                rij_data = {}
-                for kolom in bronKolommen:
-                    waarden = excelHandler.haalKolomOp(kolom, (rij_index, rij_index))
-                    if waarden and waarden[0]:  # Controleer of er een waarde is
-                        rij_data[kolom] = waarden[0]
-                
-                # Controleer of er data is
-                if not rij_data:
-                    logger.logWaarschuwing(f"Geen data gevonden voor rij {rij_index+1}")
-                    continue
-                
-                # Vul formulier in
-                logger.logInfo(f"Bijwerken formulier voor product ID {product_id} (rij {rij_index+1})...")
-                for kolom, waarde in rij_data.items():
-                    if kolom in veld_mappings:
-                        veld_id = veld_mappings[kolom]
-                        logger.logInfo(f"Bijwerken veld '{veld_id}' met waarde '{waarde}'")
-                        run_async(connector.vul_product_veld(veld_id, waarde))
-                
-                # Sla product op
-                logger.logInfo(f"Opslaan product voor ID {product_id} (rij {rij_index+1})...")
-                if not run_async(connector.klik_opslaan()):
-                    logger.logWaarschuwing(f"Kon product niet opslaan voor ID {product_id} (rij {rij_index+1})")
-                    continue
-                
-                logger.logInfo(f"Product succesvol bijgewerkt voor ID {product_id} (rij {rij_index+1})")
-                totaal_verwerkt += 1
-            
-            # Sluit browser
-            run_async(connector.sluit())
+            # Werk de producten met een ID in de opgegeven kolom bij, alleen velden die verschillen
+            statistieken, fout = _upload_rijen(bronKolommen, rijen, product_id_kolom=product_id_kolom)
+            if fout:
+                return ActieResultaat(False, fout)
             
             return ActieResultaat(
-                True,
-                f"{totaal_verwerkt} producten succesvol bijgewerkt in RentPro"
+                statistieken['mislukt'] == 0,
+                f"{statistieken['gewijzigd']} producten bijgewerkt in RentPro, "
+                f"{statistieken['ongewijzigd']} ongewijzigd"
+                + (f", {statistieken['mislukt']} mislukt (zie log)" if statistieken['mislukt'] else "")
             )
         
         except Exception as e:
@@ -183,6 +183,67 @@ class ExcelHandler:
         
         return len(self.huidigDataFrame)
     
+    def getTotalRows(self):
+        """
+        Haal het aantal rijen op (gebruikt door de RentPro Excel manager)
+        
+        Returns:
+            int: Aantal rijen of 0 als er geen bestand is geopend
+        """
+        return self.haalRijAantal()
+    
+    def getCellValue(self, rij, kolomIndex):
+        """
+        Haal de waarde van een enkele cel op
+        
+        Args:
+            rij (int): Index van de rij (0-based)
+            kolomIndex (int): Index van de kolom (0-based)
+        
+        Returns:
+            Waarde van de cel, of None als de cel leeg is of niet bestaat
+        """
+        if self.huidigDataFrame is None:
+            return None
+        
+        if rij < 0 or rij >= len(self.huidigDataFrame) or kolomIndex < 0 or kolomIndex >= len(self.huidigDataFrame.columns):
+            return None
+        
+        waarde = self.huidigDataFrame.iat[rij, kolomIndex]
+        if pd.isna(waarde):
+            return None
+        # Converteer numpy scalars naar gewone Python waarden
+        if hasattr(waarde, 'item'):
+            return waarde.item()
+        return waarde
+    
+    def setCellValue(self, rij, kolomIndex, waarde):
+        """
+        Stel de waarde van een enkele cel in
+        
+        Args:
+            rij (int): Index van de rij (0-based)
+            kolomIndex (int): Index van de kolom (0-based)
+            waarde: Nieuwe waarde voor de cel
+        
+        Returns:
+            bool: True als de cel is bijgewerkt, anders False
+        """
+        if self.huidigDataFrame is None:
+            logger.logFout("Kan cel niet bewerken: Geen bestand geopend")
+            return False
+        
+        if rij < 0 or rij >= len(self.huidigDataFrame) or kolomIndex < 0 or kolomIndex >= len(self.huidigDataFrame.columns):
+            logger.logWaarschuwing(f"Cel ({rij}, {kolomIndex}) valt buiten het bestand")
+            return False
+        
+        kolomNaam = self.huidigDataFrame.columns[kolomIndex]
+        # Zorg dat tekst in numerieke kolommen geen dtype-fout geeft
+        if self.huidigDataFrame[kolomNaam].dtype != object:
+            self.huidigDataFrame[kolomNaam] = self.huidigDataFrame[kolomNaam].astype(object)
+        self.huidigDataFrame.iat[rij, kolomIndex] = waarde
+        return True
+    
     def isBestandGeopend(self):
         """
         Controleer of er een bestand is geopend
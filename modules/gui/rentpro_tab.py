@@ -11,6 +11,7 @@ from assets.theme import KLEUREN, STIJLEN
 from modules.gui.components import Tooltip, StijlvollePopup
 from modules.excel_handler import excelHandler
 from modules.rentpro_handler import rentproHandler
+from modules.rentpro.config import laad_url
 from modules.logger import logger
 
 class RentproTab:
@@ -36,6 +37,9 @@ class RentproTab:
         self.opgeslagen_wachtwoord = haalRentproWachtwoord()
         self.opgeslagen_url = haalRentproURL()
         
+        # Herstel een opgeslagen RentPro sessie terwijl de UI wordt opgebouwd
+        rentproHandler.herstel_sessie_op_achtergrond(self.opgeslagen_gebruikersnaam, self.opgeslagen_url)
+        
         # Bouw de UI
         self._buildUI()
     
@@ -557,8 +561,8 @@ class RentproTab:
         if self.opgeslagen_url:
             self.urlVar.set(self.opgeslagen_url)
         else:
-            # Standaard URL
-            self.urlVar.set("http://metroeventsdc.rentpro5.nl/")
+            # Standaard URL uit config/rentpro.ini
+            self.urlVar.set(laad_url())
         
         # Initiële status
         self.updateResultaat("Gereed voor synchronisatie met Rentpro")
@@ -976,7 +980,22 @@ class RentproTab:
             await rentproHandler.navigeer_naar_producten()
             
             # Controleer of we in API-mode zijn
-            if rentproHandler.gebruik_api_mode:
+            if rentproHandler.gebruik_api_mode and rentproHandler.catalogus is not None:
+                # Toon direct de lokale catalogus en ververs daarna alleen wat gewijzigd is
+                bron = rentproHandler.api_handler.base_url
+                lokaal = rentproHandler.catalogus.overzicht(bron)
+                if lokaal:
+                    self.app.root.after(0, lambda: self.toon_product_overzicht(lokaal))
+                    self.updateLogText(f"{len(lokaal)} producten uit de lokale catalogus, verversen...")
+                
+                verversing = await rentproHandler.ververs_catalogus()
+                if verversing is not None:
+                    self.updateLogText(
+                        f"Catalogus bijgewerkt: {verversing['nieuw']} nieuw, {verversing['gewijzigd']} gewijzigd, "
+                        f"{verversing['verwijderd']} verwijderd"
+                    )
+                return rentproHandler.catalogus.overzicht(bron)
+            elif rentproHandler.gebruik_api_mode:
                 # Haal producten op via API handler
                 logger.logInfo("Producten ophalen via API")
                 self.updateLogText("Producten ophalen via API")
@@ -0,0 +1,167 @@
+"""
+HTML Backend module voor Excelladin Reloaded
+Verantwoordelijk voor het kiezen van de snelste beschikbare HTML parser
+
+Alle code werkt met de BeautifulSoup API. Deze module kiest daaronder de snelste
+parser die geïnstalleerd is:
+- lxml: C-parser als BeautifulSoup builder (veel sneller dan html.parser)
+- selectolax: zeer snelle C-parser die alleen het gevraagde deel van de pagina
+  uitknipt, waarna BeautifulSoup alleen dat fragment opbouwt
+- html.parser: pure Python, altijd beschikbaar (fallback)
+
+Daarnaast kan het parsen beperkt worden tot een gebied van de pagina (bijvoorbeeld
+het productformulier), zodat er geen boom voor de volledige pagina gebouwd wordt.
+Zonder selectolax wordt het gebied met een regex uit de ruwe HTML geknipt; dat is
+sneller dan een SoupStrainer, die nog steeds de hele pagina door de parser haalt.
+"""
+import re
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    LXML_BESCHIKBAAR = True
+except ImportError:
+    LXML_BESCHIKBAAR = False
+
+try:
+    # selectolax 1.0+ heeft alleen nog de lexbor backend
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+    SELECTOLAX_BESCHIKBAAR = True
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+        SELECTOLAX_BESCHIKBAAR = True
+    except ImportError:
+        SelectolaxParser = None
+        SELECTOLAX_BESCHIKBAAR = False
+
+# Gebieden waartoe het parsen beperkt kan worden
+# 'css' wordt gebruikt door selectolax; zonder selectolax wordt het gebied met
+# 'start' (regex op de openingstag) en 'tag' (voor de bijbehorende sluittag) uitgeknipt
+GEBIEDEN = {
+    'productformulier': {
+        'css': 'form[action*="/Product/"]',
+        'tag': 'form',
+        'start': re.compile(r'<form\b[^>]*action\s*=\s*["\'][^"\']*/Product/', re.IGNORECASE),
+    },
+    'producttabel': {
+        'css': 'table.gvItems, table.noBold',
+        'tag': 'table',
+        'start': re.compile(r'<table\b[^>]*class\s*=\s*["\'][^"\']*\b(gvItems|noBold)\b', re.IGNORECASE),
+    },
+    'token': {
+        'css': 'input[name="__RequestVerificationToken"]',
+        'tag': 'input',
+        'start': re.compile(r'<input\b[^>]*name\s*=\s*["\']__RequestVerificationToken["\']', re.IGNORECASE),
+    },
+}
+
+# Elementen zonder sluittag
+LEGE_ELEMENTEN = {'input', 'img', 'br', 'hr', 'meta', 'link'}
+
+def beschikbare_backends():
+    """
+    Geef de geïnstalleerde parser backends, snelste eerst
+    
+    Returns:
+        list: Namen van beschikbare backends ('selectolax', 'lxml', 'html.parser')
+    """
+    backends = []
+    if SELECTOLAX_BESCHIKBAAR:
+        backends.append('selectolax')
+    if LXML_BESCHIKBAAR:
+        backends.append('lxml')
+    backends.append('html.parser')
+    return backends
+
+def _builder(backend):
+    """Bepaal de BeautifulSoup builder voor een backend"""
+    if backend == 'lxml' or (backend in (None, 'selectolax') and LXML_BESCHIKBAAR):
+        return 'lxml'
+    return 'html.parser'
+
+def maak_soup(html, gebied=None, backend=None):
+    """
+    Parse HTML met de snelste beschikbare backend
+    
+    Args:
+        html (str): De te parsen HTML
+        gebied (str, optional): Naam van een gebied uit GEBIEDEN om het parsen tot te beperken.
+            Als het gebied niet op de pagina voorkomt wordt de volledige pagina geparsed.
+        backend (str, optional): Forceer een backend ('selectolax', 'lxml' of 'html.parser'),
+            standaard wordt de snelste beschikbare gekozen
+    
+    Returns:
+        BeautifulSoup: De geparste (deel)boom
+    """
+    if backend is None:
+        backend = beschikbare_backends()[0]
+    if backend == 'selectolax' and not SELECTOLAX_BESCHIKBAAR:
+        backend = 'lxml' if LXML_BESCHIKBAAR else 'html.parser'
+    if backend == 'lxml' and not LXML_BESCHIKBAAR:
+        backend = 'html.parser'
+    
+    builder = _builder(backend)
+    if not gebied:
+        return BeautifulSoup(html, builder)
+    
+    definitie = GEBIEDEN[gebied]
+    
+    if backend == 'selectolax':
+        # Knip het gebied uit met selectolax en bouw alleen dat fragment op
+        knopen = SelectolaxParser(html).css(definitie['css'])
+        fragment = ''.join(knoop.html for knoop in knopen) if knopen else None
+    else:
+        fragment = knip_gebied(html, definitie)
+    
+    if fragment:
+        return BeautifulSoup(fragment, builder)
+    
+    # Gebied niet gevonden: val terug op de volledige pagina
+    return BeautifulSoup(html, builder)
+
+def knip_gebied(html, definitie):
+    """
+    Knip een gebied uit de ruwe HTML zonder de pagina te parsen
+    Zoekt de openingstag met een regex en telt geneste tags van hetzelfde type
+    om de bijbehorende sluittag te vinden.
+    
+    Args:
+        html (str): De volledige pagina
+        definitie (dict): Gebied definitie uit GEBIEDEN
+    
+    Returns:
+        str: HTML van het gebied (alle voorkomens achter elkaar) of None als het niet gevonden is
+    """
+    tag = definitie['tag']
+    tag_pattern = re.compile(rf'<(/?){tag}\b[^>]*>', re.IGNORECASE)
+    fragmenten = []
+    positie = 0
+    
+    while True:
+        start_match = definitie['start'].search(html, positie)
+        if not start_match:
+            break
+        begin = start_match.start()
+        
+        if tag in LEGE_ELEMENTEN:
+            einde = html.find('>', begin) + 1
+            if einde == 0:
+                break
+        else:
+            # Tel geneste openings- en sluittags tot het gebied weer gesloten is
+            diepte = 0
+            einde = None
+            for match in tag_pattern.finditer(html, begin):
+                diepte += -1 if match.group(1) else 1
+                if diepte == 0:
+                    einde = match.end()
+                    break
+            if einde is None:
+                # Geen sluittag: neem de rest van de pagina
+                einde = len(html)
+        
+        fragmenten.append(html[begin:einde])
+        positie = einde
+    
+    return ''.join(fragmenten) or None
@@ -4,8 +4,8 @@ Verantwoordelijk voor het analyseren van HTML bronbestanden en het extraheren va
 """
 import os
 import re
-from bs4 import BeautifulSoup
 from modules.logger import logger
+from modules.html_backend import maak_soup
 
 class HtmlParser:
     """
@@ -38,8 +38,8 @@ class HtmlParser:
             with open(bestandspad, 'r', encoding='utf-8', errors='replace') as f:
                 inhoud = f.read()
             
-            # Parse de inhoud
-            self.soup = BeautifulSoup(inhoud, 'html.parser')
+            # Parse de inhoud met de snelste beschikbare parser
+            self.soup = maak_soup(inhoud)
             self.bestand = bestandspad
             
             logger.logInfo(f"HTML bronbestand geladen: {bestandspad}")
@@ -3,16 +3,45 @@ RentPro API Handler - Browserloze implementatie voor RentPro integratie
 Verantwoordelijk voor het communiceren met RentPro via directe HTTP requests
 zonder afhankelijkheid van een browser
 
+Alle verzoeken lopen via een niet-blokkerende aiohttp transport, zodat meerdere
+verzoeken tegelijk onderweg kunnen zijn zonder de event loop te blokkeren
+
 Deze module is de kern van de API-mode in de RentPro handler
 """
 import asyncio
 import re
 import json
-import requests
 import time
+import threading
 from datetime import datetime
-from bs4 import BeautifulSoup
+from html import unescape
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode
 from modules.logger import logger
+from modules.html_backend import maak_soup
+from modules.rentpro.config import laad_api_instellingen, laad_url
+from modules.rentpro.http_transport import maak_transport, TransportResponse
+from modules.rentpro.response_cache import ResponseCache
+from modules.rentpro.form_index import FormIndex
+from modules.rentpro.product_parser import parse_product_details, parse_product_rows
+from modules.rentpro.parse_pool import ParsePool
+from modules.rentpro.single_flight import SingleFlight
+from modules.rentpro.session_store import SessionStore
+from modules.rentpro.token_manager import TokenManager
+from modules.rentpro.debug_capture import DebugCapture
+from modules.rentpro.concurrency import AIMDController
+from modules.rentpro.retry import RetryBeleid, classificeer_fout, classificeer_status
+
+# Patronen voor het herkennen van de paginering in het productoverzicht
+LINK_PATTERN = re.compile(r'<a\b([^>]*)>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+PAGE_PARAM_PATTERN = re.compile(r'(grid-)?(page|pagina)', re.IGNORECASE)
+NEXT_LINK_TEXTS = {'>', '\u00bb', '\u203a', 'volgende', 'next'}
+
+# Zoekveld van het productoverzicht en velden van het zoekformulier voor de paginagrootte
+ZOEK_VELD = 'searchString'
+PAGINA_GROOTTE_PATTERN = re.compile(r'page_?size|per_?page|pagesize|aantal', re.IGNORECASE)
+
+# Formuliersoort van het lege Product/Edit formulier in de TokenManager
+FORMULIER_NIEUW_PRODUCT = 'nieuw_product'
 
 class ApiHandler:
     """
@@ -20,28 +49,153 @@ class ApiHandler:
     Vermijdt browserafhankelijkheid door rechtstreeks HTTP-requests te gebruiken
     """
     
-    def __init__(self):
-        """Initialiseer de API handler"""
-        self.session = requests.Session()
-        self.base_url = "http://metroeventsdc.rentpro5.nl"
+    def __init__(self, tenant=None, base_url=None):
+        """
+        Initialiseer de API handler
+        
+        Args:
+            tenant (str, optional): Naam van de RentPro omgeving in config/rentpro.ini ([Tenant <naam>]),
+                None voor de standaard omgeving; bepaalt de url, limieten en cache van deze handler
+            base_url (str, optional): Base URL, standaard de url van de omgeving in het config bestand
+        """
+        self.tenant = tenant
+        self.base_url = self._normaliseer_url(base_url or laad_url(tenant=tenant) or '')
         self.logged_in = False
         self.csrf_token = None
+        self.gebruikersnaam = None
+        # Wachtwoord alleen in het geheugen, voor opnieuw inloggen als de sessie verloopt
+        self._wachtwoord = None
         self.headers = {
             "User-Agent": "Mozilla/5.0 Excelladin/1.0",
             "Accept": "text/html,application/xhtml+xml,application/xml",
             "Accept-Language": "nl,en-US;q=0.7,en;q=0.3",
-            "Origin": "http://metroeventsdc.rentpro5.nl",
             "Connection": "keep-alive"
         }
+        
+        # Niet-blokkerende transport met connection pool volgens config/rentpro.ini
+        instellingen = laad_api_instellingen(tenant=tenant)
+        
+        # Optionele ringbuffer met recente verzoeken, alleen naar schijf bij een fout
+        self.debug_capture = None
+        if instellingen['debug_capture']:
+            self.debug_capture = DebugCapture(
+                max_items=instellingen['debug_capture_grootte'],
+                map_pad=instellingen['debug_capture_pad']
+            )
+        
+        # Adaptieve limiet voor het aantal verzoeken dat tegelijk naar RentPro gaat
+        self.concurrency = None
+        if instellingen['aimd_ingeschakeld']:
+            self.concurrency = AIMDController(
+                start=instellingen['aimd_start'],
+                minimum=instellingen['aimd_minimum'],
+                maximum=instellingen['aimd_maximum'],
+                p95_factor=instellingen['aimd_p95_factor']
+            )
+        
+        # Gelijktijdige aanvragen voor hetzelfde product delen één verzoek
+        self.single_flight = SingleFlight()
+        
+        # Werkers voor het parsen van pagina's buiten de event loop (processen of threads)
+        self.parse_pool = ParsePool(
+            processen=instellingen['parse_processen'],
+            threads=instellingen['parse_werkers']
+        )
+        
+        self.transport = maak_transport(
+            http2=instellingen['http2'],
+            compressie=instellingen['compressie'],
+            headers=self.headers,
+            max_verbindingen=instellingen['max_verbindingen'],
+            max_verbindingen_per_host=instellingen['max_verbindingen_per_host'],
+            keepalive_timeout=instellingen['keepalive_timeout'],
+            dns_cache_ttl=instellingen['dns_cache_ttl'],
+            timeout=instellingen['timeout'],
+            debug_capture=self.debug_capture,
+            concurrency=self.concurrency
+        )
+        
+        # Opnieuw proberen van tijdelijke fouten met exponentiële backoff
+        self.retry_beleid = RetryBeleid(
+            max_herhalingen={
+                'timeout': instellingen['retry_timeout'],
+                'verbinding': instellingen['retry_verbinding'],
+                'server': instellingen['retry_server'],
+                'te_veel_verzoeken': instellingen['retry_te_veel_verzoeken'],
+                'sessie': instellingen['retry_sessie'],
+            },
+            basis_vertraging=instellingen['retry_basis_vertraging'],
+            max_vertraging=instellingen['retry_max_vertraging']
+        )
+        
+        # Persistente cache voor productpagina's (cache_omzeilen=True haalt altijd vers op)
+        self.cache = None
+        self.cache_omzeilen = False
+        if instellingen['cache_ingeschakeld']:
+            try:
+                self.cache = ResponseCache(
+                    pad=instellingen['cache_pad'],
+                    ttl=instellingen['cache_ttl'],
+                    max_grootte_mb=instellingen['cache_max_mb']
+                )
+            except Exception as e:
+                logger.logWaarschuwing(f"Response cache niet beschikbaar: {e}")
+        
+        # Opgeslagen sessie, zodat een herstart niet opnieuw hoeft in te loggen
+        self.sessie_store = None
+        if instellingen['sessie_opslaan']:
+            self.sessie_store = SessionStore(
+                pad=instellingen['sessie_pad'],
+                max_leeftijd=instellingen['sessie_max_leeftijd']
+            )
+        self._herstel_lock = threading.Lock()
+        self._hersteld_voor = None
+        # Opnieuw inloggen gebeurt maar één keer tegelijk, ook bij veel gelijktijdige verzoeken
+        self._herlogin_lock = None
+        self._herlogin_loop = None
+        self._sessie_generatie = 0
+        # Lege formulieren met hun verificatie token, hergebruikt zolang de sessie geldig is
+        self.tokens = TokenManager()
+        # Of de laatste doorloop van het productoverzicht tot de laatste pagina kwam (zie iter_products)
+        self.overzicht_volledig = False
+    
+    async def close(self):
+        """
+        Sluit de HTTP sessie en open verbindingen (cookies blijven bewaard)
+        
+        Returns:
+            bool: True als sluiten succesvol was, anders False
+        """
+        return await self.transport.close()
+    
+    @staticmethod
+    def _normaliseer_url(url):
+        """Maak een RentPro URL volledig en verwijder een afsluitende slash"""
+        if url and not url.startswith(('http://', 'https://')):
+            url = f"http://{url}"
+        return url.rstrip('/')
+    
+    def _wissel_url(self, url):
+        """Stel een (nieuwe) base URL in; de sessie van een andere omgeving geldt hier niet"""
+        url = self._normaliseer_url(url)
+        if url != self.base_url:
+            self.logged_in = False
+            self._hersteld_voor = None
+            self.base_url = url
     
-    async def login(self, username, password, url=None):
+    async def login(self, username, password, url=None, forceer=False):
         """
         Log in op RentPro via directe HTTP requests
+        Als er een opgeslagen sessie voor deze gebruiker is wordt die hergebruikt
+        zonder verzoeken naar de server; is die sessie verlopen, dan wordt
+        automatisch opnieuw ingelogd bij het eerste verzoek dat naar de
+        loginpagina wordt doorgestuurd.
         
         Args:
             username (str): Gebruikersnaam
             password (str): Wachtwoord
             url (str, optional): Base URL voor RentPro
+            forceer (bool): Altijd een volledige login uitvoeren
             
         Returns:
             bool: True als inloggen succesvol was, anders False
@@ -49,29 +203,99 @@ class ApiHandler:
         try:
             # Update URL indien opgegeven
             if url:
-                if not url.startswith(('http://', 'https://')):
-                    url = f"http://{url}"
-                self.base_url = url
-                
+                self._wissel_url(url)
+            if not self.base_url:
+                logger.logFout("Geen RentPro url bekend, kan niet inloggen")
+                return False
+            
+            self._wachtwoord = password
+            
+            if not forceer:
+                if self.logged_in and self.gebruikersnaam == username:
+                    logger.logInfo("Sessie is al actief, login overgeslagen")
+                    return True
+                if self.herstel_sessie(username):
+                    return True
+            
+            return await self._login_met_server(username, password)
+        except Exception as e:
+            logger.logFout(f"Kritieke fout bij login: {e}")
+            return False
+    
+    def herstel_sessie(self, username, url=None):
+        """
+        Zet een opgeslagen sessie terug zonder verzoeken naar de server
+        Doet alleen bestandswerk en kan dus ook vanuit een achtergrondthread
+        aangeroepen worden terwijl de GUI wordt opgebouwd.
+        
+        Args:
+            username (str): Gebruikersnaam
+            url (str, optional): Base URL voor RentPro
+        
+        Returns:
+            bool: True als een sessie is teruggezet, anders False
+        """
+        if self.sessie_store is None or not username:
+            return False
+        
+        with self._herstel_lock:
+            if url:
+                self._wissel_url(url)
+            
+            sleutel = (self.base_url, username)
+            if self._hersteld_voor == sleutel and self.logged_in:
+                return True
+            
+            sessie = self.sessie_store.laad(self.base_url, username)
+            if not sessie:
+                return False
+            
+            self.transport.reset_cookies()
+            self.transport.herstel_cookies(sessie['cookies'], self.base_url)
+            self.csrf_token = sessie.get('csrf_token')
+            self.gebruikersnaam = username
+            self.logged_in = True
+            self._hersteld_voor = sleutel
+            self._sessie_generatie += 1
+            
+            logger.logInfo(f"Opgeslagen sessie hersteld voor {username}, login overgeslagen")
+            return True
+    
+    async def _login_met_server(self, username, password):
+        """
+        Voer de volledige login uit: loginpagina ophalen, token uitlezen en inloggegevens posten
+        
+        Args:
+            username (str): Gebruikersnaam
+            password (str): Wachtwoord
+        
+        Returns:
+            bool: True als inloggen succesvol was, anders False
+        """
+        try:
             # Reset sessie voor schone start
-            self.session = requests.Session()
+            self.transport.reset_cookies()
             self.logged_in = False
+            self._hersteld_voor = None
+            self.gebruikersnaam = username
             
             # Stap 1: Haal login pagina op voor verificatie token
             logger.logInfo("Login pagina ophalen...")
             login_url = f"{self.base_url}/Account/Login"
             
-            response = self.session.get(login_url, headers=self.headers)
+            response = await self.transport.get(login_url)
             if response.status_code != 200:
                 logger.logFout(f"Fout bij ophalen login pagina: {response.status_code}")
+                self._dump_debug("Loginpagina niet bereikbaar")
                 return False
             
-            # Stap 2: Extracteer verificatie token
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Stap 2: Extracteer verificatie token (parse alleen het token veld)
+            soup = maak_soup(response.text, gebied='token')
             token_field = soup.select_one('input[name="__RequestVerificationToken"]')
             
             if not token_field:
                 logger.logFout("Kon verificatie token niet vinden")
+                self._dump_debug("Verificatie token niet gevonden")
                 return False
                 
             token = token_field.get('value')
@@ -95,44 +319,150 @@ class ApiHandler:
             login_headers = self.headers.copy()
             login_headers.update({
                 "Content-Type": "application/x-www-form-urlencoded",
+                "Origin": self.base_url,
                 "Referer": login_url
             })
             
-            response = self.session.post(
+            response = await self.transport.post(
                 login_url,
                 data=login_data,
                 headers=login_headers,
                 allow_redirects=True
             )
             
-            # Debug: Sla response op
-            with open("login_response.html", "w", encoding="utf-8") as f:
-                f.write(response.text)
-            logger.logInfo("Response opgeslagen in login_response.html")
-            
             # Stap 4: Controleer login status
             if "Logout" in response.text or "Uitloggen" in response.text:
                 logger.logInfo("✅ LOGIN SUCCESVOL! (login indicator gevonden)")
-                self.logged_in = True
+                self._login_gelukt()
                 return True
             
             # Alternatieve success indicatoren
             success_indicators = ["Dashboard", "Welkom", "Menu", "Klanten vandaag online"]
             if any(indicator in response.text for indicator in success_indicators):
                 logger.logInfo("✅ LOGIN SUCCESVOL! (alternatieve indicator gevonden)")
-                self.logged_in = True
+                self._login_gelukt()
                 return True
             
-            # Login mislukt
+            # Login mislukt, een eventueel opgeslagen sessie is niet meer bruikbaar
+            if self.sessie_store is not None:
+                self.sessie_store.verwijder(self.base_url, username)
             logger.logFout("❌ Login mislukt, geen success indicators gevonden")
             if "Incorrect" in response.text or "ongeld" in response.text.lower():
                 logger.logFout("Foutmelding: ongeldige inloggegevens")
+            self._dump_debug("Login mislukt")
             return False
             
         except Exception as e:
             logger.logFout(f"Kritieke fout bij login: {e}")
             return False
     
+    def _login_gelukt(self):
+        """Markeer de sessie als ingelogd en sla deze op voor een volgende start"""
+        self.logged_in = True
+        self._sessie_generatie += 1
+        if self.sessie_store is not None:
+            self.sessie_store.sla_op(
+                self.base_url,
+                self.gebruikersnaam,
+                self.transport.exporteer_cookies(),
+                self.csrf_token
+            )
+    
+    def _dump_debug(self, reden):
+        """Schrijf de debug capture naar schijf als deze is ingeschakeld"""
+        if self.debug_capture is not None:
+            self.debug_capture.dump(reden)
+    
+    def _is_login_redirect(self, response):
+        """Controleer of een verzoek is doorgestuurd naar de loginpagina (sessie verlopen)"""
+        return '/Account/Login' in response.url
+    
+    async def _get(self, url, headers=None):
+        """Voer een GET verzoek uit binnen de ingelogde sessie (zie _verzoek)"""
+        return await self._verzoek('GET', url, headers=headers)
+    
+    async def _verzoek(self, methode, url, data=None, headers=None, herhaalbaar=True):
+        """
+        Voer een verzoek uit binnen de ingelogde sessie volgens het retry beleid
+        Tijdelijke fouten worden met backoff opnieuw geprobeerd. Als de server een GET
+        doorstuurt naar de loginpagina wordt opnieuw ingelogd en het verzoek herhaald.
+        Een POST wordt dan niet herhaald: het token in het formulier hoort bij de oude
+        sessie, de aanroeper moet het formulier opnieuw ophalen.
+        
+        Args:
+            methode (str): HTTP methode ('GET', 'HEAD' of 'POST')
+            url (str): Volledige URL
+            data (dict of list, optional): Formulierdata voor POST verzoeken
+            headers (dict, optional): Extra headers voor dit verzoek
+            herhaalbaar (bool): False als het verzoek niet veilig dubbel uitgevoerd kan worden
+        
+        Returns:
+            TransportResponse: Het laatste antwoord van de server
+        
+        Raises:
+            Exception: De laatste fout als alle pogingen voor die foutsoort op zijn
+        """
+        beschrijving = f"{methode} {url}"
+        pogingen = {}
+        
+        while True:
+            generatie = self._sessie_generatie
+            try:
+                response = await self.transport.request(methode, url, data=data, headers=headers)
+            except Exception as e:
+                soort = classificeer_fout(e, herhaalbaar)
+                if soort is None or not self.retry_beleid.mag_herhalen(soort, pogingen):
+                    raise
+                await self.retry_beleid.wacht(soort, pogingen, beschrijving)
+                continue
+            
+            soort = classificeer_status(response.status_code, herhaalbaar)
+            if soort is not None:
+                if not self.retry_beleid.mag_herhalen(soort, pogingen):
+                    return response
+                await self.retry_beleid.wacht(
+                    soort, pogingen, beschrijving, response.headers.get('Retry-After')
+                )
+                continue
+            
+            if methode in ('GET', 'HEAD') and self._is_login_redirect(response) and self._wachtwoord:
+                if generatie != self._sessie_generatie and self.logged_in:
+                    # Verzoek liep nog met de oude sessie, een ander verzoek heeft al opnieuw ingelogd
+                    continue
+                if not self.retry_beleid.mag_herhalen('sessie', pogingen):
+                    return response
+                pogingen['sessie'] = pogingen.get('sessie', 0) + 1
+                self.retry_beleid.statistieken['sessie'] += 1
+                if not await self._herlogin(generatie):
+                    return response
+                continue
+            
+            return response
+    
+    async def _herlogin(self, generatie):
+        """
+        Log opnieuw in nadat de sessie verlopen is
+        Gelijktijdige verzoeken wachten op dezelfde login in plaats van elk zelf in te loggen.
+        
+        Args:
+            generatie (int): Sessie generatie op het moment dat het verzoek werd gestart
+        
+        Returns:
+            bool: True als er (inmiddels) een geldige sessie is, anders False
+        """
+        loop = asyncio.get_running_loop()
+        if self._herlogin_lock is None or self._herlogin_loop is not loop:
+            self._herlogin_lock = asyncio.Lock()
+            self._herlogin_loop = loop
+        
+        async with self._herlogin_lock:
+            if self._sessie_generatie != generatie and self.logged_in:
+                # Een ander verzoek heeft al opnieuw ingelogd
+                return True
+            
+            logger.logInfo("Sessie verlopen, opnieuw inloggen...")
+            return await self._login_met_server(self.gebruikersnaam, self._wachtwoord)
+    
     async def wait_on_product_page(self):
         """
         Controleert of we op de RentPro productpagina zijn en wacht op verdere acties
@@ -146,17 +476,14 @@ class ApiHandler:
             
             # Haal huidige pagina op
             products_url = f"{self.base_url}/Product"
-            response = self.session.get(
-                products_url,
-                headers=self.headers
-            )
+            response = await self._get(products_url)
             
             if response.status_code != 200:
                 logger.logFout(f"[{timestamp}] [LOCATION] Fout bij verificatie productpagina: {response.status_code}")
                 return False
             
             # Parse HTML en controleer op productpagina elementen
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = maak_soup(response.text)
             
             # Controleer op tabellen met class="grid"
             grid_tables = soup.select('table.grid')
@@ -205,10 +532,7 @@ class ApiHandler:
             # Navigeer naar producten pagina
             logger.logInfo(f"[{timestamp}] Navigeren naar productenpagina...")
             products_url = f"{self.base_url}/Product"
-            response = self.session.get(
-                products_url,
-                headers=self.headers
-            )
+            response = await self._get(products_url)
             
             if response.status_code != 200:
                 logger.logFout(f"[{timestamp}] Fout bij navigeren naar producten: {response.status_code}")
@@ -255,6 +579,7 @@ class ApiHandler:
     async def get_products_list(self):
         """
         Haal lijst van producten op via HTTP requests
+        Volgt alle pagina's van het productoverzicht via iter_products
         
         Returns:
             list: Lijst van producten als dictionaries met 'id' en 'naam' sleutels
@@ -264,78 +589,255 @@ class ApiHandler:
                 logger.logFout("Niet ingelogd bij ophalen productlijst")
                 return []
             
-            # Haal productlijst op
-            products_url = f"{self.base_url}/Product"
-            response = self.session.get(
-                products_url,
-                headers=self.headers
-            )
-            
-            if response.status_code != 200:
-                logger.logFout(f"Fout bij ophalen productlijst: {response.status_code}")
-                return []
-            
-            # Parse HTML en zoek producten tabel
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Zoek de producten tabel (heeft class noBold gvItems)
-            product_table = soup.select_one('table.gvItems')
-            if not product_table:
-                product_table = soup.select_one('table.noBold')
-                if not product_table:
-                    logger.logWaarschuwing("Geen producttabel gevonden in HTML")
-                    return []
-            
-            # Zoek alle product rijen (alternating even/oneven classes)
-            product_rows = product_table.select('tr.even, tr.oneven')
-            if not product_rows:
-                logger.logWaarschuwing("Geen productrijen gevonden in tabel")
-                return []
-            
-            # Extraheer product IDs en namen
-            products = []
-            for row in product_rows:
-                cells = row.select('td')
-                if len(cells) >= 4:  # Zorg dat er genoeg kolommen zijn
-                    # Eerste kolom (0) bevat ID, vierde kolom (3) bevat naam
-                    product_id_cell = cells[0]
-                    product_name_cell = cells[3]
-                    
-                    # Haal de waarden uit de cellen
-                    # Merk op dat de ID/naam in een <a> tag kunnen zitten
-                    product_id = product_id_cell.get_text(strip=True)
-                    product_name = product_name_cell.get_text(strip=True)
-                    
-                    # Als er geen tekst is, probeer dan de inhoud van een <a> tag
-                    if not product_id and product_id_cell.find('a'):
-                        product_id = product_id_cell.find('a').get_text(strip=True)
-                    
-                    if not product_name and product_name_cell.find('a'):
-                        product_name = product_name_cell.find('a').get_text(strip=True)
-                    
-                    if product_id and product_name:
-                        products.append({
-                            'id': product_id,
-                            'naam': product_name
-                        })
+            products = [product async for product in self.iter_products()]
             
             logger.logInfo(f"{len(products)} producten gevonden")
             return products
             
         except Exception as e:
             logger.logFout(f"Fout bij ophalen productlijst: {e}")
+            self._dump_debug("Fout bij ophalen productlijst")
             return []
     
-    async def get_product_details(self, product_id):
+    async def iter_products(self, start_url=None):
+        """
+        Doorloop het productoverzicht pagina voor pagina
+        Terwijl een pagina op de parse pool geparsed wordt, wordt de volgende pagina al opgehaald.
+        Er staat steeds maar één pagina in het geheugen. Na afloop geeft overzicht_volledig aan
+        of alle pagina's doorlopen zijn (en niet gestopt is door een fout).
+        
+        Args:
+            start_url (str, optional): URL van de eerste pagina (standaard /Product)
+        
+        Yields:
+            dict: Product met 'id' en 'naam' sleutels
+        """
+        self.overzicht_volledig = False
+        if not self.logged_in:
+            logger.logFout("Niet ingelogd bij doorlopen productlijst")
+            return
+        
+        url = start_url or f"{self.base_url}/Product"
+        bezochte_urls = {url}
+        volgende_taak = asyncio.ensure_future(self._get(url))
+        pagina = 0
+        
+        try:
+            while volgende_taak is not None:
+                response = await volgende_taak
+                volgende_taak = None
+                pagina += 1
+                
+                if response.status_code != 200:
+                    logger.logFout(f"Fout bij ophalen productpagina {pagina}: {response.status_code}")
+                    self._dump_debug(f"Productpagina {pagina} mislukt")
+                    return
+                
+                # Start alvast de volgende pagina (prefetch) voordat deze pagina geparsed wordt
+                volgende_url = self._find_next_page_url(response.text, response.url)
+                if volgende_url and volgende_url not in bezochte_urls:
+                    bezochte_urls.add(volgende_url)
+                    volgende_taak = asyncio.ensure_future(self._get(volgende_url))
+                
+                # Parse op de parse pool, de prefetch loopt intussen door
+                products = await self.parse_pool.voer_uit(parse_product_rows, response.text)
+                if not products:
+                    # Lege pagina: einde van het overzicht
+                    logger.logWaarschuwing(f"Geen productrijen gevonden op productpagina {pagina}")
+                    self.overzicht_volledig = True
+                    return
+                
+                logger.logInfo(f"Productpagina {pagina}: {len(products)} producten")
+                for product in products:
+                    yield product
+            
+            self.overzicht_volledig = True
+        finally:
+            # Annuleer een lopende prefetch als de aanroeper stopt met itereren
+            if volgende_taak is not None and not volgende_taak.done():
+                volgende_taak.cancel()
+    
+    async def zoek_producten(self, zoekterm, max_resultaten=None):
+        """
+        Zoek producten via het zoekformulier van het productoverzicht (zonder browser)
+        De resultaatpagina's worden doorlopen zoals het overzicht (zie iter_products), zodat
+        elk gevonden product al verwerkt kan worden terwijl de volgende pagina nog laadt.
+        
+        Args:
+            zoekterm (str): Zoekterm zoals in het zoekveld van RentPro
+            max_resultaten (int, optional): Stop na dit aantal producten; wordt ook als paginagrootte
+                meegestuurd als het zoekformulier daar een veld voor heeft
+        
+        Yields:
+            dict: Gevonden product met 'id' en 'naam' sleutels
+        """
+        if not self.logged_in:
+            logger.logFout("Niet ingelogd bij zoeken naar producten")
+            return
+        
+        zoek_url = await self._zoek_url(zoekterm, max_resultaten)
+        logger.logInfo(f"Zoeken naar '{zoekterm}': {zoek_url}")
+        
+        gevonden = set()
+        resultaten = self.iter_products(start_url=zoek_url)
+        try:
+            async for product in resultaten:
+                if product['id'] in gevonden:
+                    continue
+                gevonden.add(product['id'])
+                yield product
+                if max_resultaten and len(gevonden) >= max_resultaten:
+                    return
+        finally:
+            # Stopt ook de prefetch van de volgende resultaatpagina
+            await resultaten.aclose()
+            logger.logInfo(f"{len(gevonden)} producten gevonden voor '{zoekterm}'")
+    
+    async def _zoek_url(self, zoekterm, max_resultaten=None):
+        """
+        Bepaal de URL van de eerste resultaatpagina
+        Het (GET) zoekformulier op de productpagina wordt gevolgd met zijn action en verborgen
+        velden, zodat de zoekopdracht gelijk is aan die van de browser. Zonder herkenbaar
+        formulier gaat de zoekterm als searchString naar /Product.
+        
+        Args:
+            zoekterm (str): Zoekterm
+            max_resultaten (int, optional): Gewenst aantal resultaten per pagina
+        
+        Returns:
+            str: Absolute URL van de eerste resultaatpagina
+        """
+        products_url = f"{self.base_url}/Product"
+        try:
+            response = await self._get(products_url)
+            if response.status_code == 200 and ZOEK_VELD in response.text:
+                soup = maak_soup(response.text)
+                zoekveld = soup.find('input', id=ZOEK_VELD) or soup.find('input', attrs={'name': ZOEK_VELD})
+                formulier = zoekveld.find_parent('form') if zoekveld is not None else None
+                
+                if formulier is not None and (formulier.get('method') or 'get').lower() == 'get':
+                    index = FormIndex(formulier)
+                    zoeknaam = zoekveld.get('name') or ZOEK_VELD
+                    velden = []
+                    for naam, waarde in index.formulier:
+                        if naam == zoeknaam:
+                            waarde = zoekterm
+                        elif max_resultaten and PAGINA_GROOTTE_PATTERN.fullmatch(naam):
+                            waarde = self._kies_pagina_grootte(index.opties.get(naam), max_resultaten)
+                        velden.append((naam, waarde))
+                    if zoeknaam not in {naam for naam, _ in velden}:
+                        velden.append((zoeknaam, zoekterm))
+                    actie = urljoin(response.url, index.actie or products_url)
+                    return f"{actie.split('?')[0]}?{urlencode(velden)}"
+                
+                logger.logWaarschuwing("Geen GET zoekformulier gevonden, standaard zoek URL wordt gebruikt")
+        except Exception as e:
+            logger.logWaarschuwing(f"Zoekformulier kon niet gelezen worden, standaard zoek URL wordt gebruikt: {e}")
+        
+        return f"{products_url}?{urlencode({ZOEK_VELD: zoekterm})}"
+    
+    @staticmethod
+    def _kies_pagina_grootte(opties, max_resultaten):
+        """Kies de kleinste paginagrootte die alle resultaten op één pagina zet (of de grootste)"""
+        if not opties:
+            return str(max_resultaten)
+        groottes = sorted(int(waarde) for waarde, _ in opties if str(waarde).isdigit())
+        if not groottes:
+            return str(max_resultaten)
+        return str(next((grootte for grootte in groottes if grootte >= max_resultaten), groottes[-1]))
+    
+    def _find_next_page_url(self, html, huidige_url):
+        """
+        Helper methode om de URL van de volgende pagina in de grid-paginering te vinden
+        Werkt met een snelle scan over de links, zodat de volgende pagina al opgehaald
+        kan worden voordat de huidige pagina volledig geparsed is.
+        
+        Args:
+            html (str): HTML van de huidige pagina
+            huidige_url (str): URL van de huidige pagina
+        
+        Returns:
+            str: Absolute URL van de volgende pagina of None als er geen volgende pagina is
+        """
+        try:
+            # Bepaal het huidige paginanummer uit de URL (standaard pagina 1)
+            huidige_query = parse_qs(urlparse(huidige_url).query)
+            huidige_pagina = 1
+            for naam, waarden in huidige_query.items():
+                if PAGE_PARAM_PATTERN.fullmatch(naam) and waarden and waarden[0].isdigit():
+                    huidige_pagina = int(waarden[0])
+                    break
+            
+            volgende_link = None
+            for match in LINK_PATTERN.finditer(html):
+                attributen, tekst = match.group(1), match.group(2)
+                href_match = re.search(r'href\s*=\s*["\']([^"\']+)["\']', attributen, re.IGNORECASE)
+                if not href_match:
+                    continue
+                href = unescape(href_match.group(1))
+                if href.startswith(('#', 'javascript:')):
+                    continue
+                
+                # Voorkeur: link naar paginanummer huidige_pagina + 1
+                query = parse_qs(urlparse(href).query)
+                for naam, waarden in query.items():
+                    if PAGE_PARAM_PATTERN.fullmatch(naam) and waarden and waarden[0].isdigit():
+                        if int(waarden[0]) == huidige_pagina + 1:
+                            return urljoin(huidige_url, href)
+                
+                # Alternatief: link met rel="next" of een "volgende" tekst
+                link_tekst = unescape(re.sub(r'<[^>]+>', '', tekst)).strip().lower()
+                if volgende_link is None and (
+                    re.search(r'rel\s*=\s*["\']next["\']', attributen, re.IGNORECASE)
+                    or link_tekst in NEXT_LINK_TEXTS
+                ):
+                    volgende_link = urljoin(huidige_url, href)
+            
+            return volgende_link
+        except Exception:
+            return None
+    
+    async def get_product_details(self, product_id, gebruik_cache=True):
         """
         Haal details van een specifiek product op via HTTP
         
         Args:
             product_id (str): ID van het product
+            gebruik_cache (bool): Of de response cache gebruikt mag worden
             
         Returns:
             dict: Product gegevens of None bij fout
         """
+        html = await self.fetch_product_page(product_id, gebruik_cache)
+        if html is None:
+            return None
+        
+        try:
+            return parse_product_details(product_id, html, self.base_url)
+        except Exception as e:
+            logger.logFout(f"Fout bij verwerken productdetails voor {product_id}: {e}")
+            self._dump_debug(f"Fout bij productdetails {product_id}")
+            return None
+    
+    async def fetch_product_page(self, product_id, gebruik_cache=True):
+        """
+        Haal de pagina van een product op zonder deze te parsen (zie product_parser)
+        Aanvragen voor een product dat al wordt opgehaald wachten op hetzelfde verzoek,
+        en binnen een run (zie single_flight) wordt een product maar één keer opgehaald.
+        
+        Args:
+            product_id (str): ID van het product
+            gebruik_cache (bool): Of de response cache gebruikt mag worden
+        
+        Returns:
+            str: HTML van de productpagina of None bij fout
+        """
+        return await self.single_flight.uitvoeren(
+            product_id, self._fetch_product_page, product_id, gebruik_cache
+        )
+    
+    async def _fetch_product_page(self, product_id, gebruik_cache):
+        """Haal de pagina van een product op (zonder samenvoegen van dubbele aanvragen)"""
         try:
             if not self.logged_in:
                 logger.logFout("Niet ingelogd bij ophalen productdetails")
@@ -343,104 +845,177 @@ class ApiHandler:
             
             # Haal productdetails op (probeer eerst Edit pagina, dan Details pagina)
             edit_url = f"{self.base_url}/Product/Edit/{product_id}"
-            response = self.session.get(
-                edit_url,
-                headers=self.headers,
-                allow_redirects=True
-            )
+            response = await self._get_cached(edit_url, gebruik_cache)
             
             if response.status_code != 200:
                 # Probeer de details pagina als edit niet werkt
                 details_url = f"{self.base_url}/Product/Details/{product_id}"
-                response = self.session.get(
-                    details_url, 
-                    headers=self.headers
-                )
+                response = await self._get_cached(details_url, gebruik_cache)
                 
                 if response.status_code != 200:
                     logger.logFout(f"Fout bij ophalen productdetails: {response.status_code}")
+                    self._dump_debug(f"Productdetails {product_id} mislukt")
                     return None
             
-            # Parse HTML en extraheer productgegevens
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Zoek belangrijke velden op basis van id of label
-            product_data = {
-                'id': product_id,
-                'naam': self._extract_input_value(soup, 'Product_Name') or self._extract_field_value(soup, "Naam"),
-                'beschrijving': self._extract_input_value(soup, 'Product_Decription') or self._extract_field_value(soup, "Omschrijving"),
-                'prijs': self._extract_input_value(soup, 'ProductPrice') or self._extract_field_value(soup, "Prijs") or "0.00",
-                'categorie': self._extract_input_value(soup, 'Product_CategoryID') or self._extract_field_value(soup, "Categorie") or "Onbekend",
-                'voorraad': self._extract_input_value(soup, 'Stock') or self._extract_field_value(soup, "Voorraad") or "0",
-                'afbeelding_url': self._extract_image_url(soup),
-                'last_updated': time.strftime("%Y-%m-%d %H:%M:%S")
-            }
+            # Doorgestuurd naar de loginpagina: de sessie is verlopen en opnieuw inloggen lukte niet
+            if self._is_login_redirect(response):
+                logger.logFout(f"Sessie verlopen bij ophalen productdetails voor {product_id}")
+                self._dump_debug(f"Sessie verlopen bij product {product_id}")
+                return None
             
-            return product_data
+            return response.text
             
         except Exception as e:
             logger.logFout(f"Fout bij ophalen productdetails voor {product_id}: {e}")
+            self._dump_debug(f"Fout bij productdetails {product_id}")
             return None
     
-    def _extract_input_value(self, soup, input_id):
-        """Helper methode om waarde van input veld te extraheren op basis van ID"""
-        try:
-            input_elem = soup.find('input', id=input_id)
-            if input_elem and input_elem.has_attr('value'):
-                return input_elem['value']
-                
-            # Probeer ook textarea
-            textarea = soup.find('textarea', id=input_id)
-            if textarea:
-                return textarea.get_text(strip=True)
-                
-            # Probeer ook select
-            select = soup.find('select', id=input_id)
-            if select:
-                selected_option = select.find('option', selected=True)
-                if selected_option:
-                    return selected_option.get_text(strip=True)
-            
-            return ""
-        except Exception:
-            return ""
+    async def get_product_form(self, product_id=None):
+        """
+        Haal het bewerkformulier van een product op, of een leeg formulier voor een nieuw product
+        Een bewerkformulier wordt altijd vers opgehaald (de huidige waarden zijn nodig). Het
+        lege formulier is voor elk nieuw product gelijk en wordt met zijn verificatie token
+        hergebruikt zolang de sessie geldig is en de server het token niet afwijst
+        (zie verwerp_product_form).
+        
+        Args:
+            product_id (str, optional): ID van het product, None voor een nieuw product
+        
+        Returns:
+            tuple: (FormIndex, url van het formulier) of None bij fout
+        """
+        if product_id is None:
+            return await self.tokens.formulier(
+                self._sessie_sleutel(), FORMULIER_NIEUW_PRODUCT, self._haal_product_form
+            )
+        return await self._haal_product_form(product_id)
     
-    def _extract_field_value(self, soup, field_name):
-        """Helper methode om veldwaarde te extraheren uit HTML"""
-        try:
-            # Zoek label met veldnaam
-            label = soup.find('label', string=re.compile(field_name, re.IGNORECASE))
-            if label and label.parent:
-                # Vind de waarde in het volgende element of sibling
-                value_elem = label.find_next('div') or label.find_next('span') or label.find_next('p')
-                if value_elem:
-                    return value_elem.get_text(strip=True)
-            
-            # Alternatieve methode: zoek in table met twee kolommen
-            rows = soup.select('table tr')
-            for row in rows:
-                cells = row.select('td, th')
-                if len(cells) >= 2 and field_name.lower() in cells[0].get_text().lower():
-                    return cells[1].get_text(strip=True)
-            
-            return ""
-        except Exception:
-            return ""
+    def verwerp_product_form(self, formulier, product_id=None):
+        """
+        Vergeet een bewaard leeg formulier nadat de server het token heeft afgewezen
+        of de post naar de loginpagina werd doorgestuurd; het volgende nieuwe product
+        haalt dan een vers formulier op
+        
+        Args:
+            formulier (tuple): Het formulier zoals teruggegeven door get_product_form
+            product_id (str, optional): ID van het product, None voor een nieuw product
+        """
+        if product_id is None:
+            self.tokens.verwerp(self._sessie_sleutel(), FORMULIER_NIEUW_PRODUCT, formulier)
     
-    def _extract_image_url(self, soup):
-        """Helper methode om afbeelding URL te extraheren"""
+    def _sessie_sleutel(self):
+        """Sleutel van de huidige sessie: verandert bij elke login en elke andere server of gebruiker"""
+        return (self.base_url, self.gebruikersnaam, self._sessie_generatie)
+    
+    async def _haal_product_form(self, product_id=None):
+        """Haal een productformulier op van de server (zie get_product_form)"""
         try:
-            # Zoek productafbeelding
-            img = soup.select_one('img.product-image') or soup.select_one('.product-details img')
-            if img and img.has_attr('src'):
-                src = img['src']
-                # Maak relatieve URL absoluut indien nodig
-                if src.startswith('/'):
-                    return f"{self.base_url}{src}"
-                return src
-            return ""
-        except Exception:
-            return ""
+            if not self.logged_in:
+                logger.logFout("Niet ingelogd bij ophalen productformulier")
+                return None
+            
+            url = f"{self.base_url}/Product/Edit" + (f"/{product_id}" if product_id else "")
+            response = await self._get(url)
+            
+            if response.status_code != 200 or self._is_login_redirect(response):
+                logger.logFout(f"Fout bij ophalen productformulier {product_id or '(nieuw)'}: {response.status_code}")
+                self._dump_debug(f"Productformulier {product_id or '(nieuw)'} mislukt")
+                return None
+            
+            index = FormIndex(maak_soup(response.text, gebied='productformulier'))
+            if not index.formulier:
+                logger.logFout(f"Geen formuliervelden gevonden voor product {product_id or '(nieuw)'}")
+                self._dump_debug(f"Leeg productformulier {product_id or '(nieuw)'}")
+                return None
+            
+            return index, response.url
+        
+        except Exception as e:
+            logger.logFout(f"Fout bij ophalen productformulier {product_id or '(nieuw)'}: {e}")
+            return None
+    
+    async def submit_product_form(self, url, payload, referer, herhaalbaar=True):
+        """
+        Verstuur een ingevuld productformulier
+        
+        Args:
+            url (str): URL waar het formulier naartoe gepost wordt
+            payload (list): Formulierinhoud als (naam, waarde) paren
+            referer (str): URL van de pagina met het formulier
+            herhaalbaar (bool): False voor het aanmaken van een product (niet dubbel versturen)
+        
+        Returns:
+            TransportResponse: Antwoord van de server (na redirects)
+        """
+        headers = self.headers.copy()
+        headers.update({
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Origin": self.base_url,
+            "Referer": referer
+        })
+        response = await self._verzoek('POST', url, data=payload, headers=headers, herhaalbaar=herhaalbaar)
+        
+        # De gecachte pagina van dit product klopt na het opslaan niet meer
+        if self.cache is not None:
+            self.cache.verwijder(referer, f"{self.base_url}|{self.gebruikersnaam}")
+        return response
+    
+    async def haal_bestand(self, url, methode='GET', headers=None):
+        """
+        Haal een bestand (bijvoorbeeld een productafbeelding) op binnen de ingelogde sessie
+        
+        Args:
+            url (str): Volledige URL van het bestand
+            methode (str): 'GET' voor de inhoud of 'HEAD' voor alleen de headers
+            headers (dict, optional): Extra headers, bijvoorbeeld If-None-Match voor een conditioneel verzoek
+        
+        Returns:
+            TransportResponse: Het antwoord van de server (content bevat de ruwe bytes)
+        """
+        return await self._verzoek(methode, url, headers=headers)
+    
+    async def _get_cached(self, url, gebruik_cache=True):
+        """
+        Helper methode om een pagina op te halen via de response cache
+        Verse pagina's komen direct uit de cache, verlopen pagina's worden
+        conditioneel gevalideerd met ETag/Last-Modified
+        
+        Args:
+            url (str): URL van de pagina
+            gebruik_cache (bool): Of de cache gebruikt mag worden
+        
+        Returns:
+            TransportResponse: Het antwoord (uit de cache of van de server)
+        """
+        if self.cache is None or self.cache_omzeilen or not gebruik_cache:
+            return await self._get(url)
+        
+        sessie_sleutel = f"{self.base_url}|{self.gebruikersnaam}"
+        opgeslagen = self.cache.haal_op(url, sessie_sleutel)
+        if opgeslagen and opgeslagen['vers']:
+            self.cache.statistieken['hits'] += 1
+            return TransportResponse(200, opgeslagen['body'], url, {'X-Cache': 'HIT'})
+        
+        # Conditioneel verzoek als de server validators heeft meegegeven
+        headers = {}
+        if opgeslagen:
+            if opgeslagen['etag']:
+                headers['If-None-Match'] = opgeslagen['etag']
+            if opgeslagen['last_modified']:
+                headers['If-Modified-Since'] = opgeslagen['last_modified']
+        
+        response = await self._get(url, headers=headers or None)
+        
+        if response.status_code == 304 and opgeslagen:
+            self.cache.statistieken['gevalideerd'] += 1
+            self.cache.ververs(url, sessie_sleutel)
+            return TransportResponse(200, opgeslagen['body'], url, {'X-Cache': 'REVALIDATED'})
+        
+        self.cache.statistieken['missers'] += 1
+        # Sla alleen echte productpagina's op, geen doorverwijzing naar de loginpagina
+        if response.status_code == 200 and '/Account/Login' not in response.url:
+            self.cache.sla_op(url, sessie_sleutel, response.text, response.headers)
+        return response
     
     def _get_current_datetime(self):
         """Helper methode om huidige datum en tijd te krijgen"""
@@ -10,6 +10,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from modules.logger import logger
+from modules.rentpro.config import laad_url
 
 class Authenticator:
     """
@@ -17,15 +18,16 @@ class Authenticator:
     BELANGRIJK: Alleen gebruikt in browser mode, niet in API mode
     """
     
-    def __init__(self, driver_manager):
+    def __init__(self, driver_manager, base_url=None):
         """
         Initialiseer de authenticator
         
         Args:
             driver_manager (DriverManager): De driver manager instantie
+            base_url (str, optional): Base URL voor RentPro, standaard uit config/rentpro.ini
         """
         self.driver_manager = driver_manager
-        self.base_url = "http://metroeventsdc.rentpro5.nl"
+        self.base_url = (base_url or laad_url() or '').rstrip('/')
     
     async def login(self, username, password, url=None):
         """
@@ -44,7 +46,7 @@ class Authenticator:
             if url:
                 if not url.startswith(('http://', 'https://')):
                     url = f"http://{url}"
-                self.base_url = url
+                self.base_url = url.rstrip('/')
             
             # Controleer of driver geïnitialiseerd is
             driver = self.driver_manager.get_driver()
@@ -0,0 +1,383 @@
+"""
+Product Catalogus voor RentPro integratie
+Verantwoordelijk voor een lokale index van alle RentPro producten
+
+De catalogus staat in een SQLite bestand op schijf en bevat per RentPro omgeving
+(basis URL) alle producten uit het productoverzicht, aangevuld met gegevens van de
+detailpagina's. Opzoeken op ID, productcode of naam, controleren of producten
+bestaan en het overzicht in de GUI zijn daardoor lokale queries.
+
+Verversen is incrementeel: van elke rij uit het overzicht wordt een vingerafdruk
+(hash) bewaard. Alleen producten die nieuw zijn of waarvan de rij veranderd is
+worden opnieuw opgehaald; producten die niet meer in het overzicht staan worden
+verwijderd. De volledige gegevens van de laatst opgehaalde detailpagina worden
+mee opgeslagen, zodat een synchronisatie ongewijzigde producten uit de catalogus
+kan schrijven in plaats van hun detailpagina op te halen (delta sync).
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+import unicodedata
+from modules.logger import logger
+
+# SQLite staat maximaal 999 parameters per query toe (oudere versies)
+MAX_PARAMETERS = 900
+
+def normaliseer_naam(naam):
+    """
+    Normaliseer een productnaam voor het opzoeken: kleine letters, zonder accenten
+    en met enkele spaties
+    
+    Args:
+        naam (str): Productnaam
+    
+    Returns:
+        str: Genormaliseerde naam
+    """
+    tekst = unicodedata.normalize('NFKD', str(naam or ''))
+    tekst = ''.join(teken for teken in tekst if not unicodedata.combining(teken))
+    return re.sub(r'\s+', ' ', tekst).strip().lower()
+
+class ProductCatalog:
+    """
+    Lokale SQLite index van de RentPro producten met incrementeel verversen
+    """
+    
+    def __init__(self, pad='cache/rentpro_catalogus.sqlite'):
+        """
+        Initialiseer de catalogus
+        
+        Args:
+            pad (str): Pad naar het SQLite bestand
+        """
+        self.pad = pad
+        self._lock = threading.Lock()
+        
+        map_pad = os.path.dirname(pad)
+        if map_pad and not os.path.exists(map_pad):
+            os.makedirs(map_pad)
+        
+        self._db = sqlite3.connect(pad, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS producten (
+                bron TEXT NOT NULL,
+                id TEXT NOT NULL,
+                naam TEXT,
+                naam_genormaliseerd TEXT,
+                code TEXT,
+                url_naam TEXT,
+                categorie TEXT,
+                prijs TEXT,
+                voorraad TEXT,
+                positie INTEGER,
+                lijst_hash TEXT,
+                gezien_op REAL NOT NULL,
+                details_op REAL,
+                details TEXT,
+                PRIMARY KEY (bron, id)
+            )
+            """
+        )
+        kolommen = {rij['name'] for rij in self._db.execute("PRAGMA table_info(producten)")}
+        if 'details' not in kolommen:
+            # Catalogus van een eerdere versie, zonder opgeslagen details
+            self._db.execute("ALTER TABLE producten ADD COLUMN details TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_code ON producten (bron, code)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_naam ON producten (bron, naam_genormaliseerd)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_positie ON producten (bron, positie)")
+        self._db.commit()
+    
+    def werk_lijst_bij(self, bron, producten, volledig=True):
+        """
+        Verwerk het productoverzicht en bepaal welke producten opnieuw opgehaald moeten worden
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            producten (list): Producten uit het overzicht (dicts met 'id', 'naam' en 'hash'), in volgorde
+            volledig (bool): Of het overzicht volledig doorlopen is; alleen dan worden producten
+                die er niet meer in staan verwijderd
+        
+        Returns:
+            dict: 'te_verversen' (IDs die nieuw of gewijzigd zijn of nog geen details hebben),
+                'nieuw', 'gewijzigd', 'ongewijzigd' en 'verwijderd' (aantallen)
+        """
+        resultaat = {'te_verversen': [], 'nieuw': 0, 'gewijzigd': 0, 'ongewijzigd': 0, 'verwijderd': 0}
+        try:
+            nu = time.time()
+            with self._lock:
+                bekend = {
+                    rij['id']: (rij['lijst_hash'], rij['details_op'])
+                    for rij in self._db.execute(
+                        "SELECT id, lijst_hash, details_op FROM producten WHERE bron = ?", (bron,)
+                    )
+                }
+                
+                nieuw, gewijzigd, ongewijzigd = [], [], []
+                gezien = set()
+                for positie, product in enumerate(producten):
+                    product_id = str(product['id'])
+                    if product_id in gezien:
+                        continue
+                    gezien.add(product_id)
+                    if product_id not in bekend:
+                        nieuw.append((bron, product_id, product['naam'], normaliseer_naam(product['naam']),
+                                      positie, product.get('hash'), nu))
+                        resultaat['te_verversen'].append(product_id)
+                    elif bekend[product_id][0] != product.get('hash'):
+                        # Rij gewijzigd: details opnieuw ophalen (details_op leeg tot dat gelukt is)
+                        gewijzigd.append((product['naam'], normaliseer_naam(product['naam']), positie,
+                                          product.get('hash'), nu, bron, product_id))
+                        resultaat['te_verversen'].append(product_id)
+                    else:
+                        ongewijzigd.append((positie, nu, bron, product_id))
+                        if bekend[product_id][1] is None:
+                            # Details eerder niet gelukt, opnieuw proberen
+                            resultaat['te_verversen'].append(product_id)
+                
+                self._db.executemany(
+                    """
+                    INSERT INTO producten (bron, id, naam, naam_genormaliseerd, positie, lijst_hash, gezien_op)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    nieuw
+                )
+                self._db.executemany(
+                    """
+                    UPDATE producten SET naam = ?, naam_genormaliseerd = ?, positie = ?, lijst_hash = ?,
+                        gezien_op = ?, details_op = NULL
+                    WHERE bron = ? AND id = ?
+                    """,
+                    gewijzigd
+                )
+                self._db.executemany(
+                    "UPDATE producten SET positie = ?, gezien_op = ? WHERE bron = ? AND id = ?",
+                    ongewijzigd
+                )
+                
+                # Een leeg overzicht is eerder een fout (bijvoorbeeld een verlopen sessie) dan een lege catalogus
+                if volledig and gezien:
+                    resultaat['verwijderd'] = self._db.execute(
+                        "DELETE FROM producten WHERE bron = ? AND gezien_op < ?", (bron, nu)
+                    ).rowcount
+                self._db.commit()
+            
+            resultaat['nieuw'] = len(nieuw)
+            resultaat['gewijzigd'] = len(gewijzigd)
+            resultaat['ongewijzigd'] = len(ongewijzigd)
+            return resultaat
+        except Exception as e:
+            logger.logFout(f"Fout bij bijwerken productcatalogus: {e}")
+            with self._lock:
+                self._db.rollback()
+            return resultaat
+    
+    def werk_details_bij(self, bron, product):
+        """
+        Sla de gegevens van een detailpagina op
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            product (dict): Productgegevens zoals parse_product_details ze teruggeeft
+        
+        Returns:
+            bool: True als het product in de catalogus is bijgewerkt
+        """
+        try:
+            with self._lock:
+                bijgewerkt = self._db.execute(
+                    """
+                    UPDATE producten SET
+                        naam = COALESCE(NULLIF(?, ''), naam),
+                        naam_genormaliseerd = COALESCE(NULLIF(?, ''), naam_genormaliseerd),
+                        code = ?, url_naam = ?, categorie = ?, prijs = ?, voorraad = ?, details_op = ?, details = ?
+                    WHERE bron = ? AND id = ?
+                    """,
+                    (
+                        product.get('naam'),
+                        normaliseer_naam(product.get('naam')),
+                        product.get('code') or None,
+                        product.get('url_naam') or None,
+                        product.get('categorie'),
+                        product.get('prijs'),
+                        product.get('voorraad'),
+                        time.time(),
+                        json.dumps(product, ensure_ascii=False, default=str),
+                        bron,
+                        str(product['id'])
+                    )
+                ).rowcount
+                self._db.commit()
+            return bijgewerkt > 0
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij opslaan productdetails in catalogus: {e}")
+            return False
+    
+    def zoek_id(self, bron, product_id):
+        """
+        Zoek een product op ID
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            product_id (str): ID van het product
+        
+        Returns:
+            dict: Product uit de catalogus of None als het niet bekend is
+        """
+        return self._een(
+            "SELECT * FROM producten WHERE bron = ? AND id = ?", (bron, str(product_id).strip())
+        )
+    
+    def zoek_code(self, bron, code):
+        """
+        Zoek een product op productcode
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            code (str): Productcode
+        
+        Returns:
+            dict: Product uit de catalogus of None als de code niet bekend is
+        """
+        return self._een(
+            "SELECT * FROM producten WHERE bron = ? AND code = ?", (bron, str(code).strip())
+        )
+    
+    def zoek_naam(self, bron, naam, exact=True, limiet=50):
+        """
+        Zoek producten op naam, ongeacht hoofdletters, accenten en extra spaties
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            naam (str): (Deel van de) productnaam
+            exact (bool): Alleen producten met precies deze naam, anders namen die ermee beginnen
+            limiet (int): Maximum aantal resultaten
+        
+        Returns:
+            list: Producten uit de catalogus als dictionaries
+        """
+        genormaliseerd = normaliseer_naam(naam)
+        if exact:
+            query, parameter = "naam_genormaliseerd = ?", genormaliseerd
+        else:
+            # Een prefix zoekopdracht kan de index op naam_genormaliseerd gebruiken
+            query, parameter = "naam_genormaliseerd >= ? AND naam_genormaliseerd < ?", genormaliseerd
+        parameters = (bron, parameter) if exact else (bron, parameter, parameter + '\uffff')
+        return self._alle(
+            f"SELECT * FROM producten WHERE bron = ? AND {query} ORDER BY positie LIMIT {int(limiet)}",
+            parameters
+        )
+    
+    def koppel(self, bron, product_ids):
+        """
+        Haal de catalogusgegevens van veel producten tegelijk op (bijvoorbeeld alle IDs uit een sheet)
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            product_ids (iterable): Product IDs
+        
+        Returns:
+            dict: product_id -> product (IDs die niet in de catalogus staan ontbreken)
+        """
+        ids = list({str(product_id).strip() for product_id in product_ids if product_id is not None})
+        gevonden = {}
+        for begin in range(0, len(ids), MAX_PARAMETERS):
+            deel = ids[begin:begin + MAX_PARAMETERS]
+            for product in self._alle(
+                f"SELECT * FROM producten WHERE bron = ? AND id IN ({','.join('?' * len(deel))})",
+                (bron, *deel)
+            ):
+                gevonden[product['id']] = product
+        return gevonden
+    
+    def opgeslagen_details(self, bron, product_ids):
+        """
+        Geef de opgeslagen detailgegevens van producten waarvan de details actueel zijn
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            product_ids (iterable): Product IDs
+        
+        Returns:
+            dict: product_id -> productgegevens zoals parse_product_details ze teruggaf; producten
+                waarvan de rij na het laatste ophalen veranderd is ontbreken
+        """
+        gevonden = {}
+        for product_id, product in self.koppel(bron, product_ids).items():
+            if product['details_op'] is None or not product['details']:
+                continue
+            try:
+                gevonden[product_id] = json.loads(product['details'])
+            except ValueError:
+                logger.logWaarschuwing(f"Opgeslagen details van product {product_id} zijn onleesbaar")
+        return gevonden
+    
+    def bestaande_ids(self, bron, product_ids):
+        """
+        Bepaal welke van de product IDs in de catalogus staan
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            product_ids (iterable): Product IDs
+        
+        Returns:
+            set: De IDs die bestaan
+        """
+        return set(self.koppel(bron, product_ids))
+    
+    def overzicht(self, bron, limiet=None):
+        """
+        Geef de producten in de volgorde van het RentPro productoverzicht
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            limiet (int, optional): Maximum aantal producten
+        
+        Returns:
+            list: Lijst van tuples (product_id, naam)
+        """
+        query = "SELECT id, naam FROM producten WHERE bron = ? ORDER BY positie"
+        if limiet:
+            query += f" LIMIT {int(limiet)}"
+        return [(product['id'], product['naam']) for product in self._alle(query, (bron,))]
+    
+    def aantal(self, bron):
+        """Aantal producten in de catalogus voor een RentPro omgeving"""
+        try:
+            with self._lock:
+                return self._db.execute("SELECT COUNT(*) FROM producten WHERE bron = ?", (bron,)).fetchone()[0]
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij lezen productcatalogus: {e}")
+            return 0
+    
+    def leeg(self, bron=None):
+        """Verwijder alle producten uit de catalogus (of alleen die van één RentPro omgeving)"""
+        try:
+            with self._lock:
+                if bron is None:
+                    self._db.execute("DELETE FROM producten")
+                else:
+                    self._db.execute("DELETE FROM producten WHERE bron = ?", (bron,))
+                self._db.commit()
+            logger.logInfo("Productcatalogus geleegd")
+        except Exception as e:
+            logger.logFout(f"Fout bij legen productcatalogus: {e}")
+    
+    def _een(self, query, parameters):
+        """Voer een query uit en geef de eerste rij als dictionary (of None)"""
+        resultaten = self._alle(query, parameters)
+        return resultaten[0] if resultaten else None
+    
+    def _alle(self, query, parameters):
+        """Voer een query uit en geef alle rijen als dictionaries"""
+        try:
+            with self._lock:
+                return [dict(rij) for rij in self._db.execute(query, parameters).fetchall()]
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij lezen productcatalogus: {e}")
+            return []
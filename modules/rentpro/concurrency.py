@@ -0,0 +1,174 @@
+"""
+Concurrency Controller voor RentPro integratie
+Verantwoordelijk voor het automatisch afstemmen van het aantal gelijktijdige verzoeken
+
+De controller werkt volgens AIMD (additive increase, multiplicative decrease):
+- Zolang de server gezond antwoordt gaat de limiet per ronde met één omhoog
+  (een ronde is voorbij als er evenveel verzoeken klaar zijn als de limiet).
+- Bij een 5xx/429 antwoord, een timeout of een sterk gestegen p95 latentie wordt
+  de limiet met een factor verlaagd. Per ronde wordt maar één keer verlaagd, zodat
+  een reeks fouten van verzoeken die al onderweg waren de limiet niet naar nul drukt.
+
+Zo draaien bulktaken op de hoogste doorvoer die de server op dat moment aankan.
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from modules.logger import logger
+
+class AIMDController:
+    """
+    Adaptieve limiet voor het aantal verzoeken dat tegelijk onderweg is
+    """
+    
+    def __init__(self, start=4, minimum=1, maximum=32, afname_factor=0.5,
+                 p95_factor=2.0, latentie_venster=50):
+        """
+        Initialiseer de controller
+        
+        Args:
+            start (int): Limiet waarmee gestart wordt
+            minimum (int): Laagste limiet
+            maximum (int): Hoogste limiet
+            afname_factor (float): Factor waarmee de limiet bij overbelasting wordt vermenigvuldigd
+            p95_factor (float): Verlaag als de p95 latentie dit veelvoud van de beste p95 overschrijdt
+            latentie_venster (int): Aantal recente verzoeken waarover de p95 wordt berekend
+        """
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limiet = min(max(int(start), self.minimum), self.maximum)
+        self.afname_factor = afname_factor
+        self.p95_factor = p95_factor
+        
+        self.onderweg = 0
+        self.latenties = deque(maxlen=max(10, int(latentie_venster)))
+        self.beste_p95 = None
+        # Laatste wijzigingen van de limiet: (tijd, oude limiet, nieuwe limiet, reden)
+        self.wijzigingen = deque(maxlen=100)
+        
+        self._ronde = 0
+        self._klaar_in_ronde = 0
+        self._gezond_in_ronde = True
+        self._conditie = None
+        self._loop = None
+    
+    def _haal_conditie(self):
+        """Geef de wachtconditie voor de huidige event loop (de GUI start per actie een nieuwe loop)"""
+        loop = asyncio.get_running_loop()
+        if self._conditie is None or self._loop is not loop:
+            self._conditie = asyncio.Condition()
+            self._loop = loop
+            self.onderweg = 0
+        return self._conditie
+    
+    @asynccontextmanager
+    async def plek(self):
+        """
+        Wacht op een vrije plek binnen de huidige limiet
+        
+        Yields:
+            int: Ronde waarin het verzoek gestart is (door te geven aan registreer)
+        """
+        conditie = self._haal_conditie()
+        async with conditie:
+            await conditie.wait_for(lambda: self.onderweg < self.limiet)
+            self.onderweg += 1
+        try:
+            yield self._ronde
+        finally:
+            async with conditie:
+                self.onderweg -= 1
+                conditie.notify_all()
+    
+    def registreer(self, ronde, duur, status=None, fout=None):
+        """
+        Verwerk de uitkomst van een verzoek en pas de limiet zo nodig aan
+        
+        Args:
+            ronde (int): Ronde waarin het verzoek gestart is
+            duur (float): Duur van het verzoek in seconden
+            status (int, optional): HTTP statuscode
+            fout (Exception, optional): Fout als het verzoek mislukte
+        """
+        if isinstance(fout, asyncio.TimeoutError):
+            self._verlaag(ronde, "timeout")
+            return
+        if fout is not None:
+            self._verlaag(ronde, f"verbindingsfout ({type(fout).__name__})")
+            return
+        if status is not None and (status >= 500 or status == 429):
+            self._verlaag(ronde, f"HTTP {status}")
+            return
+        
+        self.latenties.append(duur)
+        p95 = self._p95()
+        if p95 is not None:
+            if self.beste_p95 is None or p95 < self.beste_p95:
+                self.beste_p95 = p95
+            else:
+                # Laat de referentie langzaam meegroeien, zodat een blijvend tragere server
+                # (bijvoorbeeld tijdens kantooruren) de limiet niet voorgoed op het minimum houdt
+                self.beste_p95 *= 1.005
+            if p95 > self.beste_p95 * self.p95_factor:
+                self._verlaag(ronde, f"p95 latentie gestegen ({p95 * 1000:.0f} ms, beste {self.beste_p95 * 1000:.0f} ms)")
+                return
+        
+        # Alleen gezonde antwoorden (geen 4xx) tellen mee voor een verhoging
+        if status is not None and status >= 400:
+            self._gezond_in_ronde = False
+        
+        self._klaar_in_ronde += 1
+        if self._klaar_in_ronde >= self.limiet:
+            if self._gezond_in_ronde and self.limiet < self.maximum:
+                self._wijzig(self.limiet + 1, "gezonde ronde")
+            self._nieuwe_ronde()
+    
+    def _p95(self):
+        """Bereken de p95 latentie over het venster (None zolang het venster niet vol is)"""
+        if len(self.latenties) < self.latenties.maxlen:
+            return None
+        gesorteerd = sorted(self.latenties)
+        return gesorteerd[int(len(gesorteerd) * 0.95) - 1]
+    
+    def _verlaag(self, ronde, reden):
+        """Verlaag de limiet multiplicatief, maar maximaal één keer per ronde"""
+        if ronde != self._ronde:
+            # Verzoek was al onderweg voor de vorige verlaging
+            return
+        nieuwe_limiet = max(self.minimum, int(self.limiet * self.afname_factor))
+        self._wijzig(nieuwe_limiet, reden)
+        self._nieuwe_ronde()
+        # Latenties van voor de verlaging zeggen niets meer over de nieuwe situatie
+        self.latenties.clear()
+    
+    def _nieuwe_ronde(self):
+        """Start een nieuwe meetronde"""
+        self._ronde += 1
+        self._klaar_in_ronde = 0
+        self._gezond_in_ronde = True
+    
+    def _wijzig(self, nieuwe_limiet, reden):
+        """Stel een nieuwe limiet in, houd de reden bij en laat wachtende verzoeken door"""
+        oude_limiet = self.limiet
+        self.limiet = nieuwe_limiet
+        if nieuwe_limiet == oude_limiet:
+            return
+        
+        # Wachtende verzoeken worden gewekt zodra het huidige verzoek zijn plek vrijgeeft
+        self.wijzigingen.append((datetime.now().strftime("%H:%M:%S"), oude_limiet, nieuwe_limiet, reden))
+        logger.logInfo(f"Gelijktijdige verzoeken {oude_limiet} -> {nieuwe_limiet}: {reden}")
+    
+    def status(self):
+        """
+        Geef de huidige toestand van de controller
+        
+        Returns:
+            dict: 'limiet', 'onderweg', 'p95' (seconden of None) en 'wijzigingen' (laatste 10)
+        """
+        return {
+            'limiet': self.limiet,
+            'onderweg': self.onderweg,
+            'p95': self._p95(),
+            'wijzigingen': list(self.wijzigingen)[-10:]
+        }
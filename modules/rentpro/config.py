@@ -0,0 +1,215 @@
+"""
+Configuratie voor RentPro integratie
+Verantwoordelijk voor het inlezen van de API-instellingen en inloggegevens uit config/rentpro.ini
+
+Naast de standaard omgeving in [RentPro] kan het config bestand extra RentPro
+omgevingen (tenants) bevatten in secties als [Tenant merk2], met eigen url en
+inloggegevens. Opties uit [Api] kunnen per tenant overschreven worden in dezelfde
+sectie; paden (cache, sessie, catalogus, ...) krijgen per tenant een eigen submap,
+zodat omgevingen elkaars cache en sessies niet delen.
+"""
+import os
+import re
+import configparser
+from modules.logger import logger
+
+CONFIG_BESTAND = 'config/rentpro.ini'
+
+# RentPro omgeving als de [RentPro] sectie geen url bevat
+STANDAARD_URL = 'http://metroeventsdc.rentpro5.nl'
+
+# Sectienaam van een extra RentPro omgeving: [Tenant <naam>]
+TENANT_PREFIX = 'Tenant '
+
+# Een tenantnaam wordt ook een mapnaam (cache/<naam>/...), dus alleen letters, cijfers, _ en -
+TENANT_NAAM_PATTERN = re.compile(r'^[\w-]+$')
+
+# Naam waarmee de standaard omgeving ([RentPro]) in lijsten en meldingen wordt aangeduid
+STANDAARD_TENANT = 'standaard'
+
+def is_geldige_tenant(naam):
+    """Controleer of een tenantnaam als mapnaam gebruikt kan worden (en niet de standaard omgeving is)"""
+    return bool(naam) and naam != STANDAARD_TENANT and bool(TENANT_NAAM_PATTERN.match(naam))
+
+# Standaardwaarden voor de API-mode, gebruikt als een optie ontbreekt
+STANDAARD_API_INSTELLINGEN = {
+    'max_gelijktijdige_verzoeken': 8,
+    'max_verbindingen': 100,
+    'max_verbindingen_per_host': 16,
+    'keepalive_timeout': 30,
+    'dns_cache_ttl': 300,
+    'timeout': 30,
+    'compressie': True,
+    'http2': False,
+    'cache_ingeschakeld': True,
+    'cache_pad': 'cache/rentpro_http.sqlite',
+    'cache_ttl': 3600,
+    'cache_max_mb': 200,
+    'catalogus_ingeschakeld': True,
+    'catalogus_pad': 'cache/rentpro_catalogus.sqlite',
+    'delta_sync': True,
+    'snapshot_pad': 'cache/rentpro_snapshot.sqlite',
+    'bij_conflict': 'melden',
+    'afbeeldingen_downloaden': True,
+    'afbeeldingen_pad': 'cache/afbeeldingen',
+    'sessie_opslaan': True,
+    'sessie_pad': 'cache/rentpro_sessie.json',
+    'sessie_max_leeftijd': 43200,
+    'debug_capture': False,
+    'debug_capture_grootte': 50,
+    'debug_capture_pad': 'logs/rentpro_debug',
+    'aimd_ingeschakeld': True,
+    'aimd_start': 4,
+    'aimd_minimum': 1,
+    'aimd_maximum': 16,
+    'aimd_p95_factor': 2.0,
+    'retry_timeout': 3,
+    'retry_verbinding': 3,
+    'retry_server': 4,
+    'retry_te_veel_verzoeken': 5,
+    'retry_sessie': 2,
+    'retry_basis_vertraging': 0.5,
+    'retry_max_vertraging': 30.0,
+    'parse_werkers': 2,
+    'parse_processen': 0,
+    'pipeline_wachtrij': 32,
+}
+
+def _tenant_sectie(tenant):
+    """Sectie met url en inloggegevens van een tenant (None is de standaard omgeving)"""
+    return 'RentPro' if tenant is None else f"{TENANT_PREFIX}{tenant}"
+
+def _lees_opties(config, sectie, instellingen):
+    """Neem de API opties over die in een sectie staan, met het type van de standaardwaarde"""
+    for optie, standaard in STANDAARD_API_INSTELLINGEN.items():
+        if not config.has_option(sectie, optie):
+            continue
+        if isinstance(standaard, bool):
+            instellingen[optie] = config.getboolean(sectie, optie)
+        elif isinstance(standaard, int):
+            instellingen[optie] = config.getint(sectie, optie)
+        elif isinstance(standaard, float):
+            instellingen[optie] = config.getfloat(sectie, optie)
+        else:
+            instellingen[optie] = config.get(sectie, optie)
+
+def laad_api_instellingen(config_bestand=CONFIG_BESTAND, tenant=None):
+    """
+    Laad de instellingen voor de API-mode uit het config bestand
+    
+    Args:
+        config_bestand (str): Pad naar het config bestand
+        tenant (str, optional): Naam van een extra RentPro omgeving ([Tenant <naam>]);
+            opties uit die sectie gaan voor [Api] en paden krijgen een eigen submap
+    
+    Returns:
+        dict: Dictionary met API instellingen (ontbrekende opties krijgen de standaardwaarde)
+    
+    Raises:
+        ValueError: Als de tenantnaam niet als mapnaam gebruikt kan worden (zie is_geldige_tenant)
+    """
+    # Een ongeldige naam mag niet stilzwijgend op de paden van de standaard omgeving uitkomen
+    if tenant is not None and not is_geldige_tenant(tenant):
+        raise ValueError(f"Ongeldige tenantnaam '{tenant}'")
+    
+    instellingen = dict(STANDAARD_API_INSTELLINGEN)
+    try:
+        config = configparser.ConfigParser()
+        config.read(config_bestand, encoding='utf-8')
+        
+        if config.has_section('Api'):
+            _lees_opties(config, 'Api', instellingen)
+        
+        if tenant is not None:
+            sectie = _tenant_sectie(tenant)
+            # Eigen cache, sessie en opslag per tenant, tenzij de tenant zelf een pad opgeeft
+            for optie in STANDAARD_API_INSTELLINGEN:
+                if optie.endswith('_pad') and not config.has_option(sectie, optie):
+                    map_pad, naam = os.path.split(instellingen[optie])
+                    instellingen[optie] = os.path.join(map_pad, tenant, naam)
+            if config.has_section(sectie):
+                _lees_opties(config, sectie, instellingen)
+        
+        return instellingen
+    except Exception as e:
+        logger.logFout(f"Fout bij laden API instellingen: {e}")
+        return instellingen
+
+def laad_inloggegevens(config_bestand=CONFIG_BESTAND, tenant=None):
+    """
+    Laad de RentPro inloggegevens uit het config bestand
+    
+    Args:
+        config_bestand (str): Pad naar het config bestand
+        tenant (str, optional): Naam van een extra RentPro omgeving, None voor [RentPro]
+    
+    Returns:
+        dict: {'gebruikersnaam', 'wachtwoord', 'url'} of None als de gegevens ontbreken
+    """
+    try:
+        config = configparser.ConfigParser()
+        config.read(config_bestand, encoding='utf-8')
+        
+        sectie = _tenant_sectie(tenant)
+        return {
+            'gebruikersnaam': config.get(sectie, 'gebruikersnaam'),
+            'wachtwoord': config.get(sectie, 'wachtwoord'),
+            # Een extra omgeving heeft altijd een eigen url, anders zou hij de standaard omgeving raken
+            'url': config.get(sectie, 'url') if tenant is not None else config.get(sectie, 'url', fallback=None)
+        }
+    except Exception as e:
+        logger.logFout(f"Fout bij laden RentPro inloggegevens: {e}")
+        return None
+
+def laad_url(config_bestand=CONFIG_BESTAND, tenant=None):
+    """
+    Bepaal de base URL van een RentPro omgeving zonder de inloggegevens te lezen
+    
+    Args:
+        config_bestand (str): Pad naar het config bestand
+        tenant (str, optional): Naam van een extra RentPro omgeving, None voor [RentPro]
+    
+    Returns:
+        str: URL uit het config bestand, STANDAARD_URL voor de standaard omgeving zonder url,
+            of None als een tenant geen url heeft
+    """
+    try:
+        config = configparser.ConfigParser()
+        config.read(config_bestand, encoding='utf-8')
+        url = config.get(_tenant_sectie(tenant), 'url', fallback=None)
+    except Exception as e:
+        logger.logWaarschuwing(f"Fout bij lezen RentPro url: {e}")
+        url = None
+    if url:
+        return url
+    return STANDAARD_URL if tenant is None else None
+
+def laad_tenants(config_bestand=CONFIG_BESTAND):
+    """
+    Geef de namen van de extra RentPro omgevingen in het config bestand
+    
+    Args:
+        config_bestand (str): Pad naar het config bestand
+    
+    Returns:
+        list: Tenantnamen in de volgorde van het config bestand (ongeldige namen worden overgeslagen)
+    """
+    try:
+        config = configparser.ConfigParser()
+        config.read(config_bestand, encoding='utf-8')
+        tenants = []
+        for sectie in config.sections():
+            if not sectie.startswith(TENANT_PREFIX):
+                continue
+            naam = sectie[len(TENANT_PREFIX):]
+            if not is_geldige_tenant(naam):
+                logger.logWaarschuwing(
+                    f"Sectie [{sectie}] overgeslagen: een tenantnaam bestaat alleen uit letters, cijfers, _ en - "
+                    f"en mag niet '{STANDAARD_TENANT}' zijn"
+                )
+                continue
+            tenants.append(naam)
+        return tenants
+    except Exception as e:
+        logger.logFout(f"Fout bij lezen RentPro tenants: {e}")
+        return []
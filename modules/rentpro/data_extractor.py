@@ -28,7 +28,11 @@ class DataExtractor:
         """
         self.driver_manager = driver_manager
         self.navigator = navigator
-        self.base_url = "http://metroeventsdc.rentpro5.nl"
+    
+    @property
+    def base_url(self):
+        """Base URL van de omgeving waarin de navigator werkt"""
+        return self.navigator.base_url
     
     async def get_products_list(self):
         """
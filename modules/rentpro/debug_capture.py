@@ -0,0 +1,122 @@
+"""
+Debug Capture voor RentPro integratie
+Verantwoordelijk voor het bewaren van de laatste HTTP verzoeken voor foutanalyse
+
+De capture houdt de laatste N verzoek/antwoord paren in een ringbuffer in het
+geheugen bij. Er wordt pas naar schijf geschreven als er iets misgaat: dan wordt
+de inhoud van de buffer gecomprimeerd (gzip) in de logs map gezet. De capture
+staat standaard uit; zonder capture wordt er niets bewaard of geschreven.
+"""
+import os
+import gzip
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from modules.logger import logger
+
+# Formuliervelden en headers die nooit in een dump terecht mogen komen
+GEVOELIGE_SLEUTELS = ('password', 'wachtwoord', 'cookie', 'authorization')
+
+def _maskeer(gegevens):
+    """Vervang waarden van gevoelige velden door sterretjes"""
+    if not gegevens:
+        return {}
+    return {
+        sleutel: '***' if any(deel in str(sleutel).lower() for deel in GEVOELIGE_SLEUTELS) else str(waarde)
+        for sleutel, waarde in dict(gegevens).items()
+    }
+
+class DebugCapture:
+    """
+    Begrensde ringbuffer met recente HTTP verzoeken en antwoorden
+    """
+    
+    def __init__(self, max_items=50, max_body_kb=256, map_pad='logs/rentpro_debug', min_interval=30):
+        """
+        Initialiseer de debug capture
+        
+        Args:
+            max_items (int): Aantal verzoek/antwoord paren dat bewaard wordt
+            max_body_kb (int): Maximale grootte van een bewaarde body in KB (de rest wordt afgekapt)
+            map_pad (str): Map waarin dumps bij een fout worden geschreven
+            min_interval (float): Minimum aantal seconden tussen twee dumps
+        """
+        self.buffer = deque(maxlen=max(1, int(max_items)))
+        self.max_body = int(max_body_kb * 1024)
+        self.map_pad = map_pad
+        self.min_interval = min_interval
+        self._laatste_dump = 0.0
+        self._lock = threading.Lock()
+    
+    def registreer(self, methode, url, status=None, data=None, request_headers=None,
+                   response_headers=None, body=None, duur=None, fout=None):
+        """
+        Voeg een verzoek/antwoord paar toe aan de buffer (het oudste vervalt)
+        
+        Args:
+            methode (str): HTTP methode
+            url (str): URL van het verzoek (of de uiteindelijke URL na redirects)
+            status (int, optional): HTTP statuscode
+            data (dict, optional): Verstuurde formulierdata (gevoelige velden worden gemaskeerd)
+            request_headers (dict, optional): Extra headers van het verzoek
+            response_headers (dict, optional): Headers van het antwoord
+            body (str, optional): Body van het antwoord
+            duur (float, optional): Duur van het verzoek in seconden
+            fout (str, optional): Foutmelding als het verzoek mislukte
+        """
+        if body is not None and len(body) > self.max_body:
+            body = body[:self.max_body] + f"\n<!-- afgekapt, {len(body)} tekens totaal -->"
+        
+        self.buffer.append({
+            'tijd': datetime.now().isoformat(timespec='milliseconds'),
+            'methode': methode,
+            'url': url,
+            'status': status,
+            'data': _maskeer(data),
+            'request_headers': _maskeer(request_headers),
+            'response_headers': _maskeer(response_headers),
+            'duur': round(duur, 4) if duur is not None else None,
+            'fout': fout,
+            'body': body
+        })
+    
+    def dump(self, reden):
+        """
+        Schrijf de huidige buffer gecomprimeerd naar schijf
+        Het schrijven gebeurt in een achtergrondthread, zodat de event loop niet blokkeert.
+        Dumps kort na elkaar (bijvoorbeeld bij een reeks fouten in een batch) worden overgeslagen.
+        
+        Args:
+            reden (str): Korte omschrijving van de fout die de dump veroorzaakt
+        
+        Returns:
+            str: Pad van het dumpbestand of None als er niets geschreven wordt
+        """
+        with self._lock:
+            nu = time.monotonic()
+            if not self.buffer or (self._laatste_dump and nu - self._laatste_dump < self.min_interval):
+                return None
+            self._laatste_dump = nu
+            inhoud = {'reden': reden, 'verzoeken': list(self.buffer)}
+        
+        bestandsnaam = f"rentpro_debug_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S_%f')}.json.gz"
+        pad = os.path.join(self.map_pad, bestandsnaam)
+        
+        def _schrijf():
+            try:
+                if not os.path.exists(self.map_pad):
+                    os.makedirs(self.map_pad, exist_ok=True)
+                with gzip.open(pad, 'wt', encoding='utf-8') as f:
+                    json.dump(inhoud, f, ensure_ascii=False)
+                logger.logInfo(f"Debug capture opgeslagen in {pad} ({reden})")
+            except Exception as e:
+                logger.logWaarschuwing(f"Fout bij opslaan debug capture: {e}")
+        
+        threading.Thread(target=_schrijf, daemon=True).start()
+        return pad
+    
+    def leeg(self):
+        """Verwijder alle bewaarde verzoeken"""
+        self.buffer.clear()
@@ -2,9 +2,16 @@
 Excel Manager voor RentPro integratie
 Verantwoordelijk voor het beheren van Excel interacties
 """
+import re
 from modules.logger import logger
 from modules.excel_handler import excelHandler
 
+# Een veld-ID uit de tweede kopregel (bijvoorbeeld Product_Name of Property_15_Value)
+VELD_ID_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_.]*$')
+
+# Kolom met het lokale pad van de gedownloade productafbeelding
+AFBEELDING_PAD_KOLOM = 'Afbeelding lokaal'
+
 class ExcelManager:
     """
     Beheert alle Excel-gerelateerde functies voor RentPro integratie
@@ -70,6 +77,58 @@ class ExcelManager:
             logger.logWaarschuwing(f"Kon product ID niet lezen van rij {row_index}: {e}")
             return None
     
+    def get_field_mapping(self):
+        """
+        Lees de koppeling tussen kolommen en RentPro veld-ID's
+        Een sheet volgens Import_template.csv heeft twee kopregels: de kolomnamen en
+        daaronder de veld-ID's. Die tweede regel is in de dataframe rij 0, de data begint
+        dan bij rij 1. Zonder ID regel worden kolomnamen die zelf een veld-ID zijn gebruikt.
+        
+        Returns:
+            tuple: (dict kolomnaam -> veld_id, index van de eerste datarij) of (None, 0) bij fout
+        """
+        try:
+            if not excelHandler.isBestandGeopend():
+                return None, 0
+            
+            id_rij = {}
+            for kolom_index, kolom in enumerate(excelHandler.kolomNamen):
+                waarde = excelHandler.getCellValue(0, kolom_index)
+                if waarde is not None and str(waarde).strip():
+                    id_rij[kolom] = str(waarde).strip()
+            
+            if id_rij and all(VELD_ID_PATTERN.match(veld_id) for veld_id in id_rij.values()):
+                return id_rij, 1
+            
+            mapping = {kolom: kolom for kolom in excelHandler.kolomNamen if VELD_ID_PATTERN.match(str(kolom))}
+            return mapping, 0
+        except Exception as e:
+            logger.logFout(f"Fout bij lezen veldmapping: {e}")
+            return None, 0
+    
+    def get_field_values(self, row_index, mapping, met_lege=False):
+        """
+        Haal de gevulde velden van een rij op volgens een veldmapping
+        
+        Args:
+            row_index (int): Index van de rij (0-based)
+            mapping (dict): Kolomnaam -> veld_id (zie get_field_mapping)
+            met_lege (bool): Lege cellen meegeven als "" (bij synchroniseren is leegmaken ook een wijziging)
+        
+        Returns:
+            dict: veld_id -> celwaarde, lege cellen worden overgeslagen tenzij met_lege
+        """
+        velden = {}
+        for kolom_index, kolom in enumerate(excelHandler.kolomNamen):
+            if kolom not in mapping:
+                continue
+            waarde = excelHandler.getCellValue(row_index, kolom_index)
+            if waarde is not None and str(waarde).strip() != "":
+                velden[mapping[kolom]] = waarde
+            elif met_lege:
+                velden.setdefault(mapping[kolom], "")
+        return velden
+    
     def update_product_row(self, row_index, product_data, overschrijf_lokaal=False):
         """
         Update een rij met productgegevens
@@ -133,3 +192,55 @@ class ExcelManager:
         except Exception as e:
             logger.logFout(f"Fout bij updaten rij {row_index}: {e}")
             return False
+    
+    def update_image_path(self, row_index, pad):
+        """
+        Schrijf het lokale pad van de productafbeelding in een rij
+        De kolom wordt achteraan toegevoegd als hij nog niet bestaat, zodat de vaste
+        kolommen (ID t/m Laatst bijgewerkt) op hun plek blijven.
+        
+        Args:
+            row_index (int): Index van de rij (0-based)
+            pad (str): Pad naar de lokaal opgeslagen afbeelding
+        
+        Returns:
+            bool: True als de cel is bijgewerkt, anders False
+        """
+        try:
+            if not excelHandler.isBestandGeopend():
+                return False
+            
+            if AFBEELDING_PAD_KOLOM not in excelHandler.kolomNamen:
+                excelHandler.huidigDataFrame[AFBEELDING_PAD_KOLOM] = None
+                excelHandler.kolomNamen.append(AFBEELDING_PAD_KOLOM)
+            
+            kolom_index = excelHandler.kolomNamen.index(AFBEELDING_PAD_KOLOM)
+            return excelHandler.setCellValue(row_index, kolom_index, pad)
+        except Exception as e:
+            logger.logFout(f"Fout bij schrijven afbeeldingspad in rij {row_index}: {e}")
+            return False
+    
+    def update_field_value(self, row_index, mapping, veld_id, waarde):
+        """
+        Schrijf een waarde uit RentPro in de kolom(men) die aan een veld-ID gekoppeld zijn
+        
+        Args:
+            row_index (int): Index van de rij (0-based)
+            mapping (dict): Kolomnaam -> veld_id (zie get_field_mapping)
+            veld_id (str): RentPro veld-ID
+            waarde: Waarde uit RentPro
+        
+        Returns:
+            bool: True als de cel(len) zijn bijgewerkt, anders False
+        """
+        try:
+            kolommen = [kolom for kolom, veld in mapping.items() if veld == veld_id]
+            if not kolommen:
+                return False
+            return all(
+                excelHandler.setCellValue(row_index, excelHandler.kolomNamen.index(kolom), waarde)
+                for kolom in kolommen
+            )
+        except Exception as e:
+            logger.logFout(f"Fout bij schrijven veld {veld_id} in rij {row_index}: {e}")
+            return False
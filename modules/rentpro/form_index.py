@@ -0,0 +1,171 @@
+"""
+Form Index voor RentPro integratie
+Verantwoordelijk voor het in één keer indexeren van alle velden op een productpagina
+
+In plaats van per veld opnieuw door de pagina te zoeken wordt de pagina één keer
+doorlopen. Daarbij worden inputs, textareas, selects, labels en tabellen met twee
+kolommen verzameld in een index op id/naam en een index op labeltekst. Elk veld
+opvragen is daarna een opzoeking in een dictionary.
+
+Tegelijk wordt de inhoud bijgehouden zoals de browser het formulier zou
+versturen (naam/waarde paren), zodat het formulier zonder browser terug
+gepost kan worden.
+"""
+
+# Input types die geen veldwaarde bevatten
+KNOP_TYPES = {'submit', 'button', 'image', 'reset'}
+
+class FormIndex:
+    """
+    Index van alle formuliervelden op een (deel van een) pagina
+    """
+    
+    def __init__(self, soup):
+        """
+        Bouw de index op in één doorloop van de pagina
+        
+        Args:
+            soup (BeautifulSoup): De geparste pagina of het productformulier
+        """
+        # id/naam -> waarde
+        self.velden = {}
+        # labeltekst (kleine letters) -> waarde
+        self.labels = {}
+        # Te versturen formulierinhoud als (naam, waarde) paren, in documentvolgorde
+        self.formulier = []
+        # id -> name attribuut en name -> type, om velden uit de Excel mapping te kunnen posten
+        self.namen = {}
+        self.types = {}
+        # Extra gegevens voor het invullen: value van checkboxes en (value, tekst) opties van selects
+        self.checkboxes = {}
+        self.opties = {}
+        # action attribuut van het (eerste) formulier
+        self.actie = None
+        
+        labels_met_for = []
+        
+        for elem in soup.find_all(['form', 'input', 'textarea', 'select', 'label', 'tr']):
+            naam = elem.name
+            if naam == 'form':
+                if self.actie is None:
+                    self.actie = elem.get('action')
+            elif naam == 'input':
+                self._indexeer_input(elem)
+            elif naam == 'textarea':
+                # Browsers verwijderen alleen de eerste regeleinde van een textarea
+                tekst = elem.get_text()
+                self._voeg_veld_toe(elem, tekst.strip())
+                self._voeg_formulierveld_toe(elem, 'textarea', tekst[1:] if tekst.startswith('\n') else tekst)
+            elif naam == 'select':
+                self._voeg_veld_toe(elem, self._geselecteerde_optie(elem))
+                opties = elem.find_all('option')
+                if elem.get('name'):
+                    self.opties[elem['name']] = [
+                        (o.get('value', o.get_text(strip=True)), o.get_text(strip=True)) for o in opties
+                    ]
+                optie = elem.find('option', selected=True) or (opties[0] if opties else None)
+                if optie is not None:
+                    self._voeg_formulierveld_toe(elem, 'select', optie.get('value', optie.get_text(strip=True)))
+            elif naam == 'label':
+                tekst = elem.get_text(strip=True).rstrip(':').strip().lower()
+                if not tekst:
+                    continue
+                if elem.get('for'):
+                    # Koppel na de doorloop, het veld kan na het label staan
+                    labels_met_for.append((tekst, elem['for']))
+                else:
+                    waarde_elem = elem.find_next(['div', 'span', 'p'])
+                    if waarde_elem:
+                        self.labels.setdefault(tekst, waarde_elem.get_text(strip=True))
+            else:
+                # Tabelrij met twee kolommen: eerste cel is het label, tweede de waarde
+                cellen = elem.find_all(['td', 'th'], recursive=False)
+                if len(cellen) >= 2:
+                    tekst = cellen[0].get_text(strip=True).rstrip(':').strip().lower()
+                    if tekst:
+                        self.labels.setdefault(tekst, cellen[1].get_text(strip=True))
+        
+        for tekst, veld_id in labels_met_for:
+            if veld_id in self.velden:
+                self.labels[tekst] = self.velden[veld_id]
+    
+    def _voeg_veld_toe(self, elem, waarde):
+        """Registreer een veld onder zijn id en naam (de eerste waarde wint)"""
+        for sleutel in (elem.get('id'), elem.get('name')):
+            if sleutel:
+                self.velden.setdefault(sleutel, waarde)
+    
+    def _voeg_formulierveld_toe(self, elem, veld_type, waarde):
+        """Registreer een veld zoals het bij het versturen van het formulier meegaat"""
+        naam = elem.get('name')
+        if not naam or elem.has_attr('disabled'):
+            return
+        if elem.get('id'):
+            self.namen.setdefault(elem['id'], naam)
+        # Bij een checkbox met hidden input (ASP.NET) is het type van de checkbox leidend
+        if self.types.get(naam) != 'checkbox':
+            self.types[naam] = veld_type
+        if waarde is not None:
+            self.formulier.append((naam, waarde))
+    
+    def _indexeer_input(self, elem):
+        """Registreer een input veld met de waarde die bij het type hoort"""
+        input_type = (elem.get('type') or 'text').lower()
+        if input_type in KNOP_TYPES:
+            return
+        
+        if input_type in ('checkbox', 'radio'):
+            # Alleen aangevinkte checkboxes en radio buttons worden verstuurd
+            verstuurd = elem.get('value', 'on') if elem.has_attr('checked') else None
+            if input_type == 'checkbox' and elem.get('name'):
+                self.checkboxes[elem['name']] = elem.get('value', 'on')
+            self._voeg_formulierveld_toe(elem, input_type, verstuurd)
+        elif input_type != 'file':
+            self._voeg_formulierveld_toe(elem, input_type, elem.get('value', ''))
+        
+        if input_type in ('checkbox', 'radio'):
+            if input_type == 'checkbox':
+                waarde = 'true' if elem.has_attr('checked') else 'false'
+            elif elem.has_attr('checked'):
+                waarde = elem.get('value', 'on')
+            else:
+                # Alleen de gekozen radio button telt
+                return
+            # ASP.NET zet een hidden input met dezelfde naam achter een checkbox; die mag niet winnen
+            for sleutel in (elem.get('id'), elem.get('name')):
+                if sleutel:
+                    self.velden[sleutel] = waarde
+            return
+        
+        self._voeg_veld_toe(elem, elem.get('value', ''))
+    
+    @staticmethod
+    def _geselecteerde_optie(select):
+        """Geef de tekst van de geselecteerde optie van een select"""
+        optie = select.find('option', selected=True)
+        return optie.get_text(strip=True) if optie else ""
+    
+    def waarde(self, veld_id=None, label=None):
+        """
+        Zoek de waarde van een veld op id/naam en anders op labeltekst
+        
+        Args:
+            veld_id (str, optional): id of name attribuut van het veld
+            label (str, optional): (Deel van de) labeltekst, hoofdletterongevoelig
+        
+        Returns:
+            str: De waarde of een lege string als het veld niet gevonden is
+        """
+        if veld_id and self.velden.get(veld_id):
+            return self.velden[veld_id]
+        
+        if label:
+            label = label.lower()
+            if self.labels.get(label):
+                return self.labels[label]
+            # Labels bevatten soms extra tekst ("Prijs (excl. BTW)")
+            for tekst, waarde in self.labels.items():
+                if label in tekst and waarde:
+                    return waarde
+        
+        return ""
@@ -7,6 +7,8 @@ BELANGRIJK: Dit is de definitieve implementatie die direct geïmporteerd wordt d
 modules/rentpro_handler.py voor backwards compatibiliteit.
 """
 import asyncio
+import threading
+from functools import partial
 from modules.logger import logger
 from modules.rentpro.driver_manager import DriverManager
 from modules.rentpro.authenticator import Authenticator
@@ -14,6 +16,15 @@ from modules.rentpro.navigator import Navigator
 from modules.rentpro.data_extractor import DataExtractor
 from modules.rentpro.excel_manager import ExcelManager
 from modules.rentpro.api_handler import ApiHandler
+from modules.rentpro.pipeline import SyncPipeline
+from modules.rentpro.product_parser import parse_product_details
+from modules.rentpro.upload_engine import UploadEngine
+from modules.rentpro.catalog import ProductCatalog
+from modules.rentpro.image_store import ImageStore
+from modules.rentpro.snapshot_store import SnapshotStore
+from modules.rentpro.merge_sync import bepaal_actie, GELIJK, OPHALEN, VERSTUREN
+from modules.rentpro.upload_engine import formatteer_waarde
+from modules.rentpro.config import laad_api_instellingen, laad_url
 
 class RentproHandler:
     """
@@ -24,8 +35,16 @@ class RentproHandler:
     voor naadloze integratie met bestaande code.
     """
     
-    def __init__(self):
-        """Initialiseer de RentPro handler met alle componenten"""
+    def __init__(self, tenant=None):
+        """
+        Initialiseer de RentPro handler met alle componenten
+        
+        Args:
+            tenant (str, optional): Naam van de RentPro omgeving in config/rentpro.ini ([Tenant <naam>]),
+                None voor de standaard omgeving. Elke omgeving heeft een eigen sessie, limieten en cache.
+        """
+        self.tenant = tenant
+        
         # Flags voor status en configuratie
         self.ingelogd = False
         self.gebruik_mockdata = False
@@ -33,14 +52,42 @@ class RentproHandler:
         
         # Initialiseer browser componenten
         self.driver_manager = DriverManager()
-        self.authenticator = Authenticator(self.driver_manager)
+        self.authenticator = Authenticator(self.driver_manager, laad_url(tenant=tenant))
         self.navigator = Navigator(self.driver_manager, self.authenticator)
         self.data_extractor = DataExtractor(self.driver_manager, self.navigator)
         self.excel_manager = ExcelManager()
         
         # Initialiseer API componenten
-        self.api_handler = ApiHandler()
+        self.api_handler = ApiHandler(tenant)
+        self.api_instellingen = laad_api_instellingen(tenant=tenant)
+        self.max_gelijktijdige_verzoeken = self.api_instellingen['max_gelijktijdige_verzoeken']
+        if self.api_handler.concurrency is not None:
+            # De AIMD controller in de HTTP laag bepaalt de echte limiet, de engine mag tot het maximum
+            self.max_gelijktijdige_verzoeken = self.api_handler.concurrency.maximum
         
+        # Lokale productcatalogus, voor opzoeken en het productoverzicht zonder server
+        self.catalogus = None
+        if self.api_instellingen['catalogus_ingeschakeld']:
+            try:
+                self.catalogus = ProductCatalog(self.api_instellingen['catalogus_pad'])
+            except Exception as e:
+                logger.logWaarschuwing(f"Productcatalogus niet beschikbaar: {e}")
+        
+        # Lokale opslag van productafbeeldingen (content-addressed, zie image_store.py)
+        self.afbeeldingen = None
+        if self.api_instellingen['afbeeldingen_downloaden']:
+            try:
+                self.afbeeldingen = ImageStore(self.api_instellingen['afbeeldingen_pad'])
+            except Exception as e:
+                logger.logWaarschuwing(f"Afbeeldingenopslag niet beschikbaar: {e}")
+        
+        # Laatst gesynchroniseerde stand per product en veld, de basis voor synchroniseer_producten
+        self.snapshots = None
+        try:
+            self.snapshots = SnapshotStore(self.api_instellingen['snapshot_pad'])
+        except Exception as e:
+            logger.logWaarschuwing(f"Sync snapshots niet beschikbaar: {e}")
+    
     async def initialize(self):
         """
         Initialiseer de RentPro handler en alle componenten
@@ -74,7 +121,8 @@ class RentproHandler:
             # Als we in API-mode zijn, hoeft de browser niet gesloten te worden
             if self.gebruik_api_mode:
                 logger.logInfo("API mode actief, geen browser om te sluiten")
-                return True
+                # Sluit wel de open HTTP verbindingen van deze event loop
+                return await self.api_handler.close()
                 
             # Alleen in browser-mode: sluit de WebDriver
             logger.logInfo("Browser mode actief, WebDriver sluiten")
@@ -162,14 +210,18 @@ class RentproHandler:
             self.ingelogd = True  # Simuleer login voor UI compatibiliteit
             return True  # Geef True terug voor graceful degradation
 
-    async def haal_producten_op(self, overschrijf_lokaal=False, rijen=None):
+    async def haal_producten_op(self, overschrijf_lokaal=False, rijen=None, volledig=False):
         """
         Haal producten op van RentPro en update Excel
         Gebruikt verschillende methoden afhankelijk van mode (API/browser)
+        In API-mode met delta sync worden alleen de detailpagina's opgehaald van producten
+        die nieuw zijn of waarvan de rij in het productoverzicht veranderd is; de rest
+        komt uit de lokale productcatalogus.
         
         Args:
             overschrijf_lokaal (bool): Of lokale data overschreven moet worden
             rijen (tuple): Optioneel, tuple met (startRij, eindRij)
+            volledig (bool): Haal de details van alle producten opnieuw op (geen delta sync)
             
         Returns:
             bool: True als ophalen succesvol was, anders False
@@ -212,7 +264,99 @@ class RentproHandler:
                 # Haal productlijst op via WebDriver
                 await self.data_extractor.get_products_list()
             
-            # Loop door elke rij en verwerk producten
+            # In API-mode worden alle rijen gelijktijdig opgehaald en geparsed
+            if self.gebruik_api_mode:
+                rijen_met_id = []
+                for row_index in range(start_rij, eind_rij + 1):
+                    product_id = self.excel_manager.get_product_id(row_index)
+                    if product_id:
+                        rijen_met_id.append((row_index, product_id))
+                
+                # Afbeeldingen worden al gedownload terwijl de pipeline de volgende producten ophaalt
+                afbeelding_wachtrij = asyncio.Queue() if self.afbeeldingen is not None else None
+                
+                delta = self.catalogus is not None and self.api_instellingen['delta_sync']
+                bron = self.api_handler.base_url
+                
+                def _schrijf(row_index, product_data):
+                    gelukt = self.excel_manager.update_product_row(row_index, product_data, overschrijf_lokaal)
+                    if gelukt and delta:
+                        self.catalogus.werk_details_bij(bron, product_data)
+                    if gelukt and afbeelding_wachtrij is not None and product_data.get('afbeelding_url'):
+                        afbeelding_wachtrij.put_nowait((row_index, product_data['afbeelding_url']))
+                    return gelukt
+                
+                self.api_handler.transport.reset_statistieken()
+                te_halen = rijen_met_id
+                overgeslagen = 0
+                if delta:
+                    te_halen, opgeslagen = await self._bepaal_delta(rijen_met_id, volledig)
+                    for row_index, product_id in rijen_met_id:
+                        if product_id in opgeslagen and self._schrijf_uit_catalogus(
+                            row_index, opgeslagen[product_id], overschrijf_lokaal, afbeelding_wachtrij
+                        ):
+                            overgeslagen += 1
+                
+                # Ophalen, parsen en wegschrijven overlappen elkaar in een pipeline; met delta sync
+                # zijn de op te halen producten gewijzigd en mogen ze niet uit de response cache komen
+                pipeline = await self._maak_pipeline(
+                    _schrijf, partial(self.api_handler.fetch_product_page, gebruik_cache=False) if delta else None
+                )
+                # Rijen met hetzelfde ProductID delen één verzoek binnen deze run
+                self.api_handler.single_flight.start_run(product_id for _, product_id in te_halen)
+                afbeelding_werkers = []
+                if afbeelding_wachtrij is not None:
+                    self.afbeeldingen.reset_statistieken()
+                    afbeelding_werkers = [
+                        asyncio.create_task(self._download_afbeeldingen(afbeelding_wachtrij))
+                        for _ in range(self.max_gelijktijdige_verzoeken)
+                    ]
+                try:
+                    statistieken = await pipeline.verwerk(te_halen)
+                    # Laat de werkers de wachtrij leegmaken en daarna stoppen
+                    for _ in afbeelding_werkers:
+                        afbeelding_wachtrij.put_nowait(None)
+                    await asyncio.gather(*afbeelding_werkers)
+                finally:
+                    for werker in afbeelding_werkers:
+                        werker.cancel()
+                    dubbel_stats = self.api_handler.single_flight.einde_run()
+                logger.logInfo(
+                    f"Klaar met ophalen producten. {statistieken['succesvol'] + overgeslagen} producten succesvol bijgewerkt."
+                )
+                if delta:
+                    logger.logInfo(
+                        f"Delta sync: {overgeslagen} van {len(rijen_met_id)} detailpagina's overgeslagen "
+                        f"(rij in productoverzicht ongewijzigd), {statistieken['totaal']} opgehaald"
+                    )
+                if dubbel_stats['gedeeld'] or dubbel_stats['uit_memo']:
+                    logger.logInfo(
+                        f"Dubbele product IDs: {dubbel_stats['opgehaald']} pagina's opgehaald voor "
+                        f"{len(te_halen)} rijen ({dubbel_stats['gedeeld']} gedeeld, "
+                        f"{dubbel_stats['uit_memo']} uit geheugen)"
+                    )
+                if statistieken['mislukte_rijen']:
+                    logger.logWaarschuwing(
+                        f"{len(statistieken['mislukte_rijen'])} rijen niet bijgewerkt: "
+                        f"{', '.join(str(rij + 1) for rij in statistieken['mislukte_rijen'][:50])}"
+                    )
+                if afbeelding_werkers:
+                    afbeelding_stats = self.afbeeldingen.statistieken
+                    logger.logInfo(
+                        f"Afbeeldingen: {afbeelding_stats['gedownload']} gedownload "
+                        f"({afbeelding_stats['dubbel']} al aanwezig onder een andere URL), "
+                        f"{afbeelding_stats['ongewijzigd']} ongewijzigd, {afbeelding_stats['mislukt']} mislukt"
+                    )
+                self._log_api_statistieken()
+                if self.api_handler.cache is not None:
+                    cache_stats = self.api_handler.cache.statistieken
+                    logger.logInfo(
+                        f"Response cache: {cache_stats['hits']} lokaal, {cache_stats['gevalideerd']} gevalideerd, "
+                        f"{cache_stats['missers']} opgehaald"
+                    )
+                return True
+            
+            # Browser-mode: loop door elke rij en verwerk producten
             succesvol = 0
             for row_index in range(start_rij, eind_rij + 1):
                 # Haal product ID uit Excel
@@ -221,14 +365,8 @@ class RentproHandler:
                     # Geen ProductID, sla deze rij over
                     continue
                 
-                # Haal product details op via de juiste methode
-                product_data = None
-                if self.gebruik_api_mode:
-                    # Haal product details op via API
-                    product_data = await self.api_handler.get_product_details(product_id)
-                else:
-                    # Haal product details op via WebDriver
-                    product_data = await self.data_extractor.get_product_details(product_id)
+                # Haal product details op via WebDriver (één voor één, de driver is niet thread-safe)
+                product_data = await self.data_extractor.get_product_details(product_id)
                 
                 if not product_data:
                     # Kon geen productdetails ophalen
@@ -250,17 +388,465 @@ class RentproHandler:
             return True
             
         except Exception as e:
+            # Geen overstap naar mockdata: dat zou echte gegevens in Excel door nepdata vervangen
             logger.logFout(f"Onverwachte fout bij ophalen producten: {e}")
+            return False
+    
+    async def lees_producten_in(self, rijen, schrijf_functie, gebruik_cache=True):
+        """
+        Haal producten gelijktijdig op via HTTP en schrijf ze weg met een eigen schrijffunctie
+        
+        Args:
+            rijen (list | async iterable): Tuples (row_index, product_id), ook als stroom
+                (zie zoek_producten_in) zodat het ophalen bij het eerste resultaat begint
+            schrijf_functie (callable): Functie (row_index, product_data) -> bool
+            gebruik_cache (bool): Of productpagina's uit de response cache mogen komen
+        
+        Returns:
+            dict: Statistieken van de pipeline (zie SyncPipeline.verwerk) of None bij fout
+        """
+        try:
+            if not self.api_handler.logged_in:
+                logger.logFout("Niet ingelogd, kan producten niet inlezen")
+                return None
             
-            # Graceful degradation: schakel over naar mockdata modus
-            logger.logWaarschuwing("Overschakelen naar mockdata modus door onverwachte fout")
-            self.gebruik_mockdata = True
+            pipeline = await self._maak_pipeline(
+                schrijf_functie, partial(self.api_handler.fetch_product_page, gebruik_cache=gebruik_cache)
+            )
+            self.api_handler.transport.reset_statistieken()
+            
+            # Van een lijst zijn de dubbele IDs vooraf bekend; een stroom deelt alleen lopende verzoeken
+            stroom = hasattr(rijen, '__aiter__')
+            if not stroom:
+                self.api_handler.single_flight.start_run(product_id for _, product_id in rijen)
+            try:
+                statistieken = await pipeline.verwerk(rijen)
+            finally:
+                if not stroom:
+                    self.api_handler.single_flight.einde_run()
             
-            # Probeer opnieuw met mockdata
-            return await self._verwerk_mock_producten(
-                overschrijf_lokaal,
-                start_rij if 'start_rij' in locals() else 0,
-                eind_rij if 'eind_rij' in locals() else 0
+            logger.logInfo(
+                f"Klaar met inlezen: {statistieken['succesvol']} van {statistieken['totaal']} producten "
+                f"in {statistieken['duur']:.1f} s"
+            )
+            if statistieken['mislukte_rijen']:
+                logger.logWaarschuwing(
+                    f"{len(statistieken['mislukte_rijen'])} rijen niet ingelezen: "
+                    f"{', '.join(str(rij + 1) for rij in statistieken['mislukte_rijen'][:50])}"
+                )
+            self._log_api_statistieken()
+            return statistieken
+        
+        except Exception as e:
+            logger.logFout(f"Onverwachte fout bij inlezen producten: {e}")
+            return None
+    
+    async def zoek_producten_in(self, zoekterm, schrijf_functie, start_rij=0, max_resultaten=None):
+        """
+        Zoek producten in RentPro en lees de gevonden producten in vanaf start_rij
+        Elk zoekresultaat gaat direct door naar het gelijktijdig ophalen van de details,
+        terwijl de volgende resultaatpagina nog geladen wordt.
+        
+        Args:
+            zoekterm (str): Zoekterm
+            schrijf_functie (callable): Functie (row_index, product_data) -> bool
+            start_rij (int): Rij voor het eerste resultaat, de volgende resultaten komen eronder
+            max_resultaten (int, optional): Maximum aantal producten
+        
+        Returns:
+            dict: Statistieken van de pipeline (zie SyncPipeline.verwerk) of None bij fout
+        """
+        async def _gevonden_rijen():
+            rij_index = start_rij
+            async for product in self.api_handler.zoek_producten(zoekterm, max_resultaten):
+                yield rij_index, product['id']
+                rij_index += 1
+        
+        return await self.lees_producten_in(_gevonden_rijen(), schrijf_functie)
+    
+    async def ververs_catalogus(self, volledig=False):
+        """
+        Werk de lokale productcatalogus bij vanuit het productoverzicht
+        Alleen producten die nieuw zijn of waarvan de rij in het overzicht veranderd is
+        worden opnieuw (zonder response cache) opgehaald.
+        
+        Args:
+            volledig (bool): Haal de details van alle producten opnieuw op
+        
+        Returns:
+            dict: Statistieken met 'nieuw', 'gewijzigd', 'ongewijzigd', 'verwijderd' en
+                'opgehaald', of None bij fout
+        """
+        try:
+            if self.catalogus is None:
+                logger.logWaarschuwing("Productcatalogus is uitgeschakeld")
+                return None
+            if not self.api_handler.logged_in:
+                logger.logFout("Niet ingelogd, kan productcatalogus niet verversen")
+                return None
+            
+            bron = self.api_handler.base_url
+            producten = [product async for product in self.api_handler.iter_products()]
+            if not self.api_handler.overzicht_volledig:
+                logger.logWaarschuwing("Productoverzicht niet volledig opgehaald, verdwenen producten blijven in de catalogus")
+            
+            verschil = self.catalogus.werk_lijst_bij(bron, producten, self.api_handler.overzicht_volledig)
+            te_verversen = list(dict.fromkeys(product['id'] for product in producten)) if volledig else verschil['te_verversen']
+            logger.logInfo(
+                f"Productcatalogus: {verschil['nieuw']} nieuw, {verschil['gewijzigd']} gewijzigd, "
+                f"{verschil['ongewijzigd']} ongewijzigd, {verschil['verwijderd']} verwijderd; "
+                f"{len(te_verversen)} producten ophalen"
+            )
+            
+            opgehaald = 0
+            if te_verversen:
+                statistieken = await self.lees_producten_in(
+                    list(enumerate(te_verversen)),
+                    lambda _, product_data: self.catalogus.werk_details_bij(bron, product_data),
+                    gebruik_cache=False
+                )
+                opgehaald = statistieken['succesvol'] if statistieken else 0
+            
+            return {
+                'nieuw': verschil['nieuw'], 'gewijzigd': verschil['gewijzigd'],
+                'ongewijzigd': verschil['ongewijzigd'], 'verwijderd': verschil['verwijderd'],
+                'opgehaald': opgehaald
+            }
+        
+        except Exception as e:
+            logger.logFout(f"Onverwachte fout bij verversen productcatalogus: {e}")
+            return None
+    
+    async def synchroniseer_producten(self, rijen, schrijf_functie, bij_conflict=None, volledig=False):
+        """
+        Synchroniseer de sheet en RentPro in twee richtingen met een driewegvergelijking
+        De laatst gesynchroniseerde stand (SnapshotStore) is de basis: per veld wordt
+        opgehaald, verstuurd of een conflict gemeld (zie merge_sync.py). Alleen producten
+        waarvan de rij in het productoverzicht sinds de vorige synchronisatie veranderd is
+        worden opgehaald, en alleen gewijzigde velden gaan naar RentPro of de sheet. Blijkt
+        bij het versturen dat RentPro een veld buiten het overzicht gewijzigd heeft, dan
+        wordt dat product alsnog opgehaald en opnieuw beoordeeld.
+        
+        Args:
+            rijen (list): Tuples (row_index, product_id, dict veld_id -> waarde in de sheet, lege cellen als "")
+            schrijf_functie (callable): Functie (row_index, veld_id, waarde) -> bool die een waarde uit RentPro
+                in de sheet zet
+            bij_conflict (str, optional): 'melden', 'rentpro' of 'sheet', standaard volgens de API instellingen
+            volledig (bool): Alle detailpagina's ophalen, ook van producten met een ongewijzigde rij in het
+                overzicht (wijzigingen in velden die niet in het overzicht staan komen dan ook mee)
+        
+        Returns:
+            dict: Statistieken met 'producten', 'opgehaald' en 'overgeslagen' (detailpagina's),
+                'binnengehaald' en 'verstuurd' (velden), 'producten_verstuurd', 'mislukt' en
+                'conflicten' (list met tuples (row_index, product_id, veld_id, basis, sheet, rentpro)),
+                of None bij fout
+        """
+        try:
+            if self.snapshots is None:
+                logger.logFout("Sync snapshots zijn niet beschikbaar, kan niet synchroniseren")
+                return None
+            if not self.api_handler.logged_in:
+                logger.logFout("Niet ingelogd, kan niet synchroniseren")
+                return None
+            
+            bij_conflict = bij_conflict or self.api_instellingen['bij_conflict']
+            bron = self.api_handler.base_url
+            statistieken = {
+                'producten': 0, 'opgehaald': 0, 'overgeslagen': 0, 'binnengehaald': 0, 'verstuurd': 0,
+                'producten_verstuurd': 0, 'mislukt': 0, 'conflicten': []
+            }
+            
+            # Eén rij per product: dezelfde ID op meerdere rijen heeft geen eenduidige stand
+            per_product = {}
+            for row_index, product_id, velden in rijen:
+                product_id = str(product_id)
+                if product_id in per_product:
+                    logger.logWaarschuwing(f"Product {product_id} staat op meerdere rijen, rij {row_index + 1} wordt overgeslagen")
+                    continue
+                per_product[product_id] = (row_index, velden)
+            statistieken['producten'] = len(per_product)
+            
+            # Is de rij in het overzicht ongewijzigd sinds de vorige sync, dan heeft RentPro nog de basis
+            self.api_handler.transport.reset_statistieken()
+            lijst_hashes = {}
+            async for product in self.api_handler.iter_products():
+                lijst_hashes.setdefault(str(product['id']), product.get('hash'))
+            snapshots = self.snapshots.laad(bron, per_product)
+            te_halen = [
+                product_id for product_id, (_, velden) in per_product.items()
+                if volledig
+                or product_id not in snapshots
+                or lijst_hashes.get(product_id) is None
+                or snapshots[product_id]['lijst_hash'] != lijst_hashes[product_id]
+                or any(veld_id not in snapshots[product_id]['velden'] for veld_id in velden)
+            ]
+            statistieken['overgeslagen'] = len(per_product) - len(te_halen)
+            
+            te_halen_set = set(te_halen)
+            remote = {}
+            nieuwe_snapshots = {}
+            onbekende_velden = set()
+            engine = UploadEngine(self.api_handler, self.max_gelijktijdige_verzoeken)
+            kandidaten = list(per_product)
+            
+            # Een tweede ronde alleen voor producten die bij het versturen in RentPro gewijzigd
+            # bleken in een veld buiten het overzicht: die worden opgehaald en opnieuw beoordeeld
+            for ronde in range(2):
+                if te_halen:
+                    def _bewaar(index, product_data, te_halen=te_halen):
+                        remote[te_halen[index]] = product_data.get('velden', {})
+                        return True
+                    
+                    pipeline = await self._maak_pipeline(
+                        _bewaar, partial(self.api_handler.fetch_product_page, gebruik_cache=False)
+                    )
+                    await pipeline.verwerk(list(enumerate(te_halen)))
+                
+                # Beslis per veld; de snapshot volgt wat na afloop aan beide kanten gelijk is
+                te_versturen = []
+                for product_id in kandidaten:
+                    row_index, lokaal = per_product[product_id]
+                    if product_id in remote:
+                        remote_velden = remote[product_id]
+                    elif product_id in te_halen_set:
+                        statistieken['mislukt'] += 1
+                        continue
+                    else:
+                        remote_velden = snapshots[product_id]['velden']
+                    basis = snapshots.get(product_id, {}).get('velden', {})
+                    
+                    gesynct = {}
+                    versturen = {}
+                    afgerond = True
+                    for veld_id, waarde in lokaal.items():
+                        if veld_id not in remote_velden:
+                            onbekende_velden.add(veld_id)
+                            continue
+                        actie = bepaal_actie(basis.get(veld_id), waarde, remote_velden[veld_id], bij_conflict)
+                        if actie == GELIJK:
+                            gesynct[veld_id] = remote_velden[veld_id]
+                        elif actie == OPHALEN:
+                            if schrijf_functie(row_index, veld_id, remote_velden[veld_id]):
+                                gesynct[veld_id] = remote_velden[veld_id]
+                                statistieken['binnengehaald'] += 1
+                            else:
+                                afgerond = False
+                        elif actie == VERSTUREN:
+                            versturen[veld_id] = waarde
+                        else:
+                            statistieken['conflicten'].append(
+                                (row_index, product_id, veld_id, basis.get(veld_id), waarde, remote_velden[veld_id])
+                            )
+                            afgerond = False
+                    
+                    if versturen:
+                        te_versturen.append((row_index, product_id, versturen))
+                    # Met een open conflict blijft de oude vingerafdruk staan, zodat het product de volgende
+                    # keer opnieuw wordt opgehaald in plaats van RentPro gelijk aan de basis te veronderstellen
+                    vorige_hash = snapshots[product_id]['lijst_hash'] if product_id in snapshots else None
+                    nieuwe_snapshots[product_id] = {
+                        'lijst_hash': lijst_hashes.get(product_id) if afgerond else vorige_hash,
+                        'velden': gesynct
+                    }
+                
+                # Alleen de gewijzigde velden gaan naar RentPro. Voor producten die niet opgehaald zijn
+                # controleert de engine in het formulier dat RentPro nog de basis heeft.
+                verouderd = []
+                if te_versturen:
+                    upload_stats = await engine.upload(te_versturen, {
+                        product_id: snapshots[product_id]['velden']
+                        for _, product_id, _ in te_versturen if product_id not in remote
+                    })
+                    mislukte_rijen = set(upload_stats['mislukte_rijen'])
+                    verouderde_rijen = set(upload_stats['verouderde_rijen'])
+                    for row_index, product_id, versturen in te_versturen:
+                        if row_index in verouderde_rijen:
+                            verouderd.append(product_id)
+                            nieuwe_snapshots[product_id]['lijst_hash'] = snapshots[product_id]['lijst_hash']
+                            continue
+                        if row_index in mislukte_rijen:
+                            statistieken['mislukt'] += 1
+                            continue
+                        nieuwe_snapshots[product_id]['velden'].update(
+                            {veld_id: formatteer_waarde(waarde) for veld_id, waarde in versturen.items()}
+                        )
+                        statistieken['verstuurd'] += len(versturen)
+                        statistieken['producten_verstuurd'] += 1
+                
+                if not verouderd or ronde:
+                    break
+                logger.logInfo(f"{len(verouderd)} producten gewijzigd in RentPro buiten het productoverzicht, opnieuw ophalen")
+                kandidaten = te_halen = verouderd
+                te_halen_set.update(verouderd)
+                statistieken['overgeslagen'] -= len(verouderd)
+            
+            statistieken['opgehaald'] = len(remote)
+            for veld_id in sorted(onbekende_velden):
+                logger.logWaarschuwing(f"Veld '{veld_id}' komt niet voor in het RentPro formulier, wordt niet gesynchroniseerd")
+            
+            self.snapshots.sla_op(bron, nieuwe_snapshots)
+            
+            logger.logInfo(
+                f"Synchronisatie klaar: {statistieken['producten']} producten, {statistieken['opgehaald']} "
+                f"detailpagina's opgehaald ({statistieken['overgeslagen']} ongewijzigd overgeslagen), "
+                f"{statistieken['binnengehaald']} velden binnengehaald, {statistieken['verstuurd']} velden "
+                f"verstuurd naar {statistieken['producten_verstuurd']} producten, "
+                f"{len(statistieken['conflicten'])} conflicten, {statistieken['mislukt']} mislukt"
+            )
+            for row_index, product_id, veld_id, basis_waarde, lokaal_waarde, remote_waarde in statistieken['conflicten'][:50]:
+                logger.logWaarschuwing(
+                    f"Conflict in rij {row_index + 1} (product {product_id}), veld {veld_id}: "
+                    f"sheet {lokaal_waarde!r}, RentPro {remote_waarde!r}, laatst gesynchroniseerd {basis_waarde!r}"
+                )
+            self._log_api_statistieken()
+            return statistieken
+        
+        except Exception as e:
+            logger.logFout(f"Onverwachte fout bij synchroniseren: {e}")
+            return None
+    
+    async def _bepaal_delta(self, rijen_met_id, volledig=False):
+        """
+        Vergelijk het productoverzicht met de catalogus en bepaal welke rijen opgehaald moeten worden
+        De vingerafdrukken van de rijen worden daarbij in de catalogus bijgewerkt.
+        
+        Args:
+            rijen_met_id (list): Tuples (row_index, product_id) uit de sheet
+            volledig (bool): Alle rijen ophalen (de vingerafdrukken worden wel bijgewerkt)
+        
+        Returns:
+            tuple: (list met op te halen (row_index, product_id), dict product_id -> opgeslagen
+                details van de producten die niet opgehaald hoeven te worden)
+        """
+        bron = self.api_handler.base_url
+        producten = [product async for product in self.api_handler.iter_products()]
+        verschil = self.catalogus.werk_lijst_bij(bron, producten, self.api_handler.overzicht_volledig)
+        if volledig:
+            return rijen_met_id, {}
+        
+        # Alleen producten die in deze doorloop in het overzicht stonden zijn gecontroleerd
+        ongewijzigd = {str(product['id']) for product in producten} - set(verschil['te_verversen'])
+        opgeslagen = self.catalogus.opgeslagen_details(
+            bron, {product_id for _, product_id in rijen_met_id if product_id in ongewijzigd}
+        )
+        te_halen = [(row_index, product_id) for row_index, product_id in rijen_met_id if product_id not in opgeslagen]
+        return te_halen, opgeslagen
+    
+    def _schrijf_uit_catalogus(self, row_index, product_data, overschrijf_lokaal, afbeelding_wachtrij):
+        """Schrijf opgeslagen productgegevens in een rij, met de lokale afbeelding als die er al is"""
+        if not self.excel_manager.update_product_row(row_index, product_data, overschrijf_lokaal):
+            return False
+        url = product_data.get('afbeelding_url')
+        if url and afbeelding_wachtrij is not None:
+            pad = self.afbeeldingen.lokaal_pad(url)
+            if pad:
+                self.excel_manager.update_image_path(row_index, pad)
+            else:
+                afbeelding_wachtrij.put_nowait((row_index, url))
+        return True
+    
+    async def _download_afbeeldingen(self, wachtrij):
+        """Werker: download afbeeldingen uit de wachtrij en zet het lokale pad in de rij, tot een None binnenkomt"""
+        while True:
+            opdracht = await wachtrij.get()
+            if opdracht is None:
+                return
+            row_index, url = opdracht
+            pad = await self.afbeeldingen.haal_op(url, self.api_handler.haal_bestand)
+            if pad:
+                self.excel_manager.update_image_path(row_index, pad)
+    
+    async def _maak_pipeline(self, schrijf_functie, fetch_functie=None):
+        """Maak een pipeline die productpagina's ophaalt en op de parse pool parsed"""
+        # De parse functie gaat eventueel naar een ander proces en moet picklebaar zijn
+        parse_pool = self.api_handler.parse_pool
+        return SyncPipeline(
+            fetch_functie or self.api_handler.fetch_product_page,
+            partial(parse_product_details, base_url=self.api_handler.base_url),
+            schrijf_functie,
+            max_gelijktijdig=self.max_gelijktijdige_verzoeken,
+            parse_werkers=parse_pool.werkers,
+            wachtrij_grootte=self.api_instellingen['pipeline_wachtrij'],
+            executor=await asyncio.to_thread(parse_pool.executor)
+        )
+    
+    async def upload_producten(self, opdrachten, max_gelijktijdig=None):
+        """
+        Maak producten aan of werk ze bij in RentPro via formulierposts (zonder browser)
+        
+        Args:
+            opdrachten (list): Lijst van tuples (row_index, product_id of None voor nieuw, velden dict)
+            max_gelijktijdig (int, optional): Maximum aantal producten tegelijk, standaard volgens de API instellingen
+        
+        Returns:
+            dict: Statistieken van de upload (zie UploadEngine.upload) of None bij fout
+        """
+        try:
+            if not self.api_handler.logged_in:
+                logger.logFout("Niet ingelogd, kan producten niet uploaden")
+                return None
+            
+            # Controleer lokaal of de bij te werken producten bestaan (de server blijft leidend)
+            bron = self.api_handler.base_url
+            bij_te_werken = {product_id for _, product_id, _ in opdrachten if product_id}
+            if self.catalogus is not None and bij_te_werken and self.catalogus.aantal(bron):
+                onbekend = bij_te_werken - self.catalogus.bestaande_ids(bron, bij_te_werken)
+                if onbekend:
+                    logger.logWaarschuwing(
+                        f"{len(onbekend)} product IDs staan niet in de lokale catalogus: "
+                        f"{', '.join(sorted(onbekend)[:20])}"
+                    )
+            
+            engine = UploadEngine(self.api_handler, max_gelijktijdig or self.max_gelijktijdige_verzoeken)
+            self.api_handler.transport.reset_statistieken()
+            self.api_handler.tokens.reset_statistieken()
+            statistieken = await engine.upload(opdrachten)
+            
+            if statistieken['gewijzigde_velden']:
+                logger.logInfo(
+                    "Gewijzigde velden: " + ", ".join(
+                        f"{veld_id} {aantal}" for veld_id, aantal in statistieken['gewijzigde_velden'].most_common()
+                    )
+                )
+            if statistieken['mislukte_rijen']:
+                logger.logWaarschuwing(
+                    f"{len(statistieken['mislukte_rijen'])} rijen niet opgeslagen: "
+                    f"{', '.join(str(rij + 1) for rij in statistieken['mislukte_rijen'][:50])}"
+                )
+            token_stats = self.api_handler.tokens.statistieken
+            if token_stats['hergebruikt']:
+                logger.logInfo(
+                    f"Formulier voor nieuwe producten: {token_stats['opgehaald']} keer opgehaald, "
+                    f"{token_stats['hergebruikt']} keer hergebruikt, {token_stats['afgewezen']} tokens afgewezen"
+                )
+            self._log_api_statistieken()
+            return statistieken
+        
+        except Exception as e:
+            logger.logFout(f"Onverwachte fout bij uploaden producten: {e}")
+            return None
+    
+    def _log_api_statistieken(self):
+        """Log herhaalde verzoeken, het HTTP verkeer en de limiet van de concurrency controller na een bulktaak"""
+        retry_stats = self.api_handler.retry_beleid.statistieken
+        if any(retry_stats.values()):
+            logger.logInfo(
+                "Herhaalde verzoeken: " + ", ".join(f"{soort} {aantal}" for soort, aantal in retry_stats.items() if aantal)
+            )
+        verkeer = self.api_handler.transport.statistieken
+        if verkeer['verzoeken']:
+            bespaard = 1 - verkeer['bytes_ontvangen'] / verkeer['bytes_uitgepakt'] if verkeer['bytes_uitgepakt'] else 0.0
+            logger.logInfo(
+                f"HTTP verkeer: {verkeer['verzoeken']} verzoeken, {verkeer['bytes_ontvangen'] / 1048576:.1f} MB over de lijn "
+                f"({verkeer['bytes_uitgepakt'] / 1048576:.1f} MB uitgepakt, {bespaard:.0%} bespaard door compressie), "
+                f"{verkeer['verbindingen_geopend']} verbindingen geopend"
+                + (f", {verkeer['http2_verzoeken']} verzoeken via HTTP/2" if verkeer['http2_verzoeken'] else "")
+            )
+        if self.api_handler.concurrency is not None:
+            status = self.api_handler.concurrency.status()
+            logger.logInfo(
+                f"Gelijktijdige verzoeken na afloop: {status['limiet']} "
+                f"({len(self.api_handler.concurrency.wijzigingen)} aanpassingen)"
             )
     
     async def _verwerk_mock_producten(self, overschrijf_lokaal, start_rij, eind_rij):
@@ -431,6 +1017,28 @@ class RentproHandler:
             logger.logFout(f"Onverwachte fout bij evalueren JavaScript: {e}")
             return None
             
+    def herstel_sessie_op_achtergrond(self, gebruikersnaam, url=None):
+        """
+        Zet een opgeslagen API sessie terug in een achtergrondthread
+        Bedoeld om tijdens het opbouwen van de GUI aan te roepen, zodat de eerste
+        synchronisatie zonder login verzoeken kan starten.
+        
+        Args:
+            gebruikersnaam (str): RentPro gebruikersnaam
+            url (str, optional): De URL voor de RentPro back-office
+        """
+        if not self.gebruik_api_mode or self.gebruik_mockdata or not gebruikersnaam:
+            return
+        
+        def _herstel():
+            try:
+                if self.api_handler.herstel_sessie(gebruikersnaam, url):
+                    self.ingelogd = True
+            except Exception as e:
+                logger.logWaarschuwing(f"Fout bij herstellen opgeslagen sessie: {e}")
+        
+        threading.Thread(target=_herstel, daemon=True).start()
+    
     def set_mockdata_mode(self, enabled):
         """
         Schakel mockdata modus in of uit
@@ -0,0 +1,500 @@
+"""
+HTTP Transport voor RentPro integratie
+Verantwoordelijk voor niet-blokkerende HTTP communicatie via aiohttp
+
+De transport houdt één aiohttp sessie met een begrensde connection pool bij.
+Omdat de GUI elke actie in een eigen event loop draait (asyncio.run in een thread),
+wordt de sessie automatisch opnieuw opgebouwd als de loop wisselt. De cookie jar
+blijft daarbij behouden, zodat een login geldig blijft.
+
+Pagina's worden altijd gecomprimeerd opgevraagd (gzip/deflate, en brotli als dat
+geïnstalleerd is) en pas na ontvangst uitgepakt, zodat het aantal bytes over de
+lijn gemeten kan worden. Optioneel gaat het verkeer via httpx met HTTP/2, waarbij
+alle verzoeken over één verbinding gemultiplext worden; als de server geen HTTP/2
+aanbiedt valt httpx terug op HTTP/1.1 met keep-alive.
+"""
+import asyncio
+import time
+import zlib
+from http.cookiejar import CookieJar
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+import aiohttp
+from yarl import URL
+from modules.logger import logger
+
+try:
+    import brotli
+    BROTLI_BESCHIKBAAR = True
+except ImportError:
+    try:
+        import brotlicffi as brotli
+        BROTLI_BESCHIKBAAR = True
+    except ImportError:
+        brotli = None
+        BROTLI_BESCHIKBAAR = False
+
+try:
+    import httpx
+    import h2  # noqa: F401
+    HTTP2_BESCHIKBAAR = True
+except ImportError:
+    httpx = None
+    HTTP2_BESCHIKBAAR = False
+
+# Aangeboden compressie; brotli alleen als het ook uitgepakt kan worden
+ACCEPT_ENCODING = 'gzip, deflate, br' if BROTLI_BESCHIKBAAR else 'gzip, deflate'
+
+# Headers die alleen voor één HTTP/1.1 verbinding gelden en in HTTP/2 verboden zijn
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'}
+
+def maak_transport(http2=False, **kwargs):
+    """
+    Maak de transport volgens de instellingen
+    
+    Args:
+        http2 (bool): Gebruik httpx met HTTP/2 (als httpx en h2 geïnstalleerd zijn)
+        **kwargs: Argumenten voor AsyncTransport
+    
+    Returns:
+        AsyncTransport: Http2Transport of AsyncTransport (HTTP/1.1 keep-alive)
+    """
+    if http2:
+        if HTTP2_BESCHIKBAAR:
+            return Http2Transport(**kwargs)
+        logger.logWaarschuwing("HTTP/2 niet beschikbaar (installeer httpx[http2]), HTTP/1.1 keep-alive wordt gebruikt")
+    return AsyncTransport(**kwargs)
+
+def pak_uit(inhoud, codering):
+    """
+    Pak een gecomprimeerde body uit volgens de Content-Encoding header
+    
+    Args:
+        inhoud (bytes): Body zoals ontvangen
+        codering (str): Waarde van de Content-Encoding header (of None)
+    
+    Returns:
+        bytes: Uitgepakte body
+    """
+    codering = (codering or '').strip().lower()
+    if not inhoud or codering in ('', 'identity'):
+        return inhoud
+    if codering in ('gzip', 'x-gzip'):
+        return zlib.decompress(inhoud, 16 + zlib.MAX_WBITS)
+    if codering == 'deflate':
+        # Sommige servers sturen deflate zonder zlib header
+        try:
+            return zlib.decompress(inhoud)
+        except zlib.error:
+            return zlib.decompress(inhoud, -zlib.MAX_WBITS)
+    if codering == 'br' and BROTLI_BESCHIKBAAR:
+        return brotli.decompress(inhoud)
+    raise ValueError(f"Onbekende Content-Encoding: {codering}")
+
+class TransportResponse:
+    """
+    Eenvoudig antwoord-object met dezelfde velden als een requests.Response
+    die de ApiHandler gebruikt (status_code, text, content, url, headers)
+    """
+    
+    def __init__(self, status_code, text, url, headers, content=None, charset=None):
+        """
+        Initialiseer het antwoord
+        
+        Args:
+            status_code (int): HTTP statuscode
+            text (str): Gedecodeerde body, of None om content pas bij gebruik te decoderen
+            url (str): Uiteindelijke URL (na redirects)
+            headers (dict): Response headers (hoofdletterongevoelig)
+            content (bytes, optional): Uitgepakte ruwe body (bijvoorbeeld van een afbeelding)
+            charset (str, optional): Tekenset om content mee te decoderen (standaard utf-8)
+        """
+        self.status_code = status_code
+        self._text = text
+        self._content = content
+        self.charset = charset
+        self.url = url
+        self.headers = headers
+    
+    @property
+    def text(self):
+        """De body als tekst (gedecodeerd bij het eerste gebruik)"""
+        if self._text is None:
+            self._text = (self._content or b'').decode(self.charset or 'utf-8', errors='replace')
+        return self._text
+    
+    @property
+    def content(self):
+        """De body als bytes"""
+        if self._content is None:
+            self._content = (self._text or '').encode(self.charset or 'utf-8')
+        return self._content
+
+class AsyncTransport:
+    """
+    Niet-blokkerende HTTP client met een afgestelde connection pool
+    """
+    
+    def __init__(self, headers=None, max_verbindingen=100, max_verbindingen_per_host=16,
+                 keepalive_timeout=30, dns_cache_ttl=300, timeout=30, debug_capture=None,
+                 concurrency=None, compressie=True):
+        """
+        Initialiseer de transport
+        
+        Args:
+            headers (dict): Standaard headers voor elk verzoek
+            max_verbindingen (int): Maximum aantal open verbindingen in totaal
+            max_verbindingen_per_host (int): Maximum aantal open verbindingen per host
+            keepalive_timeout (float): Seconden dat een ongebruikte verbinding open blijft
+            dns_cache_ttl (int): Seconden dat DNS resultaten gecached worden
+            timeout (float): Totale timeout per verzoek in seconden
+            debug_capture (DebugCapture, optional): Ringbuffer waarin verzoeken worden bewaard
+            concurrency (AIMDController, optional): Adaptieve limiet voor gelijktijdige verzoeken
+            compressie (bool): Vraag gecomprimeerde antwoorden (gzip/deflate/brotli) aan
+        """
+        self.headers = dict(headers or {})
+        self.headers['Accept-Encoding'] = ACCEPT_ENCODING if compressie else 'identity'
+        self.max_verbindingen = max_verbindingen
+        self.max_verbindingen_per_host = max_verbindingen_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self.debug_capture = debug_capture
+        self.concurrency = concurrency
+        
+        self.cookie_jar = None
+        self._te_herstellen_cookies = None
+        self._sessie = None
+        self._loop = None
+        self.reset_statistieken()
+    
+    def reset_statistieken(self):
+        """Zet de tellers voor verkeer en verbindingen op nul (bijvoorbeeld aan het begin van een run)"""
+        self.statistieken = {
+            'verzoeken': 0,
+            'bytes_ontvangen': 0,
+            'bytes_uitgepakt': 0,
+            'verbindingen_geopend': 0,
+            'http2_verzoeken': 0,
+        }
+    
+    async def _haal_sessie(self):
+        """
+        Geef de aiohttp sessie voor de huidige event loop, maak deze aan indien nodig
+        
+        Returns:
+            aiohttp.ClientSession: De actieve sessie
+        """
+        loop = asyncio.get_running_loop()
+        if self._sessie is not None and not self._sessie.closed and self._loop is loop:
+            return self._sessie
+        
+        # Cookie jar wordt hergebruikt over event loops heen (unsafe=True staat IP-adressen toe)
+        if self.cookie_jar is None:
+            self.cookie_jar = aiohttp.CookieJar(unsafe=True)
+        if self._te_herstellen_cookies is not None:
+            self._pas_cookies_toe(*self._te_herstellen_cookies)
+            self._te_herstellen_cookies = None
+        
+        connector = aiohttp.TCPConnector(
+            limit=self.max_verbindingen,
+            limit_per_host=self.max_verbindingen_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+        # Tel nieuw geopende verbindingen (hergebruik via keep-alive telt niet mee)
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._verbinding_geopend)
+        
+        # Zelf uitpakken, zodat de gecomprimeerde grootte bekend is
+        self._sessie = aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=self.cookie_jar,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            auto_decompress=False,
+            trace_configs=[trace_config]
+        )
+        self._loop = loop
+        return self._sessie
+    
+    async def _verbinding_geopend(self, sessie, context, params):
+        """Trace callback van aiohttp bij een nieuwe verbinding"""
+        self.statistieken['verbindingen_geopend'] += 1
+    
+    async def request(self, methode, url, data=None, headers=None, allow_redirects=True):
+        """
+        Voer een HTTP verzoek uit
+        
+        Args:
+            methode (str): HTTP methode ('GET', 'POST', ...)
+            url (str): Volledige URL
+            data (dict of list, optional): Formulierdata voor POST verzoeken (list met (naam, waarde) paren voor herhaalde namen)
+            headers (dict, optional): Extra headers voor dit verzoek
+            allow_redirects (bool): Of redirects gevolgd moeten worden
+        
+        Returns:
+            TransportResponse: Het antwoord van de server
+        """
+        if self.concurrency is None:
+            return await self._voer_uit(methode, url, data, headers, allow_redirects)
+        
+        # Wacht op een plek binnen de adaptieve limiet en meld de uitkomst terug
+        async with self.concurrency.plek() as ronde:
+            start = time.monotonic()
+            try:
+                antwoord = await self._voer_uit(methode, url, data, headers, allow_redirects)
+            except Exception as e:
+                self.concurrency.registreer(ronde, time.monotonic() - start, fout=e)
+                raise
+            self.concurrency.registreer(ronde, time.monotonic() - start, status=antwoord.status_code)
+            return antwoord
+    
+    async def _voer_uit(self, methode, url, data, headers, allow_redirects):
+        """Voer het verzoek uit en houd het bij in de debug capture (indien ingeschakeld)"""
+        start = time.monotonic()
+        self.statistieken['verzoeken'] += 1
+        try:
+            antwoord = await self._stuur(methode, url, data, headers, allow_redirects)
+        except Exception as e:
+            if self.debug_capture is not None:
+                self.debug_capture.registreer(
+                    methode, url, data=data, request_headers=headers,
+                    duur=time.monotonic() - start, fout=repr(e)
+                )
+                self.debug_capture.dump(f"{methode} {url} mislukt: {e!r}")
+            raise
+        
+        if self.debug_capture is not None:
+            self.debug_capture.registreer(
+                methode, antwoord.url, antwoord.status_code, data, headers,
+                antwoord.headers, antwoord.text, time.monotonic() - start
+            )
+        return antwoord
+    
+    async def _stuur(self, methode, url, data, headers, allow_redirects):
+        """Verstuur het verzoek via aiohttp en pak het antwoord uit"""
+        sessie = await self._haal_sessie()
+        async with sessie.request(
+            methode,
+            url,
+            data=data,
+            headers=headers,
+            allow_redirects=allow_redirects
+        ) as response:
+            inhoud = await response.read()
+            uitgepakt = pak_uit(inhoud, response.headers.get('Content-Encoding'))
+            self.statistieken['bytes_ontvangen'] += len(inhoud)
+            self.statistieken['bytes_uitgepakt'] += len(uitgepakt)
+            return TransportResponse(
+                response.status,
+                None,
+                str(response.url),
+                response.headers.copy(),
+                content=uitgepakt,
+                charset=response.charset
+            )
+    
+    async def get(self, url, headers=None, allow_redirects=True):
+        """Voer een GET verzoek uit"""
+        return await self.request('GET', url, headers=headers, allow_redirects=allow_redirects)
+    
+    async def post(self, url, data=None, headers=None, allow_redirects=True):
+        """Voer een POST verzoek uit"""
+        return await self.request('POST', url, data=data, headers=headers, allow_redirects=allow_redirects)
+    
+    def exporteer_cookies(self):
+        """
+        Geef de huidige cookies in een vorm die als JSON opgeslagen kan worden
+        
+        Returns:
+            list: Cookies als dictionaries met 'naam', 'waarde', 'domein', 'pad' en 'secure'
+        """
+        if self.cookie_jar is None:
+            return []
+        return [
+            {
+                'naam': morsel.key,
+                'waarde': morsel.value,
+                'domein': morsel['domain'],
+                'pad': morsel['path'] or '/',
+                'secure': bool(morsel['secure'])
+            }
+            for morsel in self.cookie_jar
+        ]
+    
+    def herstel_cookies(self, cookies, url):
+        """
+        Zet eerder geëxporteerde cookies terug
+        Als er nog geen cookie jar is worden ze toegepast zodra de sessie wordt aangemaakt,
+        zodat dit ook buiten een event loop (bijvoorbeeld vanuit een achtergrondthread) kan.
+        
+        Args:
+            cookies (list): Cookies zoals teruggegeven door exporteer_cookies
+            url (str): URL waarvoor de cookies gelden
+        """
+        if self.cookie_jar is None:
+            self._te_herstellen_cookies = (cookies, url)
+        else:
+            self._pas_cookies_toe(cookies, url)
+    
+    def _pas_cookies_toe(self, cookies, url):
+        """Voeg cookies toe aan de cookie jar"""
+        basis = URL(url)
+        for cookie in cookies:
+            jar_cookie = SimpleCookie()
+            jar_cookie[cookie['naam']] = cookie['waarde']
+            jar_cookie[cookie['naam']]['path'] = cookie.get('pad') or '/'
+            if cookie.get('secure'):
+                jar_cookie[cookie['naam']]['secure'] = True
+            domein = cookie.get('domein')
+            if domein and domein != basis.host:
+                jar_cookie[cookie['naam']]['domain'] = domein
+            self.cookie_jar.update_cookies(jar_cookie, response_url=basis)
+    
+    def reset_cookies(self):
+        """Verwijder alle cookies, bijvoorbeeld voor een schone login"""
+        self._te_herstellen_cookies = None
+        if self.cookie_jar is not None:
+            self.cookie_jar.clear()
+    
+    async def close(self):
+        """
+        Sluit de sessie en de open verbindingen (de cookies blijven bewaard)
+        
+        Returns:
+            bool: True als sluiten succesvol was, anders False
+        """
+        try:
+            if self._sessie is not None and not self._sessie.closed and self._loop is asyncio.get_running_loop():
+                await self._sessie.close()
+            self._sessie = None
+            self._loop = None
+            return True
+        except Exception as e:
+            logger.logFout(f"Fout bij sluiten HTTP sessie: {e}")
+            self._sessie = None
+            self._loop = None
+            return False
+
+class Http2Transport(AsyncTransport):
+    """
+    Transport via httpx met HTTP/2 multiplexing
+    Over https wordt HTTP/2 via ALPN afgesproken; biedt de server dat niet aan (of is
+    de verbinding plain http), dan gebruikt httpx HTTP/1.1 met keep-alive.
+    """
+    
+    def __init__(self, **kwargs):
+        """Initialiseer de transport (zie AsyncTransport voor de argumenten)"""
+        super().__init__(**kwargs)
+        # Verbindingsgebonden headers zijn in HTTP/2 niet toegestaan
+        self.headers = {
+            naam: waarde for naam, waarde in self.headers.items() if naam.lower() not in HOP_BY_HOP_HEADERS
+        }
+        # Eén cookie jar voor alle clients, zodat een login geldig blijft als de loop wisselt
+        self.cookie_jar = CookieJar()
+    
+    async def _haal_sessie(self):
+        """
+        Geef de httpx client voor de huidige event loop, maak deze aan indien nodig
+        
+        Returns:
+            httpx.AsyncClient: De actieve client
+        """
+        loop = asyncio.get_running_loop()
+        if self._sessie is not None and not self._sessie.is_closed and self._loop is loop:
+            return self._sessie
+        
+        self._sessie = httpx.AsyncClient(
+            http2=True,
+            headers=self.headers,
+            cookies=self.cookie_jar,
+            limits=httpx.Limits(
+                max_connections=self.max_verbindingen,
+                max_keepalive_connections=self.max_verbindingen_per_host,
+                keepalive_expiry=self.keepalive_timeout
+            ),
+            timeout=httpx.Timeout(self.timeout)
+        )
+        self._loop = loop
+        return self._sessie
+    
+    async def _trace(self, gebeurtenis, info):
+        """Trace callback van httpcore, telt nieuw geopende verbindingen"""
+        if gebeurtenis == 'connection.connect_tcp.complete':
+            self.statistieken['verbindingen_geopend'] += 1
+    
+    async def _stuur(self, methode, url, data, headers, allow_redirects):
+        """Verstuur het verzoek via httpx (die het antwoord zelf uitpakt)"""
+        client = await self._haal_sessie()
+        verzoek_headers = dict(headers or {})
+        inhoud = None
+        if data is not None:
+            # urlencode behoudt de volgorde van (naam, waarde) paren, ook bij herhaalde namen
+            inhoud = urlencode(data)
+            verzoek_headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+        
+        response = await client.request(
+            methode,
+            url,
+            content=inhoud,
+            headers=verzoek_headers,
+            follow_redirects=allow_redirects,
+            extensions={'trace': self._trace}
+        )
+        
+        for deel in list(response.history) + [response]:
+            self.statistieken['bytes_ontvangen'] += deel.num_bytes_downloaded
+        self.statistieken['bytes_uitgepakt'] += len(response.content)
+        if response.http_version == 'HTTP/2':
+            self.statistieken['http2_verzoeken'] += 1
+        
+        return TransportResponse(
+            response.status_code, None, str(response.url), response.headers,
+            content=response.content, charset=response.encoding
+        )
+    
+    def exporteer_cookies(self):
+        """
+        Geef de huidige cookies in een vorm die als JSON opgeslagen kan worden
+        
+        Returns:
+            list: Cookies als dictionaries met 'naam', 'waarde', 'domein', 'pad' en 'secure'
+        """
+        return [
+            {
+                'naam': cookie.name,
+                'waarde': cookie.value,
+                'domein': cookie.domain,
+                'pad': cookie.path or '/',
+                'secure': bool(cookie.secure)
+            }
+            for cookie in self.cookie_jar
+        ]
+    
+    def _pas_cookies_toe(self, cookies, url):
+        """Voeg cookies toe aan de cookie jar"""
+        host = URL(url).host
+        jar = httpx.Cookies(self.cookie_jar)
+        for cookie in cookies:
+            jar.set(cookie['naam'], cookie['waarde'], domain=cookie.get('domein') or host, path=cookie.get('pad') or '/')
+    
+    async def close(self):
+        """
+        Sluit de client en de open verbindingen (de cookies blijven bewaard)
+        
+        Returns:
+            bool: True als sluiten succesvol was, anders False
+        """
+        try:
+            if self._sessie is not None and not self._sessie.is_closed and self._loop is asyncio.get_running_loop():
+                await self._sessie.aclose()
+            self._sessie = None
+            self._loop = None
+            return True
+        except Exception as e:
+            logger.logFout(f"Fout bij sluiten HTTP sessie: {e}")
+            self._sessie = None
+            self._loop = None
+            return False
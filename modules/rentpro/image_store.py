@@ -0,0 +1,202 @@
+"""
+Image Store voor RentPro integratie
+Verantwoordelijk voor het downloaden en lokaal bewaren van productafbeeldingen
+
+Afbeeldingen worden opgeslagen op de hash van hun inhoud (content-addressed):
+dezelfde afbeelding bij meerdere producten staat maar één keer op schijf. Een
+index in SQLite koppelt elke URL aan de hash en bewaart de grootte en de
+ETag/Last-Modified validators van de server. Bij een volgende run wordt een
+bekende afbeelding met een conditioneel verzoek gecontroleerd (of, zonder
+validators, met een HEAD verzoek op de grootte) en alleen opnieuw gedownload
+als hij veranderd is.
+"""
+import os
+import time
+import asyncio
+import sqlite3
+import hashlib
+import mimetypes
+import threading
+from urllib.parse import urlparse
+from modules.logger import logger
+
+class ImageStore:
+    """
+    Content-addressed opslag van productafbeeldingen met een index per URL
+    """
+    
+    def __init__(self, pad='cache/afbeeldingen'):
+        """
+        Initialiseer de opslag
+        
+        Args:
+            pad (str): Map waarin de afbeeldingen en de index (index.sqlite) staan
+        """
+        self.pad = pad
+        self.statistieken = {'gedownload': 0, 'ongewijzigd': 0, 'dubbel': 0, 'mislukt': 0}
+        self._lock = threading.Lock()
+        # Gelijktijdige aanvragen voor dezelfde URL delen één download
+        self._lopend = {}
+        
+        if not os.path.exists(pad):
+            os.makedirs(pad)
+        
+        self._db = sqlite3.connect(os.path.join(pad, 'index.sqlite'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS afbeeldingen (
+                url TEXT PRIMARY KEY,
+                bestand TEXT NOT NULL,
+                grootte INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                opgehaald_op REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_bestand ON afbeeldingen (bestand)")
+        self._db.commit()
+    
+    def reset_statistieken(self):
+        """Zet de tellers op nul, bijvoorbeeld aan het begin van een run"""
+        self.statistieken = {'gedownload': 0, 'ongewijzigd': 0, 'dubbel': 0, 'mislukt': 0}
+    
+    async def haal_op(self, url, ophalen):
+        """
+        Zorg dat de afbeelding lokaal staat en geef het lokale pad
+        
+        Args:
+            url (str): URL van de afbeelding
+            ophalen (callable): Async functie (url, methode='GET', headers=None) -> TransportResponse,
+                bijvoorbeeld ApiHandler.haal_bestand
+        
+        Returns:
+            str: Absoluut pad naar het lokale bestand, of None als de afbeelding niet opgehaald kon worden
+        """
+        taak = self._lopend.get(url)
+        if taak is None or taak.get_loop() is not asyncio.get_running_loop():
+            taak = asyncio.ensure_future(self._haal_op(url, ophalen))
+            self._lopend[url] = taak
+            taak.add_done_callback(lambda _: self._lopend.pop(url, None))
+        return await asyncio.shield(taak)
+    
+    async def _haal_op(self, url, ophalen):
+        """Download de afbeelding als hij nieuw of gewijzigd is"""
+        try:
+            bekend = self._zoek(url)
+            lokaal = self._volledig_pad(bekend['bestand']) if bekend else None
+            response = None
+            
+            if lokaal and os.path.exists(lokaal):
+                validators = {}
+                if bekend['etag']:
+                    validators['If-None-Match'] = bekend['etag']
+                if bekend['last_modified']:
+                    validators['If-Modified-Since'] = bekend['last_modified']
+                
+                if validators:
+                    # Conditioneel verzoek: 304 betekent ongewijzigd, zonder body
+                    response = await ophalen(url, 'GET', validators)
+                    if response.status_code == 304:
+                        self.statistieken['ongewijzigd'] += 1
+                        return lokaal
+                else:
+                    # Geen validators: vergelijk alleen de grootte met een HEAD verzoek
+                    kop = await ophalen(url, 'HEAD')
+                    if kop.status_code == 200 and kop.headers.get('Content-Length') == str(bekend['grootte']):
+                        self.statistieken['ongewijzigd'] += 1
+                        return lokaal
+            
+            if response is None:
+                response = await ophalen(url)
+            if response.status_code != 200 or not response.content:
+                logger.logWaarschuwing(f"Afbeelding niet opgehaald ({response.status_code}): {url}")
+                self.statistieken['mislukt'] += 1
+                return None
+            
+            bestand, al_aanwezig = await asyncio.to_thread(self._sla_op, url, response)
+            self.statistieken['gedownload'] += 1
+            if al_aanwezig:
+                self.statistieken['dubbel'] += 1
+            return self._volledig_pad(bestand)
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij downloaden afbeelding {url}: {e}")
+            self.statistieken['mislukt'] += 1
+            return None
+    
+    def _sla_op(self, url, response):
+        """
+        Schrijf de inhoud weg onder zijn hash (als die er nog niet staat) en werk de index bij
+        
+        Returns:
+            tuple: (bestand relatief aan de opslagmap, of de inhoud al aanwezig was)
+        """
+        inhoud = response.content
+        inhoud_hash = hashlib.sha256(inhoud).hexdigest()
+        content_type = (response.headers.get('Content-Type') or '').split(';')[0].strip()
+        extensie = (
+            os.path.splitext(urlparse(url).path)[1].lower()
+            or mimetypes.guess_extension(content_type)
+            or '.bin'
+        )
+        # Verdeel over submappen op de eerste tekens van de hash, zodat geen enkele map te groot wordt
+        bestand = os.path.join(inhoud_hash[:2], f"{inhoud_hash}{extensie}")
+        volledig_pad = self._volledig_pad(bestand)
+        
+        al_aanwezig = os.path.exists(volledig_pad)
+        if not al_aanwezig:
+            os.makedirs(os.path.dirname(volledig_pad), exist_ok=True)
+            # Schrijf eerst naar een tijdelijk bestand, zodat een afgebroken download geen half bestand achterlaat
+            tijdelijk = f"{volledig_pad}.{threading.get_ident()}.tmp"
+            with open(tijdelijk, 'wb') as f:
+                f.write(inhoud)
+            os.replace(tijdelijk, volledig_pad)
+        
+        with self._lock:
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO afbeeldingen (url, bestand, grootte, etag, last_modified, opgehaald_op)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    url,
+                    bestand,
+                    len(inhoud),
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    time.time()
+                )
+            )
+            self._db.commit()
+        return bestand, al_aanwezig
+    
+    def _volledig_pad(self, bestand):
+        """Absoluut pad van een bestand in de opslag (de sheet kan vanuit een andere map geopend worden)"""
+        return os.path.abspath(os.path.join(self.pad, bestand))
+    
+    def _zoek(self, url):
+        """Zoek een URL in de index"""
+        with self._lock:
+            rij = self._db.execute(
+                "SELECT bestand, grootte, etag, last_modified FROM afbeeldingen WHERE url = ?", (url,)
+            ).fetchone()
+        if rij is None:
+            return None
+        return {'bestand': rij[0], 'grootte': rij[1], 'etag': rij[2], 'last_modified': rij[3]}
+    
+    def lokaal_pad(self, url):
+        """
+        Geef het lokale pad van een eerder opgehaalde afbeelding (zonder netwerk)
+        
+        Args:
+            url (str): URL van de afbeelding
+        
+        Returns:
+            str: Pad naar het lokale bestand of None als de afbeelding niet lokaal staat
+        """
+        bekend = self._zoek(url)
+        if bekend is None:
+            return None
+        pad = self._volledig_pad(bekend['bestand'])
+        return pad if os.path.exists(pad) else None
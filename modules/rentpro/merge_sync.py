@@ -0,0 +1,85 @@
+"""
+Merge Sync voor RentPro integratie
+Verantwoordelijk voor de driewegvergelijking tussen de sheet, de snapshot en RentPro
+
+Per product en veld zijn er drie waarden: de laatst gesynchroniseerde waarde (de
+basis, uit de SnapshotStore), de waarde in de sheet (lokaal) en de waarde in
+RentPro (remote). Daaruit volgt per veld één beslissing:
+
+- lokaal en remote gelijk: niets te doen
+- alleen remote gewijzigd: ophalen (RentPro -> sheet)
+- alleen lokaal gewijzigd: versturen (sheet -> RentPro)
+- beide gewijzigd en verschillend: conflict, tenzij een voorkeur is ingesteld
+
+Zonder basis (eerste synchronisatie van een veld) wordt een leeg veld aangevuld
+vanaf de andere kant; twee verschillende gevulde waarden zijn een conflict.
+
+Waarden worden vergeleken na dezelfde normalisatie als bij het uploaden (getallen,
+booleans en witruimte), zodat 12 en "12,00" niet als wijziging gelden.
+"""
+from modules.rentpro.upload_engine import formatteer_waarde, normaliseer_waarde, AANGEVINKT_WAARDEN
+
+# Beslissingen per veld
+GELIJK = 'gelijk'
+OPHALEN = 'ophalen'
+VERSTUREN = 'versturen'
+CONFLICT = 'conflict'
+
+# Mogelijke voorkeuren bij een conflict: alleen melden, RentPro wint of de sheet wint
+CONFLICT_OPTIES = ('melden', 'rentpro', 'sheet')
+
+def vergelijkbaar(waarde, vinkvak=False):
+    """
+    Breng een waarde in de vorm waarin sheet, snapshot en RentPro vergeleken worden
+    
+    Args:
+        waarde: Waarde uit de sheet, de snapshot of RentPro (None telt als leeg)
+        vinkvak (bool): Of het veld een checkbox is ('true'/'false')
+    
+    Returns:
+        str: Genormaliseerde waarde
+    """
+    tekst = '' if waarde is None else normaliseer_waarde(formatteer_waarde(waarde))
+    if vinkvak:
+        return 'true' if tekst.lower() in AANGEVINKT_WAARDEN else 'false'
+    return tekst
+
+def bepaal_actie(basis, lokaal, remote, bij_conflict='melden'):
+    """
+    Beslis voor één veld wat er gesynchroniseerd moet worden
+    
+    Args:
+        basis: Laatst gesynchroniseerde waarde, None als er nog geen snapshot is
+        lokaal: Waarde in de sheet
+        remote: Waarde in RentPro
+        bij_conflict (str): 'melden', 'rentpro' (ophalen) of 'sheet' (versturen)
+    
+    Returns:
+        str: GELIJK, OPHALEN, VERSTUREN of CONFLICT
+    """
+    # Een checkbox herkennen we aan de waarde die RentPro (of eerder de snapshot) gaf
+    vinkvak = vergelijkbaar(remote if remote is not None else basis) in ('true', 'false')
+    lokaal_v = vergelijkbaar(lokaal, vinkvak)
+    remote_v = vergelijkbaar(remote, vinkvak)
+    
+    if lokaal_v == remote_v:
+        return GELIJK
+    
+    if basis is None:
+        # Eerste synchronisatie van dit veld: vul een lege kant aan vanaf de andere
+        if vergelijkbaar(lokaal) == '':
+            return OPHALEN
+        if vergelijkbaar(remote) == '':
+            return VERSTUREN
+    else:
+        basis_v = vergelijkbaar(basis, vinkvak)
+        if lokaal_v == basis_v:
+            return OPHALEN
+        if remote_v == basis_v:
+            return VERSTUREN
+    
+    if bij_conflict == 'rentpro':
+        return OPHALEN
+    if bij_conflict == 'sheet':
+        return VERSTUREN
+    return CONFLICT
@@ -27,7 +27,11 @@ class Navigator:
         """
         self.driver_manager = driver_manager
         self.authenticator = authenticator
-        self.base_url = "http://metroeventsdc.rentpro5.nl"
+    
+    @property
+    def base_url(self):
+        """Base URL van de omgeving waarop de authenticator is ingelogd"""
+        return self.authenticator.base_url
     
     async def go_to_products(self):
         """
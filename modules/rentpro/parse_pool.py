@@ -0,0 +1,112 @@
+"""
+Parse Pool voor RentPro integratie
+Verantwoordelijk voor het parsen van pagina's buiten de event loop
+
+BeautifulSoup is CPU-intensief en houdt de GIL vast, waardoor extra threads het
+parsen nauwelijks versnellen. Met parse_processen > 0 gebeurt het parsen in aparte
+processen en schaalt de doorvoer met het aantal cores. De processen worden bij
+het eerste gebruik gestart en opgewarmd (parser modules geladen) en blijven
+daarna actief, zodat volgende runs ze direct kunnen hergebruiken.
+
+Naar de processen gaan alleen de ruwe pagina's, terug komen gewone dictionaries.
+De parse functies moeten daarom op moduleniveau staan (zie product_parser) en
+mogen geen modules laden die bij het importeren iets doen, zoals de logger.
+"""
+import os
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from modules.logger import logger
+from modules.rentpro.product_parser import opwarmen
+
+class ParsePool:
+    """
+    Herbruikbare pool van parse werkers (processen of threads)
+    """
+    
+    def __init__(self, processen=0, threads=2):
+        """
+        Initialiseer de pool (er wordt nog niets gestart)
+        
+        Args:
+            processen (int): Aantal werkprocessen; 0 om threads te gebruiken, -1 voor het aantal cores
+            threads (int): Aantal threads als er geen processen gebruikt worden
+        """
+        if processen is not None and int(processen) < 0:
+            processen = os.cpu_count() or 1
+        self.processen = max(0, int(processen or 0))
+        self.threads = max(1, int(threads))
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    @property
+    def werkers(self):
+        """Aantal pagina's dat tegelijk geparsed kan worden"""
+        return self.processen or self.threads
+    
+    def executor(self):
+        """
+        Geef de executor van de pool en start deze bij het eerste gebruik
+        Het opstarten van processen kost even tijd; roep dit buiten de event loop aan
+        (zie voer_uit) of accepteer een korte blokkade bij de eerste aanroep.
+        
+        Returns:
+            Executor: ProcessPoolExecutor of ThreadPoolExecutor
+        """
+        with self._lock:
+            # Een pool waarvan een proces is gecrasht kan niet meer gebruikt worden
+            if self._executor is not None and getattr(self._executor, '_broken', False):
+                logger.logWaarschuwing("Parse pool was defect geraakt, wordt opnieuw gestart")
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            
+            if self._executor is None:
+                self._executor = self._start()
+            return self._executor
+    
+    def _start(self):
+        """Start de werkers en warm de processen op"""
+        if not self.processen:
+            return ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="parse")
+        
+        executor = None
+        try:
+            # Spawn op elk platform: forken met lopende threads (GUI, event loop) is niet veilig
+            executor = ProcessPoolExecutor(
+                max_workers=self.processen,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            # De werkprocessen laden alleen product_parser (en dus niet de logger)
+            pids = set(executor.map(opwarmen, range(self.processen * 2)))
+            logger.logInfo(f"Parse pool gestart met {len(pids)} processen")
+            return executor
+        except Exception as e:
+            logger.logWaarschuwing(f"Parse processen konden niet starten, parsen met threads: {e}")
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            self.processen = 0
+            return ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="parse")
+    
+    async def voer_uit(self, functie, *args):
+        """
+        Voer een parse functie uit op de pool zonder de event loop te blokkeren
+        
+        Args:
+            functie (callable): Functie op moduleniveau (moet picklebaar zijn voor processen)
+            *args: Argumenten voor de functie
+        
+        Returns:
+            Het resultaat van de functie
+        """
+        executor = self._executor
+        if executor is None or getattr(executor, '_broken', False):
+            executor = await asyncio.to_thread(self.executor)
+        return await asyncio.get_running_loop().run_in_executor(executor, functie, *args)
+    
+    def sluit(self):
+        """Stop de werkers (bij het afsluiten van het programma)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,261 @@
+"""
+Sync Pipeline voor RentPro integratie
+Verantwoordelijk voor het overlappend ophalen, parsen en wegschrijven van producten
+
+Het synchroniseren bestaat uit drie stappen met elk een eigen soort werk:
+- ophalen: netwerk I/O, draait als taken op de event loop
+- parsen: CPU werk, draait op een pool van werkers buiten de event loop
+- schrijven: bijwerken van de DataFrame, door één schrijver zodat de rijen
+  nooit gelijktijdig worden aangepast
+
+Tussen de stappen staan begrensde wachtrijen. Als een stap achterloopt raakt
+de wachtrij ervoor vol en wacht de vorige stap (backpressure), zodat er nooit
+meer dan een vast aantal pagina's in het geheugen staat. Per stap worden de
+doorvoer, de bezetting en de wachtrijdiepte bijgehouden om de bottleneck te zien.
+
+De rijen kunnen ook als async stroom binnenkomen (bijvoorbeeld zoekresultaten
+die pagina voor pagina gevonden worden); het ophalen begint dan al bij de
+eerste rij, terwijl de volgende resultaten nog onderweg zijn.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from modules.logger import logger
+
+# Markeert het einde van de invoer in een wachtrij
+_EINDE = object()
+
+class StageStatistieken:
+    """
+    Meetgegevens van één stap van de pipeline
+    """
+    
+    def __init__(self, naam, werkers):
+        """
+        Initialiseer de statistieken
+        
+        Args:
+            naam (str): Naam van de stap
+            werkers (int): Aantal werkers in de stap
+        """
+        self.naam = naam
+        self.werkers = werkers
+        self.verwerkt = 0
+        self.bezig_tijd = 0.0
+        self.wachtrij_max = 0
+        self._wachtrij_som = 0
+        self._metingen = 0
+    
+    def meet_wachtrij(self, wachtrij):
+        """Registreer de diepte van de wachtrij voor deze stap"""
+        diepte = wachtrij.qsize()
+        self.wachtrij_max = max(self.wachtrij_max, diepte)
+        self._wachtrij_som += diepte
+        self._metingen += 1
+    
+    def samenvatting(self, duur):
+        """
+        Vat de meetgegevens samen
+        
+        Args:
+            duur (float): Totale duur van de pipeline in seconden
+        
+        Returns:
+            dict: 'verwerkt', 'per_seconde', 'bezetting' (0-1, gemiddeld over de werkers),
+                'wachtrij_gem' en 'wachtrij_max'
+        """
+        return {
+            'verwerkt': self.verwerkt,
+            'per_seconde': self.verwerkt / duur if duur > 0 else 0.0,
+            'bezetting': min(1.0, self.bezig_tijd / (duur * self.werkers)) if duur > 0 else 0.0,
+            'wachtrij_gem': self._wachtrij_som / self._metingen if self._metingen else 0.0,
+            'wachtrij_max': self.wachtrij_max
+        }
+
+class SyncPipeline:
+    """
+    Pipeline ophalen -> parsen -> schrijven met begrensde wachtrijen
+    """
+    
+    def __init__(self, fetch_functie, parse_functie, schrijf_functie, max_gelijktijdig=8,
+                 parse_werkers=2, wachtrij_grootte=32, executor=None):
+        """
+        Initialiseer de pipeline
+        
+        Args:
+            fetch_functie (callable): Async functie product_id -> ruwe pagina (str) of None
+            parse_functie (callable): Functie (product_id, pagina) -> product data (dict) of None,
+                draait op de executor en moet dus thread-safe (of picklebaar) zijn
+            schrijf_functie (callable): Functie (row_index, product_data) -> bool die het resultaat toepast
+            max_gelijktijdig (int): Maximum aantal pagina's dat tegelijk wordt opgehaald
+            parse_werkers (int): Aantal pagina's dat tegelijk geparsed wordt
+            wachtrij_grootte (int): Maximum aantal items in elke wachtrij tussen twee stappen
+            executor (Executor, optional): Pool voor het parsen; standaard een thread pool voor deze run
+        """
+        self.fetch_functie = fetch_functie
+        self.parse_functie = parse_functie
+        self.schrijf_functie = schrijf_functie
+        self.max_gelijktijdig = max(1, int(max_gelijktijdig))
+        self.parse_werkers = max(1, int(parse_werkers))
+        self.wachtrij_grootte = max(1, int(wachtrij_grootte))
+        self.executor = executor
+    
+    async def verwerk(self, rijen):
+        """
+        Haal alle rijen op, parse ze en schrijf de resultaten weg
+        
+        Args:
+            rijen (list | async iterable): Tuples (row_index, product_id), als lijst of als
+                async stroom waarvan de lengte vooraf niet bekend is
+        
+        Returns:
+            dict: Statistieken met 'totaal', 'succesvol', 'mislukt', 'mislukte_rijen', 'duur'
+                (seconden) en 'stappen' (per stap de samenvatting van StageStatistieken)
+        """
+        stroom = hasattr(rijen, '__aiter__')
+        totaal = None if stroom else len(rijen)
+        statistieken = {
+            'totaal': totaal or 0, 'succesvol': 0, 'mislukt': 0,
+            'mislukte_rijen': [], 'duur': 0.0, 'stappen': {}
+        }
+        if totaal == 0:
+            return statistieken
+        
+        loop = asyncio.get_running_loop()
+        eigen_executor = self.executor is None
+        executor = ThreadPoolExecutor(max_workers=self.parse_werkers) if eigen_executor else self.executor
+        
+        ophalen = StageStatistieken('ophalen', self.max_gelijktijdig)
+        parsen = StageStatistieken('parsen', self.parse_werkers)
+        schrijven = StageStatistieken('schrijven', 1)
+        
+        aantal_ophalers = self.max_gelijktijdig if stroom else min(self.max_gelijktijdig, totaal)
+        invoer = asyncio.Queue(maxsize=self.wachtrij_grootte if stroom else 0)
+        te_parsen = asyncio.Queue(maxsize=self.wachtrij_grootte)
+        te_schrijven = asyncio.Queue(maxsize=self.wachtrij_grootte)
+        if not stroom:
+            for rij in rijen:
+                invoer.put_nowait(rij)
+            for _ in range(aantal_ophalers):
+                invoer.put_nowait(_EINDE)
+        
+        async def _invoerder():
+            # Zet de rijen uit de stroom door naar de ophalers zodra ze binnenkomen
+            try:
+                async for rij in rijen:
+                    statistieken['totaal'] += 1
+                    await invoer.put(rij)
+            finally:
+                for _ in range(aantal_ophalers):
+                    await invoer.put(_EINDE)
+        
+        async def _ophaal_werker():
+            while True:
+                item = await invoer.get()
+                if item is _EINDE:
+                    return
+                row_index, product_id = item
+                start = time.monotonic()
+                try:
+                    pagina = await self.fetch_functie(product_id)
+                except Exception as e:
+                    logger.logFout(f"Fout bij ophalen product {product_id} (rij {row_index}): {e}")
+                    pagina = None
+                ophalen.bezig_tijd += time.monotonic() - start
+                ophalen.verwerkt += 1
+                # Wacht als de parsers achterlopen (backpressure)
+                await te_parsen.put((row_index, product_id, pagina))
+                parsen.meet_wachtrij(te_parsen)
+        
+        async def _parse_werker():
+            while True:
+                item = await te_parsen.get()
+                if item is _EINDE:
+                    return
+                row_index, product_id, pagina = item
+                product_data = None
+                if pagina is not None:
+                    start = time.monotonic()
+                    try:
+                        product_data = await loop.run_in_executor(executor, self.parse_functie, product_id, pagina)
+                    except Exception as e:
+                        logger.logFout(f"Fout bij parsen product {product_id} (rij {row_index}): {e}")
+                    parsen.bezig_tijd += time.monotonic() - start
+                    parsen.verwerkt += 1
+                await te_schrijven.put((row_index, product_data))
+                schrijven.meet_wachtrij(te_schrijven)
+        
+        async def _schrijver():
+            verwerkt = 0
+            while True:
+                item = await te_schrijven.get()
+                if item is _EINDE:
+                    return
+                row_index, product_data = item
+                verwerkt += 1
+                
+                start = time.monotonic()
+                try:
+                    gelukt = bool(product_data) and self.schrijf_functie(row_index, product_data)
+                except Exception as e:
+                    logger.logFout(f"Fout bij wegschrijven rij {row_index}: {e}")
+                    gelukt = False
+                schrijven.bezig_tijd += time.monotonic() - start
+                schrijven.verwerkt += 1
+                
+                if gelukt:
+                    statistieken['succesvol'] += 1
+                else:
+                    statistieken['mislukt'] += 1
+                    statistieken['mislukte_rijen'].append(row_index)
+                
+                # Log voortgang periodiek
+                if verwerkt % 25 == 0 or verwerkt == totaal:
+                    logger.logInfo(f"Voortgang: {verwerkt}/{totaal or '?'} producten verwerkt")
+        
+        logger.logInfo(
+            f"Ophalen van {totaal if totaal is not None else 'gevonden'} producten gestart "
+            f"(max {self.max_gelijktijdig} gelijktijdig, {self.parse_werkers} parsers)"
+        )
+        start = time.monotonic()
+        invoerder = asyncio.ensure_future(_invoerder()) if stroom else None
+        ophalers = [asyncio.ensure_future(_ophaal_werker()) for _ in range(aantal_ophalers)]
+        parsers = [asyncio.ensure_future(_parse_werker()) for _ in range(self.parse_werkers)]
+        schrijver = asyncio.ensure_future(_schrijver())
+        
+        try:
+            # Sluit elke stap af zodra de vorige stap klaar is
+            if invoerder is not None:
+                await invoerder
+            await asyncio.gather(*ophalers)
+            for _ in parsers:
+                await te_parsen.put(_EINDE)
+            await asyncio.gather(*parsers)
+            await te_schrijven.put(_EINDE)
+            await schrijver
+        finally:
+            # Ruim openstaande taken op als de verwerking wordt afgebroken
+            for taak in ophalers + parsers + [schrijver] + ([invoerder] if invoerder else []):
+                if not taak.done():
+                    taak.cancel()
+            if eigen_executor:
+                executor.shutdown(wait=False)
+        
+        statistieken['duur'] = time.monotonic() - start
+        statistieken['mislukte_rijen'].sort()
+        for stap in (ophalen, parsen, schrijven):
+            statistieken['stappen'][stap.naam] = stap.samenvatting(statistieken['duur'])
+        self._log_stappen(statistieken['stappen'])
+        return statistieken
+    
+    @staticmethod
+    def _log_stappen(stappen):
+        """Log per stap de doorvoer en wachtrijdiepte en noem de drukste stap"""
+        for naam, stap in stappen.items():
+            logger.logInfo(
+                f"Stap {naam}: {stap['verwerkt']} items, {stap['per_seconde']:.1f}/s, "
+                f"bezetting {stap['bezetting']:.0%}, wachtrij gem. {stap['wachtrij_gem']:.1f} "
+                f"(max {stap['wachtrij_max']})"
+            )
+        drukste = max(stappen, key=lambda naam: stappen[naam]['bezetting'])
+        logger.logInfo(f"Bottleneck: {drukste} (bezetting {stappen[drukste]['bezetting']:.0%})")
@@ -0,0 +1,141 @@
+"""
+Product Parser voor RentPro integratie
+Verantwoordelijk voor het omzetten van een opgehaalde productpagina naar productgegevens
+
+Het parsen staat los van het ophalen: de functies krijgen alleen de HTML en
+geven gewone dictionaries terug. Zo kan het (CPU-intensieve) parsen buiten de
+event loop draaien terwijl de volgende pagina's al worden opgehaald, ook in een
+apart proces (zie parse_pool). Deze module logt daarom niet zelf.
+"""
+import os
+import re
+import time
+import hashlib
+from html import unescape
+from modules.html_backend import maak_soup
+from modules.rentpro.form_index import FormIndex
+
+PRODUCT_IMAGE_PATTERN = re.compile(
+    r'<img\b(?=[^>]*class\s*=\s*["\'][^"\']*product-image)[^>]*src\s*=\s*["\']([^"\']+)["\']',
+    re.IGNORECASE
+)
+
+def parse_product_details(product_id, html, base_url):
+    """
+    Haal de productgegevens uit de Edit (of Details) pagina van een product
+    
+    Args:
+        product_id (str): ID van het product
+        html (str): HTML van de productpagina
+        base_url (str): RentPro URL, om relatieve afbeelding URL's absoluut te maken
+    
+    Returns:
+        dict: Productgegevens
+    """
+    # Parse alleen het productformulier en extraheer productgegevens
+    soup = maak_soup(html, gebied='productformulier')
+    
+    # Indexeer alle velden in één doorloop, daarna is elk veld een opzoeking
+    index = FormIndex(soup)
+    
+    return {
+        'id': product_id,
+        'naam': index.waarde('Product_Name', "Naam"),
+        'code': index.waarde('Product_Productcode', "Productcode"),
+        'url_naam': index.waarde('Product_UrlName', "Product URL"),
+        'beschrijving': index.waarde('Product_Decription', "Omschrijving"),
+        'prijs': index.waarde('ProductPrice', "Prijs") or "0.00",
+        'categorie': index.waarde('Product_CategoryID', "Categorie") or "Onbekend",
+        'voorraad': index.waarde('Stock', "Voorraad") or "0",
+        'afbeelding_url': extract_image_url(soup, base_url) or extract_image_url_from_html(html, base_url),
+        'last_updated': time.strftime("%Y-%m-%d %H:%M:%S"),
+        # Alle formuliervelden op id/naam, voor velden buiten de vaste set
+        'velden': index.velden
+    }
+
+def parse_product_rows(html):
+    """
+    Haal de productrijen uit een pagina van het productoverzicht of de zoekresultaten
+    
+    Args:
+        html (str): HTML van een pagina van het productoverzicht
+    
+    Returns:
+        list: Lijst van producten als dictionaries met 'id', 'naam' en 'hash' (vingerafdruk
+            van de hele rij, om wijzigingen te herkennen) sleutels
+            (leeg als er geen producttabel, productlijst of productrijen zijn)
+    """
+    # Parse alleen de producten tabel, niet de volledige pagina
+    soup = maak_soup(html, gebied='producttabel')
+    
+    # Zoek de producten tabel (heeft class noBold gvItems)
+    product_table = soup.select_one('table.gvItems') or soup.select_one('table.noBold')
+    if not product_table:
+        # Zoekresultaten als lijst: elementen met een data-product-id attribuut
+        products = []
+        for item in soup.select('[data-product-id]'):
+            tekst = item.get_text(' ', strip=True)
+            if item['data-product-id'].strip():
+                products.append({'id': item['data-product-id'].strip(), 'naam': tekst, 'hash': _rij_hash([tekst])})
+        return products
+    
+    # Extraheer product IDs en namen uit de rijen (alternating even/oneven classes)
+    products = []
+    for row in product_table.select('tr.even, tr.oneven'):
+        cells = row.select('td')
+        if len(cells) < 4:
+            continue
+        
+        # Eerste kolom (0) bevat ID, vierde kolom (3) bevat naam, eventueel in een <a> tag
+        product_id_cell = cells[0]
+        product_name_cell = cells[3]
+        product_id = product_id_cell.get_text(strip=True)
+        product_name = product_name_cell.get_text(strip=True)
+        
+        if not product_id and product_id_cell.find('a'):
+            product_id = product_id_cell.find('a').get_text(strip=True)
+        if not product_name and product_name_cell.find('a'):
+            product_name = product_name_cell.find('a').get_text(strip=True)
+        
+        if product_id and product_name:
+            products.append({
+                'id': product_id,
+                'naam': product_name,
+                'hash': _rij_hash(cell.get_text(strip=True) for cell in cells)
+            })
+    
+    return products
+
+def _rij_hash(teksten):
+    """Vingerafdruk van de teksten van een rij uit het overzicht"""
+    return hashlib.sha1('\x1f'.join(teksten).encode('utf-8')).hexdigest()
+
+def extract_image_url(soup, base_url):
+    """Zoek de productafbeelding in de geparste pagina"""
+    try:
+        img = soup.select_one('img.product-image') or soup.select_one('.product-details img')
+        if img and img.has_attr('src'):
+            return _maak_absoluut(img['src'], base_url)
+        return ""
+    except Exception:
+        return ""
+
+def extract_image_url_from_html(html, base_url):
+    """Zoek de productafbeelding als deze buiten het productformulier staat"""
+    try:
+        match = PRODUCT_IMAGE_PATTERN.search(html)
+        if not match:
+            return ""
+        return _maak_absoluut(unescape(match.group(1)), base_url)
+    except Exception:
+        return ""
+
+def _maak_absoluut(src, base_url):
+    """Maak een relatieve URL absoluut"""
+    if src.startswith('/'):
+        return f"{base_url}{src}"
+    return src
+
+def opwarmen(_=None):
+    """Lege taak waarmee de parse pool een werkproces opstart en deze module laadt"""
+    return os.getpid()
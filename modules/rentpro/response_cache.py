@@ -0,0 +1,216 @@
+"""
+Response Cache voor RentPro integratie
+Verantwoordelijk voor het lokaal bewaren van opgehaalde RentPro pagina's
+
+De cache staat in een SQLite bestand op schijf, zodat hij een herstart overleeft.
+Elke pagina wordt opgeslagen per URL en sessie (RentPro URL + gebruiker), met de
+ETag/Last-Modified validators van de server. Binnen de TTL wordt een pagina
+direct lokaal geserveerd; daarna wordt hij met een conditioneel verzoek
+gevalideerd. Als de cache groter wordt dan toegestaan worden de minst recent
+gebruikte pagina's verwijderd (LRU).
+"""
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from modules.logger import logger
+
+class ResponseCache:
+    """
+    Persistente HTTP response cache met TTL, revalidatie en LRU begrenzing
+    """
+    
+    def __init__(self, pad='cache/rentpro_http.sqlite', ttl=3600, max_grootte_mb=200):
+        """
+        Initialiseer de response cache
+        
+        Args:
+            pad (str): Pad naar het SQLite cachebestand
+            ttl (int): Seconden dat een pagina zonder revalidatie geserveerd wordt
+            max_grootte_mb (int): Maximale totale grootte van de opgeslagen pagina's in MB
+        """
+        self.pad = pad
+        self.ttl = ttl
+        self.max_grootte = int(max_grootte_mb * 1024 * 1024)
+        self.statistieken = {'hits': 0, 'gevalideerd': 0, 'missers': 0}
+        self._lock = threading.Lock()
+        
+        map_pad = os.path.dirname(pad)
+        if map_pad and not os.path.exists(map_pad):
+            os.makedirs(map_pad)
+        
+        self._db = sqlite3.connect(pad, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                sleutel TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                grootte INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                opgeslagen_op REAL NOT NULL,
+                laatst_gebruikt REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_laatst_gebruikt ON responses (laatst_gebruikt)")
+        self._db.commit()
+        
+        # Houd de totale grootte bij zodat niet bij elke insert opnieuw geteld hoeft te worden
+        self._totale_grootte = self._db.execute("SELECT COALESCE(SUM(grootte), 0) FROM responses").fetchone()[0]
+    
+    @staticmethod
+    def _maak_sleutel(url, sessie_sleutel):
+        """Bepaal de cachesleutel voor een URL binnen een sessie"""
+        return hashlib.sha256(f"{sessie_sleutel}\n{url}".encode('utf-8')).hexdigest()
+    
+    def haal_op(self, url, sessie_sleutel):
+        """
+        Zoek een pagina in de cache
+        
+        Args:
+            url (str): URL van de pagina
+            sessie_sleutel (str): Sleutel van de sessie (RentPro URL + gebruiker)
+        
+        Returns:
+            dict: {'body', 'etag', 'last_modified', 'vers'} of None als de pagina niet in de cache staat
+        """
+        try:
+            sleutel = self._maak_sleutel(url, sessie_sleutel)
+            with self._lock:
+                rij = self._db.execute(
+                    "SELECT body, etag, last_modified, opgeslagen_op FROM responses WHERE sleutel = ?",
+                    (sleutel,)
+                ).fetchone()
+                if rij is None:
+                    return None
+                
+                # Markeer als recent gebruikt voor de LRU volgorde
+                self._db.execute(
+                    "UPDATE responses SET laatst_gebruikt = ? WHERE sleutel = ?",
+                    (time.time(), sleutel)
+                )
+                self._db.commit()
+            
+            body, etag, last_modified, opgeslagen_op = rij
+            return {
+                'body': zlib.decompress(body).decode('utf-8'),
+                'etag': etag,
+                'last_modified': last_modified,
+                'vers': (time.time() - opgeslagen_op) < self.ttl
+            }
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij lezen uit response cache: {e}")
+            return None
+    
+    def sla_op(self, url, sessie_sleutel, body, headers=None):
+        """
+        Sla een pagina op in de cache
+        
+        Args:
+            url (str): URL van de pagina
+            sessie_sleutel (str): Sleutel van de sessie (RentPro URL + gebruiker)
+            body (str): Inhoud van de pagina
+            headers (dict, optional): Response headers (voor ETag en Last-Modified)
+        """
+        try:
+            headers = headers or {}
+            gecomprimeerd = zlib.compress(body.encode('utf-8'))
+            nu = time.time()
+            sleutel = self._maak_sleutel(url, sessie_sleutel)
+            with self._lock:
+                oud = self._db.execute("SELECT grootte FROM responses WHERE sleutel = ?", (sleutel,)).fetchone()
+                if oud:
+                    self._totale_grootte -= oud[0]
+                self._db.execute(
+                    """
+                    INSERT OR REPLACE INTO responses
+                        (sleutel, url, body, grootte, etag, last_modified, opgeslagen_op, laatst_gebruikt)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        sleutel,
+                        url,
+                        gecomprimeerd,
+                        len(gecomprimeerd),
+                        headers.get('ETag'),
+                        headers.get('Last-Modified'),
+                        nu,
+                        nu
+                    )
+                )
+                self._totale_grootte += len(gecomprimeerd)
+                self._handhaaf_grootte()
+                self._db.commit()
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij schrijven naar response cache: {e}")
+    
+    def ververs(self, url, sessie_sleutel):
+        """
+        Markeer een pagina als opnieuw gevalideerd (na een 304 Not Modified)
+        
+        Args:
+            url (str): URL van de pagina
+            sessie_sleutel (str): Sleutel van de sessie (RentPro URL + gebruiker)
+        """
+        try:
+            nu = time.time()
+            with self._lock:
+                self._db.execute(
+                    "UPDATE responses SET opgeslagen_op = ?, laatst_gebruikt = ? WHERE sleutel = ?",
+                    (nu, nu, self._maak_sleutel(url, sessie_sleutel))
+                )
+                self._db.commit()
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij verversen response cache: {e}")
+    
+    def verwijder(self, url, sessie_sleutel):
+        """
+        Verwijder een pagina uit de cache, bijvoorbeeld nadat het product gewijzigd is
+        
+        Args:
+            url (str): URL van de pagina
+            sessie_sleutel (str): Sleutel van de sessie (RentPro URL + gebruiker)
+        """
+        try:
+            sleutel = self._maak_sleutel(url, sessie_sleutel)
+            with self._lock:
+                oud = self._db.execute("SELECT grootte FROM responses WHERE sleutel = ?", (sleutel,)).fetchone()
+                if oud:
+                    self._db.execute("DELETE FROM responses WHERE sleutel = ?", (sleutel,))
+                    self._totale_grootte -= oud[0]
+                    self._db.commit()
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij verwijderen uit response cache: {e}")
+    
+    def _handhaaf_grootte(self):
+        """Verwijder de minst recent gebruikte pagina's tot de cache binnen de limiet valt"""
+        if self._totale_grootte <= self.max_grootte:
+            return
+        
+        verwijderd = 0
+        for sleutel, grootte in self._db.execute(
+            "SELECT sleutel, grootte FROM responses ORDER BY laatst_gebruikt ASC"
+        ).fetchall():
+            if self._totale_grootte <= self.max_grootte:
+                break
+            self._db.execute("DELETE FROM responses WHERE sleutel = ?", (sleutel,))
+            self._totale_grootte -= grootte
+            verwijderd += 1
+        
+        logger.logInfo(f"Response cache opgeschoond: {verwijderd} pagina's verwijderd")
+    
+    def leeg(self):
+        """Verwijder alle pagina's uit de cache"""
+        try:
+            with self._lock:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+                self._totale_grootte = 0
+            logger.logInfo("Response cache geleegd")
+        except Exception as e:
+            logger.logFout(f"Fout bij legen response cache: {e}")
@@ -0,0 +1,158 @@
+"""
+Retry beleid voor RentPro integratie
+Verantwoordelijk voor het opnieuw proberen van mislukte verzoeken
+
+Tijdelijke fouten (timeouts, verbroken verbindingen, 5xx en 429 antwoorden) worden
+opnieuw geprobeerd met exponentieel oplopende wachttijd en willekeurige spreiding
+(jitter), zodat gelijktijdige verzoeken niet tegelijk terugkomen. Per foutsoort
+geldt een eigen maximum aantal pogingen. Een Retry-After header van de server
+wordt gerespecteerd.
+
+Verzoeken die niet zonder gevolgen herhaald kunnen worden (zoals het aanmaken
+van een product) worden alleen opnieuw geprobeerd als zeker is dat de server
+het verzoek niet verwerkt heeft: de verbinding kwam niet tot stand of de server
+weigerde het verzoek (429/503).
+"""
+import asyncio
+import random
+import aiohttp
+from modules.logger import logger
+
+try:
+    import httpx
+    # Fouten van de optionele HTTP/2 transport, ingedeeld zoals de aiohttp fouten
+    HTTPX_GEEN_VERBINDING = (httpx.ConnectError, httpx.ConnectTimeout)
+    HTTPX_TIMEOUT = (httpx.TimeoutException,)
+    HTTPX_VERBINDING = (httpx.NetworkError, httpx.RemoteProtocolError)
+except ImportError:
+    HTTPX_GEEN_VERBINDING = HTTPX_TIMEOUT = HTTPX_VERBINDING = ()
+
+# Foutsoorten met het standaard aantal herhalingen
+STANDAARD_MAX_HERHALINGEN = {
+    'timeout': 3,
+    'verbinding': 3,
+    'server': 4,
+    'te_veel_verzoeken': 5,
+    'sessie': 2,
+}
+
+# Statuscodes die op een tijdelijk probleem bij de server wijzen
+TIJDELIJKE_STATUSCODES = {500, 502, 503, 504}
+
+# Statuscodes waarbij de server het verzoek zeker niet verwerkt heeft
+GEWEIGERDE_STATUSCODES = {429, 503}
+
+def classificeer_fout(fout, herhaalbaar=True):
+    """
+    Bepaal de foutsoort van een exceptie
+    
+    Args:
+        fout (Exception): De opgetreden fout
+        herhaalbaar (bool): False voor verzoeken die niet veilig dubbel uitgevoerd kunnen worden
+    
+    Returns:
+        str: Foutsoort uit STANDAARD_MAX_HERHALINGEN of None als de fout niet tijdelijk is
+    """
+    if not herhaalbaar:
+        # Alleen als de verbinding niet tot stand kwam is het verzoek zeker niet aangekomen
+        geen_verbinding = (aiohttp.ClientConnectorError,) + HTTPX_GEEN_VERBINDING
+        return 'verbinding' if isinstance(fout, geen_verbinding) else None
+    if isinstance(fout, (asyncio.TimeoutError,) + HTTPX_TIMEOUT):
+        return 'timeout'
+    if isinstance(fout, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) + HTTPX_VERBINDING):
+        return 'verbinding'
+    return None
+
+def classificeer_status(status_code, herhaalbaar=True):
+    """
+    Bepaal de foutsoort van een HTTP statuscode
+    
+    Args:
+        status_code (int): HTTP statuscode
+        herhaalbaar (bool): False voor verzoeken die niet veilig dubbel uitgevoerd kunnen worden
+    
+    Returns:
+        str: Foutsoort of None als het antwoord niet opnieuw geprobeerd hoeft te worden
+    """
+    if not herhaalbaar and status_code not in GEWEIGERDE_STATUSCODES:
+        return None
+    if status_code == 429:
+        return 'te_veel_verzoeken'
+    if status_code in TIJDELIJKE_STATUSCODES:
+        return 'server'
+    return None
+
+class RetryBeleid:
+    """
+    Exponentiële backoff met jitter en een maximum aantal herhalingen per foutsoort
+    """
+    
+    def __init__(self, max_herhalingen=None, basis_vertraging=0.5, max_vertraging=30.0):
+        """
+        Initialiseer het retry beleid
+        
+        Args:
+            max_herhalingen (dict, optional): Maximum aantal herhalingen per foutsoort
+            basis_vertraging (float): Wachttijd in seconden voor de eerste herhaling
+            max_vertraging (float): Maximale wachttijd in seconden tussen twee pogingen
+        """
+        self.max_herhalingen = dict(STANDAARD_MAX_HERHALINGEN)
+        if max_herhalingen:
+            self.max_herhalingen.update(max_herhalingen)
+        self.basis_vertraging = basis_vertraging
+        self.max_vertraging = max_vertraging
+        self.statistieken = {soort: 0 for soort in self.max_herhalingen}
+    
+    def mag_herhalen(self, soort, pogingen):
+        """
+        Controleer of een verzoek na een fout nog een keer geprobeerd mag worden
+        
+        Args:
+            soort (str): Foutsoort
+            pogingen (dict): Aantal herhalingen per foutsoort voor dit verzoek tot nu toe
+        
+        Returns:
+            bool: True als er nog een herhaling over is
+        """
+        return pogingen.get(soort, 0) < self.max_herhalingen.get(soort, 0)
+    
+    def vertraging(self, herhaling, retry_after=None):
+        """
+        Bereken de wachttijd voor een herhaling ("full jitter")
+        
+        Args:
+            herhaling (int): Nummer van de herhaling (0 voor de eerste)
+            retry_after (str, optional): Waarde van de Retry-After header
+        
+        Returns:
+            float: Wachttijd in seconden
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_vertraging)
+            except ValueError:
+                # Retry-After als datum wordt niet ondersteund, val terug op backoff
+                pass
+        bovengrens = min(self.max_vertraging, self.basis_vertraging * (2 ** herhaling))
+        return random.uniform(0, bovengrens)
+    
+    async def wacht(self, soort, pogingen, beschrijving, retry_after=None):
+        """
+        Registreer een herhaling en wacht de bijbehorende tijd
+        
+        Args:
+            soort (str): Foutsoort
+            pogingen (dict): Aantal herhalingen per foutsoort voor dit verzoek (wordt bijgewerkt)
+            beschrijving (str): Omschrijving van het verzoek voor de log
+            retry_after (str, optional): Waarde van de Retry-After header
+        """
+        herhaling = sum(pogingen.values())
+        pogingen[soort] = pogingen.get(soort, 0) + 1
+        self.statistieken[soort] = self.statistieken.get(soort, 0) + 1
+        
+        wachttijd = self.vertraging(herhaling, retry_after)
+        logger.logWaarschuwing(
+            f"{beschrijving}: {soort}, nieuwe poging {pogingen[soort]}/{self.max_herhalingen[soort]} "
+            f"over {wachttijd:.1f} seconden"
+        )
+        await asyncio.sleep(wachttijd)
@@ -0,0 +1,126 @@
+"""
+Session Store voor RentPro integratie
+Verantwoordelijk voor het bewaren van een ingelogde RentPro sessie tussen herstarts
+
+Na een geslaagde login worden de cookies en het verificatie token per RentPro URL
+en gebruiker in een JSON bestand opgeslagen. Bij een volgende start worden ze
+teruggezet, zodat de volledige login (loginpagina ophalen, token uitlezen,
+inloggegevens posten) overgeslagen kan worden. Wachtwoorden worden hier nooit
+opgeslagen.
+"""
+import os
+import json
+import time
+import threading
+from modules.logger import logger
+
+class SessionStore:
+    """
+    Persistente opslag van sessiecookies en verificatie tokens
+    """
+    
+    def __init__(self, pad='cache/rentpro_sessie.json', max_leeftijd=43200):
+        """
+        Initialiseer de session store
+        
+        Args:
+            pad (str): Pad naar het JSON bestand met opgeslagen sessies
+            max_leeftijd (int): Seconden dat een opgeslagen sessie hergebruikt mag worden
+        """
+        self.pad = pad
+        self.max_leeftijd = max_leeftijd
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _maak_sleutel(base_url, gebruikersnaam):
+        """Bepaal de sleutel van een sessie"""
+        return f"{base_url.rstrip('/')}|{gebruikersnaam}"
+    
+    def _lees(self):
+        """Lees alle opgeslagen sessies uit het bestand"""
+        if not os.path.exists(self.pad):
+            return {}
+        with open(self.pad, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _schrijf(self, sessies):
+        """Schrijf alle sessies atomisch naar het bestand (alleen leesbaar voor de gebruiker)"""
+        map_pad = os.path.dirname(self.pad)
+        if map_pad and not os.path.exists(map_pad):
+            os.makedirs(map_pad)
+        
+        tijdelijk_pad = f"{self.pad}.tmp"
+        descriptor = os.open(tijdelijk_pad, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(sessies, f)
+        os.replace(tijdelijk_pad, self.pad)
+    
+    def laad(self, base_url, gebruikersnaam):
+        """
+        Laad een opgeslagen sessie
+        
+        Args:
+            base_url (str): RentPro URL
+            gebruikersnaam (str): Gebruikersnaam van de sessie
+        
+        Returns:
+            dict: {'cookies', 'csrf_token', 'opgeslagen_op'} of None als er geen bruikbare sessie is
+        """
+        try:
+            with self._lock:
+                sessie = self._lees().get(self._maak_sleutel(base_url, gebruikersnaam))
+            
+            if not sessie or not sessie.get('cookies'):
+                return None
+            
+            if time.time() - sessie.get('opgeslagen_op', 0) > self.max_leeftijd:
+                logger.logInfo("Opgeslagen sessie is verlopen, opnieuw inloggen nodig")
+                return None
+            
+            return sessie
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij laden opgeslagen sessie: {e}")
+            return None
+    
+    def sla_op(self, base_url, gebruikersnaam, cookies, csrf_token):
+        """
+        Sla een ingelogde sessie op
+        
+        Args:
+            base_url (str): RentPro URL
+            gebruikersnaam (str): Gebruikersnaam van de sessie
+            cookies (list): Cookies als dictionaries (zie AsyncTransport.exporteer_cookies)
+            csrf_token (str): Verificatie token van de login
+        
+        Returns:
+            bool: True als opslaan succesvol was, anders False
+        """
+        try:
+            with self._lock:
+                sessies = self._lees()
+                sessies[self._maak_sleutel(base_url, gebruikersnaam)] = {
+                    'cookies': cookies,
+                    'csrf_token': csrf_token,
+                    'opgeslagen_op': time.time()
+                }
+                self._schrijf(sessies)
+            return True
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij opslaan sessie: {e}")
+            return False
+    
+    def verwijder(self, base_url, gebruikersnaam):
+        """
+        Verwijder een opgeslagen sessie, bijvoorbeeld als deze niet meer geldig is
+        
+        Args:
+            base_url (str): RentPro URL
+            gebruikersnaam (str): Gebruikersnaam van de sessie
+        """
+        try:
+            with self._lock:
+                sessies = self._lees()
+                if sessies.pop(self._maak_sleutel(base_url, gebruikersnaam), None) is not None:
+                    self._schrijf(sessies)
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij verwijderen opgeslagen sessie: {e}")
@@ -0,0 +1,116 @@
+"""
+Single Flight voor RentPro integratie
+Verantwoordelijk voor het samenvoegen van gelijktijdige verzoeken voor hetzelfde product
+
+Een sheet bevat vaak hetzelfde ProductID op meerdere rijen (varianten, kopieën).
+Zonder samenvoegen haalt elke rij dezelfde pagina opnieuw op. Met SingleFlight
+delen gelijktijdige aanvragen voor dezelfde sleutel één lopend verzoek, en houdt
+een geheugen per run (memo) het resultaat vast voor rijen die later nog volgen.
+
+Het geheugen bevat alleen sleutels die in de run meer dan eens voorkomen en laat
+een resultaat los zodra de laatste rij met die sleutel het heeft opgehaald.
+"""
+import asyncio
+from collections import Counter
+
+class SingleFlight:
+    """
+    Deelt één lopend verzoek per sleutel en onthoudt resultaten binnen een run
+    """
+    
+    def __init__(self):
+        """Initialiseer zonder actieve run (er wordt dan niets onthouden)"""
+        self._lopend = {}
+        self._memo = None
+        self._verwacht = None
+        self._gebruik = Counter()
+        self.statistieken = {'opgehaald': 0, 'gedeeld': 0, 'uit_memo': 0}
+    
+    def start_run(self, sleutels=None):
+        """
+        Start een run: resultaten worden vanaf nu onthouden tot einde_run
+        
+        Args:
+            sleutels (iterable, optional): Alle sleutels die de run gaat opvragen (ook dubbele).
+                Alleen sleutels die vaker voorkomen worden onthouden; zonder sleutels wordt
+                elk resultaat onthouden tot het einde van de run.
+        """
+        self._memo = {}
+        self._gebruik = Counter()
+        self._verwacht = None
+        if sleutels is not None:
+            aantallen = Counter(self._sleutel(sleutel) for sleutel in sleutels)
+            self._verwacht = {sleutel: aantal for sleutel, aantal in aantallen.items() if aantal > 1}
+        self.statistieken = {'opgehaald': 0, 'gedeeld': 0, 'uit_memo': 0}
+    
+    def einde_run(self):
+        """
+        Beëindig de run en vergeet alle onthouden resultaten
+        
+        Returns:
+            dict: Statistieken met 'opgehaald', 'gedeeld' (meegelift op een lopend verzoek)
+                en 'uit_memo' (uit het geheugen van de run)
+        """
+        self._memo = None
+        self._verwacht = None
+        self._gebruik = Counter()
+        return dict(self.statistieken)
+    
+    async def uitvoeren(self, sleutel, functie, *args):
+        """
+        Voer functie(*args) uit, tenzij er al een resultaat of lopend verzoek voor de sleutel is
+        
+        Args:
+            sleutel: Sleutel van het verzoek (bijv. het product ID)
+            functie (callable): Async functie die het resultaat ophaalt
+            *args: Argumenten voor de functie
+        
+        Returns:
+            Het (gedeelde) resultaat van de functie
+        """
+        sleutel = self._sleutel(sleutel)
+        if self._memo is not None:
+            self._gebruik[sleutel] += 1
+        
+        if self._memo is not None and sleutel in self._memo:
+            self.statistieken['uit_memo'] += 1
+            resultaat = self._memo[sleutel]
+            if not self._nog_nodig(sleutel):
+                del self._memo[sleutel]
+            return resultaat
+        
+        # Een taak van een eerdere (afgesloten) event loop kan niet meer gedeeld worden
+        taak = self._lopend.get(sleutel)
+        if taak is not None and taak.get_loop() is asyncio.get_running_loop():
+            self.statistieken['gedeeld'] += 1
+        else:
+            self.statistieken['opgehaald'] += 1
+            taak = asyncio.ensure_future(functie(*args))
+            self._lopend[sleutel] = taak
+            taak.add_done_callback(lambda klaar: self._afgerond(sleutel, klaar))
+        
+        # Shield: als één aanvrager wordt afgebroken, loopt het verzoek door voor de anderen
+        return await asyncio.shield(taak)
+    
+    def _afgerond(self, sleutel, taak):
+        """Ruim het lopende verzoek op en onthoud het resultaat als andere rijen het nog nodig hebben"""
+        if self._lopend.get(sleutel) is taak:
+            del self._lopend[sleutel]
+        if taak.cancelled() or taak.exception() is not None:
+            return
+        
+        # Mislukte verzoeken (None) worden niet onthouden, zodat een volgende rij het opnieuw probeert
+        resultaat = taak.result()
+        if self._memo is not None and resultaat is not None and self._nog_nodig(sleutel):
+            self._memo[sleutel] = resultaat
+    
+    def _nog_nodig(self, sleutel):
+        """Of er in deze run nog aanvragen voor de sleutel verwacht worden"""
+        if self._verwacht is None:
+            return True
+        return self._gebruik[sleutel] < self._verwacht.get(sleutel, 0)
+    
+    @staticmethod
+    def _sleutel(sleutel):
+        """Normaliseer de sleutel, zodat 123 en '123' hetzelfde verzoek zijn"""
+        return str(sleutel).strip()
@@ -0,0 +1,150 @@
+"""
+Snapshot Store voor RentPro integratie
+Verantwoordelijk voor het bewaren van de laatst gesynchroniseerde stand per product en veld
+
+Bij een synchronisatie tussen de sheet en RentPro is de laatst gesynchroniseerde
+waarde de gemeenschappelijke basis: een veld dat alleen in de sheet afwijkt van de
+basis is lokaal gewijzigd, een veld dat alleen in RentPro afwijkt is op de server
+gewijzigd. Naast de veldwaarden wordt per product de vingerafdruk van de rij in het
+productoverzicht bewaard; is die ongewijzigd, dan is het product in RentPro sinds
+de vorige synchronisatie niet veranderd en hoeft de detailpagina niet opgehaald te
+worden.
+"""
+import os
+import time
+import sqlite3
+import threading
+from modules.logger import logger
+
+# SQLite staat maximaal 999 parameters per query toe (oudere versies)
+MAX_PARAMETERS = 900
+
+class SnapshotStore:
+    """
+    SQLite opslag van de laatst gesynchroniseerde veldwaarden per product
+    """
+    
+    def __init__(self, pad='cache/rentpro_snapshot.sqlite'):
+        """
+        Initialiseer de opslag
+        
+        Args:
+            pad (str): Pad naar het SQLite bestand
+        """
+        self.pad = pad
+        self._lock = threading.Lock()
+        
+        map_pad = os.path.dirname(pad)
+        if map_pad and not os.path.exists(map_pad):
+            os.makedirs(map_pad)
+        
+        self._db = sqlite3.connect(pad, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS producten (
+                bron TEXT NOT NULL,
+                product_id TEXT NOT NULL,
+                lijst_hash TEXT,
+                gesynct_op REAL NOT NULL,
+                PRIMARY KEY (bron, product_id)
+            )
+            """
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS velden (
+                bron TEXT NOT NULL,
+                product_id TEXT NOT NULL,
+                veld_id TEXT NOT NULL,
+                waarde TEXT NOT NULL,
+                PRIMARY KEY (bron, product_id, veld_id)
+            )
+            """
+        )
+        self._db.commit()
+    
+    def laad(self, bron, product_ids):
+        """
+        Haal de snapshots van een reeks producten op
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            product_ids (iterable): Product IDs
+        
+        Returns:
+            dict: product_id -> {'lijst_hash': str of None, 'velden': dict veld_id -> waarde};
+                producten zonder snapshot ontbreken
+        """
+        ids = list({str(product_id) for product_id in product_ids})
+        snapshots = {}
+        try:
+            with self._lock:
+                for begin in range(0, len(ids), MAX_PARAMETERS):
+                    deel = ids[begin:begin + MAX_PARAMETERS]
+                    plaatsen = ','.join('?' * len(deel))
+                    for product_id, lijst_hash in self._db.execute(
+                        f"SELECT product_id, lijst_hash FROM producten WHERE bron = ? AND product_id IN ({plaatsen})",
+                        (bron, *deel)
+                    ):
+                        snapshots[product_id] = {'lijst_hash': lijst_hash, 'velden': {}}
+                    for product_id, veld_id, waarde in self._db.execute(
+                        f"SELECT product_id, veld_id, waarde FROM velden WHERE bron = ? AND product_id IN ({plaatsen})",
+                        (bron, *deel)
+                    ):
+                        if product_id in snapshots:
+                            snapshots[product_id]['velden'][veld_id] = waarde
+            return snapshots
+        except Exception as e:
+            logger.logWaarschuwing(f"Fout bij lezen sync snapshots: {e}")
+            return {}
+    
+    def sla_op(self, bron, snapshots):
+        """
+        Leg de nieuwe gesynchroniseerde stand van een reeks producten vast (in één transactie)
+        
+        Args:
+            bron (str): Basis URL van de RentPro omgeving
+            snapshots (dict): product_id -> {'lijst_hash': str of None, 'velden': dict veld_id -> waarde};
+                alleen de opgegeven velden worden bijgewerkt, andere velden houden hun basis
+        
+        Returns:
+            bool: True als de snapshots zijn opgeslagen
+        """
+        try:
+            nu = time.time()
+            with self._lock:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO producten (bron, product_id, lijst_hash, gesynct_op) VALUES (?, ?, ?, ?)",
+                    [(bron, str(product_id), snapshot.get('lijst_hash'), nu) for product_id, snapshot in snapshots.items()]
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO velden (bron, product_id, veld_id, waarde) VALUES (?, ?, ?, ?)",
+                    [
+                        (bron, str(product_id), veld_id, str(waarde))
+                        for product_id, snapshot in snapshots.items()
+                        for veld_id, waarde in snapshot.get('velden', {}).items()
+                    ]
+                )
+                self._db.commit()
+            return True
+        except Exception as e:
+            logger.logFout(f"Fout bij opslaan sync snapshots: {e}")
+            with self._lock:
+                self._db.rollback()
+            return False
+    
+    def leeg(self, bron=None):
+        """Vergeet alle snapshots (of alleen die van één RentPro omgeving); de volgende sync begint opnieuw"""
+        try:
+            with self._lock:
+                if bron is None:
+                    self._db.execute("DELETE FROM producten")
+                    self._db.execute("DELETE FROM velden")
+                else:
+                    self._db.execute("DELETE FROM producten WHERE bron = ?", (bron,))
+                    self._db.execute("DELETE FROM velden WHERE bron = ?", (bron,))
+                self._db.commit()
+            logger.logInfo("Sync snapshots gewist")
+        except Exception as e:
+            logger.logFout(f"Fout bij wissen sync snapshots: {e}")
@@ -0,0 +1,545 @@
+"""
+Stand-in Server voor RentPro integratie
+Verantwoordelijk voor het lokaal nabootsen van RentPro voor load tests en offline ontwikkeling
+
+De server bootst de pagina's na die de API handler gebruikt: de loginpagina met
+verificatie token, het productoverzicht (gepagineerde tabel met zoeken) en het Product/Edit
+formulier, inclusief het posten van formulieren. Zo doorlopen tests en benchmarks
+dezelfde code als tegen de echte server (login, cookies, paginering, parsen,
+uploaden), zonder RentPro te belasten.
+
+Vertraging, foutkans, sessieduur, compressie en de grootte van de catalogus zijn instelbaar.
+De server gebruikt aiohttp (al een vereiste voor de transport laag).
+
+Gebruik:
+    python -m modules.rentpro.stand_in_server --poort 8080 --producten 5000 --vertraging 0.05
+
+Daarna inloggen met rentproHandler.login(gebruiker, wachtwoord, "http://127.0.0.1:8080").
+"""
+import time
+import uuid
+import random
+import hashlib
+import asyncio
+import argparse
+from html import escape
+from urllib.parse import urlencode
+from collections import Counter
+from aiohttp import web
+
+# Standaard inloggegevens; None accepteert elke gebruiker en elk wachtwoord
+STANDAARD_GEBRUIKER = None
+STANDAARD_WACHTWOORD = None
+
+SESSIE_COOKIE = '.ASPXAUTH'
+
+# Keuzelijsten op het productformulier (waarde, tekst)
+CATEGORIEEN = [('1', 'Licht'), ('2', 'Geluid'), ('3', 'Podium'), ('4', 'Meubilair'), ('5', 'Decoratie')]
+BTW_TARIEVEN = [('21', '21%'), ('9', '9%'), ('0', '0%')]
+
+# Tekstvelden op het productformulier: (id, name, label)
+TEKSTVELDEN = [
+    ('Product_Name', 'Product.Name', 'Productnaam'),
+    ('Product_Title', 'Product.Title', 'Producttitel productpagina'),
+    ('Product_Productcode', 'Product.Productcode', 'Productcode'),
+    ('Product_UrlName', 'Product.UrlName', 'Product URL'),
+    ('Product_Type', 'Product.Type', 'Type'),
+    ('ProductPrice', 'ProductPrice', 'Prijs'),
+    ('Newvalue', 'Newvalue', 'Inkoopprijs'),
+    ('Stock', 'Stock', 'Voorraad'),
+    ('Product_MinimumOrderingAmount', 'Product.MinimumOrderingAmount', 'Minimale bestelhoeveelheid'),
+    ('metatitle', 'metatitle', 'SEO titel'),
+]
+TEKSTVAKKEN = [
+    ('Product_Decription', 'Product.Decription', 'Omschrijving'),
+    ('Product_DecriptionShort', 'Product.DecriptionShort', 'Omschrijving overzichtpagina'),
+]
+KEUZELIJSTEN = [
+    ('Product_CategoryID', 'Product.CategoryID', 'Categorie', CATEGORIEEN),
+    ('VatVal', 'VatVal', 'BTW percentage', BTW_TARIEVEN),
+]
+VINKVAKJES = [
+    ('Product_Active', 'Product.Active', 'Product tonen op webshop'),
+    ('EndlessStock', 'EndlessStock', 'Oneindige voorraad'),
+]
+
+class StandInServer:
+    """
+    Lokale nabootsing van de RentPro pagina's die de API handler gebruikt
+    """
+    
+    def __init__(self, producten=500, per_pagina=50, vertraging=0.0, spreiding=0.0, foutkans=0.0,
+                 foutcode=503, sessie_duur=None, opvulling_kb=30, gebruikersnaam=STANDAARD_GEBRUIKER,
+                 wachtwoord=STANDAARD_WACHTWOORD, seed=1, compressie=True, token_duur=None):
+        """
+        Initialiseer de server en genereer de catalogus
+        
+        Args:
+            producten (int): Aantal producten in de catalogus
+            per_pagina (int): Aantal producten per pagina van het productoverzicht
+            vertraging (float): Vaste vertraging per verzoek in seconden
+            spreiding (float): Extra willekeurige vertraging per verzoek (0 tot spreiding seconden)
+            foutkans (float): Kans (0-1) dat een verzoek met foutcode beantwoord wordt
+            foutcode (int): HTTP status voor gesimuleerde fouten
+            sessie_duur (float, optional): Seconden dat een sessie geldig blijft, None voor onbeperkt
+            opvulling_kb (int): Grootte van het menu buiten het formulier, zodat pagina's realistisch groot zijn
+            gebruikersnaam (str, optional): Vereiste gebruikersnaam, None accepteert iedereen
+            wachtwoord (str, optional): Vereist wachtwoord, None accepteert elk wachtwoord
+            seed (int): Startwaarde voor de gegenereerde catalogus en de foutkans
+            compressie (bool): Comprimeer pagina's als de client daarom vraagt (Accept-Encoding)
+            token_duur (float, optional): Seconden dat een verificatie token geldig blijft, None voor onbeperkt
+        """
+        self.per_pagina = max(1, int(per_pagina))
+        self.vertraging = max(0.0, float(vertraging))
+        self.spreiding = max(0.0, float(spreiding))
+        self.foutkans = min(1.0, max(0.0, float(foutkans)))
+        self.foutcode = int(foutcode)
+        self.sessie_duur = sessie_duur
+        self.gebruikersnaam = gebruikersnaam
+        self.wachtwoord = wachtwoord
+        self.compressie = compressie
+        self.token_duur = token_duur
+        self._random = random.Random(seed)
+        
+        self.catalogus = {}
+        self._versies = {}
+        self._sessies = {}
+        self._tokens = {}
+        self._volgende_id = 1
+        self._runner = None
+        self.url = None
+        self.statistieken = Counter()
+        
+        self._opvulling = self._maak_opvulling(int(opvulling_kb))
+        for _ in range(int(producten)):
+            self._voeg_product_toe(self._genereer_product(self._volgende_id))
+    
+    async def __aenter__(self):
+        """Start de server bij gebruik als async context manager"""
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *_):
+        """Stop de server aan het einde van het with blok"""
+        await self.stop()
+    
+    async def start(self, host='127.0.0.1', poort=0):
+        """
+        Start de server op de huidige event loop
+        
+        Args:
+            host (str): Adres om op te luisteren
+            poort (int): Poort, 0 kiest een vrije poort
+        
+        Returns:
+            str: Base URL van de server (zonder slash aan het eind)
+        """
+        self._runner = web.AppRunner(self.maak_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, poort).start()
+        poort = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{poort}"
+        return self.url
+    
+    async def stop(self):
+        """Stop de server"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    def maak_app(self):
+        """
+        Bouw de aiohttp applicatie (ook bruikbaar met de aiohttp test client)
+        
+        Returns:
+            web.Application: De applicatie met alle routes
+        """
+        app = web.Application(middlewares=[self._storing_middleware, self._sessie_middleware])
+        app.router.add_get('/', self._home)
+        app.router.add_get('/Account/Login', self._login_pagina)
+        app.router.add_post('/Account/Login', self._login_post)
+        app.router.add_get('/Account/LogOff', self._uitloggen)
+        app.router.add_get('/Product', self._productoverzicht)
+        app.router.add_get('/Product/Edit', self._product_formulier)
+        app.router.add_post('/Product/Edit', self._product_opslaan)
+        app.router.add_get('/Product/Edit/{product_id}', self._product_formulier)
+        app.router.add_post('/Product/Edit/{product_id}', self._product_opslaan)
+        app.router.add_get('/images/products/{bestand}', self._afbeelding)
+        return app
+    
+    def verloop_sessies(self):
+        """Laat alle sessies direct verlopen (het volgende verzoek gaat naar de loginpagina)"""
+        self._sessies.clear()
+    
+    @web.middleware
+    async def _storing_middleware(self, request, handler):
+        """Voeg de ingestelde vertraging en willekeurige fouten toe aan elk verzoek"""
+        self.statistieken['verzoeken'] += 1
+        wachttijd = self.vertraging + (self._random.uniform(0, self.spreiding) if self.spreiding else 0.0)
+        if wachttijd:
+            await asyncio.sleep(wachttijd)
+        if self.foutkans and self._random.random() < self.foutkans:
+            self.statistieken['fouten'] += 1
+            return web.Response(status=self.foutcode, text="Service Unavailable")
+        antwoord = await handler(request)
+        if self.compressie and antwoord.content_type == 'text/html':
+            antwoord.enable_compression()
+        return antwoord
+    
+    @web.middleware
+    async def _sessie_middleware(self, request, handler):
+        """Stuur verzoeken zonder geldige sessie door naar de loginpagina, zoals RentPro doet"""
+        if request.path.startswith('/Product') and not self._sessie_geldig(request):
+            self.statistieken['niet_ingelogd'] += 1
+            raise web.HTTPFound(f"/Account/Login?ReturnUrl={request.path}")
+        return await handler(request)
+    
+    def _sessie_geldig(self, request):
+        """Controleer de sessie cookie en laat verlopen sessies vallen"""
+        sessie = request.cookies.get(SESSIE_COOKIE)
+        gestart = self._sessies.get(sessie)
+        if gestart is None:
+            return False
+        if self.sessie_duur is not None and time.monotonic() - gestart > self.sessie_duur:
+            del self._sessies[sessie]
+            self.statistieken['verlopen'] += 1
+            return False
+        return True
+    
+    async def _home(self, request):
+        """Startpagina na het inloggen (bevat de login indicatoren)"""
+        if not self._sessie_geldig(request):
+            raise web.HTTPFound('/Account/Login')
+        return self._pagina("Home", "<h1>Welkom</h1><p>Klanten vandaag online: 3</p>", ingelogd=True)
+    
+    async def _login_pagina(self, request, melding=""):
+        """Loginformulier met een nieuw verificatie token"""
+        token = self._nieuw_token()
+        inhoud = (
+            f'<form action="/Account/Login" method="post">'
+            f'<input name="__RequestVerificationToken" type="hidden" value="{token}" />'
+            f'{melding}'
+            f'<label for="UserName">Gebruikersnaam</label><input id="UserName" name="UserName" type="text" value="" />'
+            f'<label for="Password">Wachtwoord</label><input id="Password" name="Password" type="password" />'
+            f'<input type="submit" value="Log in" /></form>'
+        )
+        return self._pagina("Log in", inhoud)
+    
+    async def _login_post(self, request):
+        """Controleer token en inloggegevens, start een sessie en stuur door naar de startpagina"""
+        data = await request.post()
+        self.statistieken['logins'] += 1
+        if not self._controleer_token(data.get('__RequestVerificationToken')):
+            return web.Response(status=400, text="Ongeldig verificatie token")
+        
+        if (self.gebruikersnaam is not None and data.get('UserName') != self.gebruikersnaam) or \
+                (self.wachtwoord is not None and data.get('Password') != self.wachtwoord):
+            self.statistieken['logins_mislukt'] += 1
+            melding = '<div class="validation-summary-errors"><ul><li>Incorrect username or password.</li></ul></div>'
+            return await self._login_pagina(request, melding)
+        
+        sessie = uuid.uuid4().hex
+        self._sessies[sessie] = time.monotonic()
+        antwoord = web.HTTPFound('/')
+        antwoord.set_cookie(SESSIE_COOKIE, sessie, httponly=True)
+        raise antwoord
+    
+    async def _uitloggen(self, request):
+        """Beëindig de sessie"""
+        self._sessies.pop(request.cookies.get(SESSIE_COOKIE), None)
+        raise web.HTTPFound('/Account/Login')
+    
+    def _nieuw_token(self):
+        """Geef een nieuw verificatie token uit"""
+        token = uuid.uuid4().hex + uuid.uuid4().hex
+        self._tokens[token] = time.monotonic()
+        return token
+    
+    def _controleer_token(self, token):
+        """Of het token door deze server is uitgegeven en (bij een token_duur) nog niet verlopen is"""
+        uitgegeven = self._tokens.get(token) if token else None
+        if uitgegeven is None:
+            return False
+        if self.token_duur is not None and time.monotonic() - uitgegeven > self.token_duur:
+            self.statistieken['tokens_verlopen'] += 1
+            return False
+        return True
+    
+    async def _productoverzicht(self, request):
+        """Gepagineerde producttabel met zoekformulier en pager links zoals het RentPro overzicht"""
+        self.statistieken['overzicht'] += 1
+        try:
+            pagina = max(1, int(request.query.get('page', 1)))
+        except ValueError:
+            pagina = 1
+        try:
+            per_pagina = max(1, int(request.query.get('pageSize', self.per_pagina)))
+        except ValueError:
+            per_pagina = self.per_pagina
+        
+        # Zoeken op naam of productcode, de zoekopdracht blijft in de pager links staan
+        zoekterm = request.query.get('searchString', '').strip()
+        ids = sorted(self.catalogus)
+        if zoekterm:
+            self.statistieken['zoekopdrachten'] += 1
+            ids = [
+                product_id for product_id in ids
+                if zoekterm.lower() in self.catalogus[product_id]['Product.Name'].lower()
+                or zoekterm.lower() in self.catalogus[product_id]['Product.Productcode'].lower()
+            ]
+        query = {naam: waarde for naam, waarde in request.query.items() if naam in ('searchString', 'pageSize')}
+        paginas = max(1, -(-len(ids) // per_pagina))
+        begin = (pagina - 1) * per_pagina
+        
+        rijen = []
+        for nummer, product_id in enumerate(ids[begin:begin + per_pagina]):
+            product = self.catalogus[product_id]
+            categorie = dict(CATEGORIEEN).get(product['Product.CategoryID'], '')
+            rijen.append(
+                f'<tr class="{"even" if nummer % 2 else "oneven"}">'
+                f'<td>{product_id}</td><td>{escape(product["Product.Productcode"])}</td>'
+                f'<td>{escape(categorie)}</td>'
+                f'<td><a href="/Product/Edit/{product_id}">{escape(product["Product.Name"])}</a></td>'
+                f'<td>{escape(product["ProductPrice"])}</td></tr>'
+            )
+        
+        pager = [
+            f'<a href="/Product?{escape(urlencode({**query, "page": nummer}))}">{nummer}</a>'
+            for nummer in range(1, paginas + 1)
+        ]
+        if pagina < paginas:
+            pager.append(f'<a href="/Product?{escape(urlencode({**query, "page": pagina + 1}))}" rel="next">&raquo;</a>')
+        
+        groottes = ''.join(
+            f'<option value="{grootte}"{" selected" if grootte == per_pagina else ""}>{grootte}</option>'
+            for grootte in (10, 25, 50, 100, 250)
+        )
+        inhoud = (
+            '<form id="searchForm" action="/Product" method="get">'
+            f'<input type="text" id="searchString" name="searchString" value="{escape(zoekterm)}" />'
+            f'<select id="pageSize" name="pageSize">{groottes}</select>'
+            '<button id="searchButton" type="submit">Zoeken</button></form>'
+            '<table class="noBold gvItems"><tr class="head"><th>ID</th><th>Code</th><th>Categorie</th>'
+            f'<th>Naam</th><th>Prijs</th></tr>{"".join(rijen)}</table>'
+            f'<div class="pager">{" ".join(pager)}</div>'
+        )
+        return self._pagina("Producten", inhoud, ingelogd=True)
+    
+    async def _product_formulier(self, request):
+        """Product/Edit formulier; zonder ID een leeg formulier voor een nieuw product"""
+        product_id = request.match_info.get('product_id')
+        if product_id is None:
+            self.statistieken['formulier_nieuw'] += 1
+            return self._pagina("Nieuw product", self._formulier(None, {}), ingelogd=True)
+        
+        product = self.catalogus.get(self._product_id(product_id))
+        if product is None:
+            raise web.HTTPNotFound(text="Product niet gevonden")
+        
+        # ETag per productversie, zodat de response cache kan revalideren
+        etag = f'"{product_id}-{self._versies[int(product_id)]}"'
+        if request.headers.get('If-None-Match') == etag:
+            self.statistieken['niet_gewijzigd'] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        
+        self.statistieken['formulier'] += 1
+        antwoord = self._pagina(product['Product.Name'], self._formulier(int(product_id), product), ingelogd=True)
+        antwoord.headers['ETag'] = etag
+        return antwoord
+    
+    async def _product_opslaan(self, request):
+        """Verwerk een formulierpost: valideer, sla op en stuur door naar het Edit formulier"""
+        data = await request.post()
+        self.statistieken['posts'] += 1
+        if not self._controleer_token(data.get('__RequestVerificationToken')):
+            return web.Response(status=400, text="Ongeldig verificatie token")
+        
+        product_id = request.match_info.get('product_id')
+        if product_id is not None and self._product_id(product_id) not in self.catalogus:
+            raise web.HTTPNotFound(text="Product niet gevonden")
+        
+        bestaand = self.catalogus.get(self._product_id(product_id), {}) if product_id else {}
+        product = dict(bestaand) if bestaand else self._leeg_product()
+        for _, naam, _ in TEKSTVELDEN + TEKSTVAKKEN:
+            if naam in data:
+                product[naam] = data[naam]
+        for _, naam, _, opties in KEUZELIJSTEN:
+            if data.get(naam) in dict(opties):
+                product[naam] = data[naam]
+        for _, naam, _ in VINKVAKJES:
+            # ASP.NET stuurt 'true' van het vinkvakje plus 'false' van het verborgen veld
+            if naam in data:
+                product[naam] = 'true' in data.getall(naam)
+        
+        if not product['Product.Name'].strip():
+            self.statistieken['validatiefouten'] += 1
+            melding = '<span class="field-validation-error" data-valmsg-for="Product.Name">Productnaam is verplicht</span>'
+            return self._pagina("Fout", self._formulier(int(product_id) if product_id else None, product, melding),
+                                ingelogd=True)
+        
+        if product_id is None:
+            product_id = self._voeg_product_toe(product)
+        else:
+            product_id = int(product_id)
+            self.catalogus[product_id] = product
+            self._versies[product_id] += 1
+        self.statistieken['opgeslagen'] += 1
+        raise web.HTTPFound(f"/Product/Edit/{product_id}")
+    
+    async def _afbeelding(self, request):
+        """Kleine nep-afbeelding met ETag; producten in dezelfde reeks van 20 delen hun afbeelding"""
+        self.statistieken['afbeeldingen'] += 1
+        naam = request.match_info['bestand']
+        nummer = naam.split('.')[0]
+        reeks = int(nummer) // 20 if nummer.isdigit() else naam
+        inhoud = b'\xff\xd8\xff\xe0' + f"afbeelding {reeks}".encode() * 256 + b'\xff\xd9'
+        etag = f'"{hashlib.md5(inhoud).hexdigest()}"'
+        if request.headers.get('If-None-Match') == etag:
+            self.statistieken['afbeeldingen_304'] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        return web.Response(body=inhoud, content_type='image/jpeg', headers={'ETag': etag})
+    
+    def _pagina(self, titel, inhoud, ingelogd=False):
+        """Omhul de inhoud met de vaste opmaak (menu, header) van een RentPro pagina"""
+        # Het menu staat alleen op pagina's na het inloggen (de API handler herkent de login eraan)
+        menu = (
+            f'<div id="sidebarMenu">{self._opvulling}<form id="logoutForm" action="/Account/LogOff" method="post">'
+            f'<a href="/Account/LogOff">Uitloggen</a></form></div>'
+            if ingelogd else ''
+        )
+        html = (
+            f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8" /><title>{escape(titel)} - RentPro</title>'
+            f'</head><body>{menu}<div id="content-container">{inhoud}</div></body></html>'
+        )
+        return web.Response(text=html, content_type='text/html')
+    
+    def _formulier(self, product_id, product, melding=""):
+        """Bouw het Product/Edit formulier met de opmaak van RentPro (label/veld in tabelrijen)"""
+        actie = f"/Product/Edit/{product_id}" if product_id else "/Product/Edit"
+        rijen = []
+        for veld_id, naam, label in TEKSTVELDEN:
+            rijen.append(
+                f'<tr><td><label for="{veld_id}">{label}</label></td><td><input id="{veld_id}" name="{naam}" '
+                f'type="text" value="{escape(str(product.get(naam, "")))}" /></td></tr>'
+            )
+        for veld_id, naam, label in TEKSTVAKKEN:
+            rijen.append(
+                f'<tr><td><label for="{veld_id}">{label}</label></td><td><textarea id="{veld_id}" name="{naam}">'
+                f'\n{escape(str(product.get(naam, "")))}</textarea></td></tr>'
+            )
+        for veld_id, naam, label, opties in KEUZELIJSTEN:
+            gekozen = product.get(naam)
+            keuzes = ''.join(
+                f'<option value="{waarde}"{" selected" if waarde == gekozen else ""}>{tekst}</option>'
+                for waarde, tekst in opties
+            )
+            rijen.append(
+                f'<tr><td><label for="{veld_id}">{label}</label></td><td><select id="{veld_id}" name="{naam}">'
+                f'{keuzes}</select></td></tr>'
+            )
+        for veld_id, naam, label in VINKVAKJES:
+            rijen.append(
+                f'<tr><td><label for="{veld_id}">{label}</label></td><td><input id="{veld_id}" name="{naam}" '
+                f'type="checkbox" value="true"{" checked" if product.get(naam) else ""} />'
+                f'<input name="{naam}" type="hidden" value="false" /></td></tr>'
+            )
+        
+        afbeelding = (
+            f'<div class="product-details"><img class="product-image" src="/images/products/{product_id}.jpg" /></div>'
+            if product_id else ''
+        )
+        return (
+            f'<form action="{actie}" method="post">'
+            f'<input name="__RequestVerificationToken" type="hidden" value="{self._nieuw_token()}" />'
+            f'<input id="Product_ID" name="Product.ID" type="hidden" value="{product_id or 0}" />'
+            f'{melding}<table>{"".join(rijen)}</table>{afbeelding}'
+            f'<input type="submit" value="Opslaan" /></form>'
+        )
+    
+    @staticmethod
+    def _maak_opvulling(kb):
+        """Menu met links als opvulling buiten het formulier (echte pagina's zijn tientallen KB)"""
+        items = []
+        grootte = 0
+        nummer = 0
+        while grootte < kb * 1024:
+            item = f'<li class="menu-item"><a href="/Menu/Item/{nummer}" title="Menu item {nummer}">Menu item {nummer}</a></li>'
+            items.append(item)
+            grootte += len(item)
+            nummer += 1
+        return f'<ul class="menu">{"".join(items)}</ul>'
+    
+    def _genereer_product(self, product_id):
+        """Genereer een product met herhaalbare willekeurige waarden"""
+        r = self._random
+        return {
+            'Product.Name': f"Product {product_id}",
+            'Product.Title': f"Product {product_id} huren",
+            'Product.Productcode': f"P{product_id:05d}",
+            'Product.UrlName': f"product-{product_id}",
+            'Product.Type': r.choice(['Standaard', 'Set', 'Verbruik']),
+            'ProductPrice': f"{r.randint(1, 500)},{r.choice(['00', '50', '95'])}",
+            'Newvalue': f"{r.randint(10, 2000)},00",
+            'Stock': str(r.randint(0, 250)),
+            'Product.MinimumOrderingAmount': str(r.choice([1, 1, 1, 2, 5])),
+            'metatitle': f"Product {product_id} | Verhuur",
+            'Product.Decription': f"Omschrijving van product {product_id}.\nGeschikt voor evenementen.",
+            'Product.DecriptionShort': f"Product {product_id}",
+            'Product.CategoryID': r.choice(CATEGORIEEN)[0],
+            'VatVal': '21',
+            'Product.Active': r.random() < 0.9,
+            'EndlessStock': r.random() < 0.1,
+        }
+    
+    @staticmethod
+    def _leeg_product():
+        """Standaardwaarden voor een nieuw product"""
+        product = {naam: '' for _, naam, _ in TEKSTVELDEN + TEKSTVAKKEN}
+        product.update({naam: opties[0][0] for _, naam, _, opties in KEUZELIJSTEN})
+        product.update({naam: False for _, naam, _ in VINKVAKJES})
+        return product
+    
+    def _voeg_product_toe(self, product):
+        """Voeg een product toe aan de catalogus en geef het nieuwe ID"""
+        product_id = self._volgende_id
+        self._volgende_id += 1
+        self.catalogus[product_id] = product
+        self._versies[product_id] = 1
+        return product_id
+    
+    @staticmethod
+    def _product_id(waarde):
+        """Zet een ID uit de URL om naar een getal (None als het geen getal is)"""
+        return int(waarde) if str(waarde).isdigit() else None
+
+def main():
+    """Start de stand-in server vanaf de commandoregel"""
+    parser = argparse.ArgumentParser(description="Lokale RentPro stand-in server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--poort', type=int, default=8080)
+    parser.add_argument('--producten', type=int, default=500, help="Aantal producten in de catalogus")
+    parser.add_argument('--per-pagina', type=int, default=50, help="Producten per pagina van het overzicht")
+    parser.add_argument('--vertraging', type=float, default=0.0, help="Vaste vertraging per verzoek (s)")
+    parser.add_argument('--spreiding', type=float, default=0.0, help="Extra willekeurige vertraging (s)")
+    parser.add_argument('--foutkans', type=float, default=0.0, help="Kans op een foutantwoord (0-1)")
+    parser.add_argument('--foutcode', type=int, default=503)
+    parser.add_argument('--sessie-duur', type=float, default=None, help="Geldigheid van een sessie (s)")
+    parser.add_argument('--opvulling-kb', type=int, default=30, help="Extra paginagrootte buiten het formulier")
+    parser.add_argument('--gebruiker', default=STANDAARD_GEBRUIKER)
+    parser.add_argument('--wachtwoord', default=STANDAARD_WACHTWOORD)
+    parser.add_argument('--zonder-compressie', action='store_true', help="Stuur pagina's altijd ongecomprimeerd")
+    parser.add_argument('--token-duur', type=float, default=None, help="Geldigheid van een verificatie token (s)")
+    args = parser.parse_args()
+    
+    server = StandInServer(
+        producten=args.producten, per_pagina=args.per_pagina, vertraging=args.vertraging,
+        spreiding=args.spreiding, foutkans=args.foutkans, foutcode=args.foutcode,
+        sessie_duur=args.sessie_duur, opvulling_kb=args.opvulling_kb,
+        gebruikersnaam=args.gebruiker, wachtwoord=args.wachtwoord, compressie=not args.zonder_compressie,
+        token_duur=args.token_duur
+    )
+    print(f"RentPro stand-in op http://{args.host}:{args.poort} met {args.producten} producten (Ctrl+C om te stoppen)")
+    web.run_app(server.maak_app(), host=args.host, port=args.poort, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Tenants voor RentPro integratie
+Verantwoordelijk voor een handler per RentPro omgeving en het tegelijk uitvoeren van taken
+
+Elke omgeving (tenant, zie config/rentpro.ini) krijgt een eigen RentproHandler met een
+eigen ApiHandler: eigen cookies en connection pool, eigen AIMD limiet en retry
+beleid, en een eigen cache, sessie, catalogus en snapshots. Daardoor kunnen taken
+voor meerdere omgevingen tegelijk op dezelfde event loop lopen zonder elkaar te raken.
+
+Ook de standaard omgeving krijgt hier een eigen handler, los van de rentproHandler van
+de GUI: een taak logt dan niet in op (of sluit) de sessie waarmee de gebruiker werkt.
+"""
+import asyncio
+import threading
+from modules.logger import logger
+from modules.rentpro.config import laad_inloggegevens, laad_tenants, STANDAARD_TENANT
+from modules.rentpro.handler import RentproHandler
+
+_handlers = {}
+_handlers_lock = threading.Lock()
+
+def haal_handler(tenant=None):
+    """
+    Geef de handler van een RentPro omgeving, maak deze aan indien nodig
+    
+    Args:
+        tenant (str, optional): Tenantnaam; None of STANDAARD_TENANT is de standaard omgeving
+    
+    Returns:
+        RentproHandler: De handler van deze omgeving (niet de rentproHandler van de GUI)
+    
+    Raises:
+        ValueError: Bij een tenantnaam die niet als mapnaam gebruikt kan worden
+    """
+    tenant = tenant or STANDAARD_TENANT
+    with _handlers_lock:
+        if tenant not in _handlers:
+            _handlers[tenant] = RentproHandler(None if tenant == STANDAARD_TENANT else tenant)
+        return _handlers[tenant]
+
+async def voer_uit_per_tenant(taak, tenants=None):
+    """
+    Voer dezelfde taak tegelijk uit voor meerdere RentPro omgevingen
+    Per omgeving wordt ingelogd, de taak uitgevoerd en de verbinding gesloten; een
+    fout in één omgeving houdt de andere niet tegen.
+    
+    Args:
+        taak (callable): Async functie (handler) -> resultaat, bijvoorbeeld
+            lambda handler: handler.ververs_catalogus()
+        tenants (list, optional): Tenantnamen (STANDAARD_TENANT voor [RentPro]),
+            standaard alle tenants uit het config bestand
+    
+    Returns:
+        dict: tenantnaam -> resultaat van de taak, None als inloggen of de taak mislukt is
+    """
+    if tenants is None:
+        tenants = laad_tenants()
+    tenants = list(dict.fromkeys(tenant or STANDAARD_TENANT for tenant in tenants))
+    resultaten = await asyncio.gather(*(_voer_uit(tenant, taak) for tenant in tenants))
+    return dict(zip(tenants, resultaten))
+
+async def _voer_uit(tenant, taak):
+    """Log in op één omgeving en voer de taak uit"""
+    try:
+        handler = haal_handler(tenant)
+    except ValueError as e:
+        logger.logFout(f"RentPro omgeving overgeslagen: {e}")
+        return None
+    credentials = laad_inloggegevens(tenant=None if tenant == STANDAARD_TENANT else tenant)
+    if not credentials:
+        logger.logFout(f"Geen inloggegevens voor RentPro omgeving '{tenant}'")
+        return None
+    
+    try:
+        logger.logInfo(f"Verbinden met RentPro omgeving '{tenant}'...")
+        if not await handler.api_handler.login(
+            credentials['gebruikersnaam'], credentials['wachtwoord'], credentials['url']
+        ):
+            logger.logFout(f"Inloggen op RentPro omgeving '{tenant}' mislukt")
+            return None
+        resultaat = await taak(handler)
+        logger.logInfo(f"RentPro omgeving '{tenant}' klaar")
+        return resultaat
+    except Exception as e:
+        logger.logFout(f"Fout in RentPro omgeving '{tenant}': {e}")
+        return None
+    finally:
+        await handler.api_handler.close()
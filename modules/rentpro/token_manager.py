@@ -0,0 +1,115 @@
+"""
+Token Manager voor RentPro integratie
+Verantwoordelijk voor het hergebruiken van formulieren met hun verificatie token
+
+ASP.NET zet in elk formulier een __RequestVerificationToken dat bij de sessie
+hoort en tijdens die sessie geldig blijft. Voor het aanmaken van een product is
+het lege Product/Edit formulier steeds hetzelfde, dus hoeft het niet voor elke
+post opnieuw opgehaald te worden. De TokenManager bewaart per sessie en per
+formuliersoort het laatst opgehaalde formulier (met token) en haalt het pas
+opnieuw op als de server het token afwijst of als er een nieuwe sessie is.
+"""
+import asyncio
+import re
+
+# Foutmelding van de server bij een ongeldig of verlopen verificatie token. Alleen de tekst
+# van de anti-forgery fout telt: ook gewone foutpagina's bevatten (via het uitlogformulier
+# in de layout) een verborgen __RequestVerificationToken veld
+TOKEN_FOUT_PATTERN = re.compile(
+    r'anti-?forgery'
+    r'|verificat\w*[\s_-]*token\W+(?:\w+\W+){0,4}?(?:is not present|could not be decrypted|(?:is|was) invalid)'
+    r'|ongeldig\w*\s+verificatie\s*token',
+    re.IGNORECASE
+)
+
+def is_token_afgewezen(response):
+    """
+    Bepaal of de server een post heeft geweigerd vanwege het verificatie token
+    Alleen dan is de post zeker niet verwerkt; een andere 500 op het aanmaken van een
+    product kan betekenen dat het product er al is en mag dus niet opnieuw verstuurd worden.
+    
+    Args:
+        response (TransportResponse): Antwoord op de post
+    
+    Returns:
+        bool: True als het token is afgewezen (de post is dan niet verwerkt)
+    """
+    return response.status_code in (400, 403, 500) and bool(TOKEN_FOUT_PATTERN.search(response.text))
+
+class TokenManager:
+    """
+    Bewaart per sessie en formuliersoort een opgehaald formulier met zijn verificatie token
+    """
+    
+    def __init__(self):
+        """Initialiseer een lege token manager"""
+        self._sessie = None
+        self._formulieren = {}
+        # Gelijktijdige aanvragen voor dezelfde soort wachten op één ophaalverzoek
+        self._lopend = {}
+        self.statistieken = {'opgehaald': 0, 'hergebruikt': 0, 'afgewezen': 0}
+    
+    def reset_statistieken(self):
+        """Zet de tellers op nul, bijvoorbeeld aan het begin van een upload"""
+        self.statistieken = {'opgehaald': 0, 'hergebruikt': 0, 'afgewezen': 0}
+    
+    async def formulier(self, sessie, soort, ophalen):
+        """
+        Geef het bewaarde formulier voor deze sessie en soort, of haal het op
+        
+        Args:
+            sessie: Sleutel van de huidige sessie (verandert bij elke nieuwe login)
+            soort (str): Soort formulier, bijvoorbeeld 'nieuw_product'
+            ophalen (callable): Async functie zonder argumenten die het formulier ophaalt
+                (of None bij een fout)
+        
+        Returns:
+            Het (gedeelde) formulier, of None als ophalen mislukt is
+        """
+        if sessie != self._sessie:
+            # Nieuwe sessie: tokens van de vorige sessie zijn niet meer geldig
+            self._sessie = sessie
+            self._formulieren = {}
+            self._lopend = {}
+        
+        if soort in self._formulieren:
+            self.statistieken['hergebruikt'] += 1
+            return self._formulieren[soort]
+        
+        taak = self._lopend.get(soort)
+        if taak is None or taak.get_loop() is not asyncio.get_running_loop():
+            taak = asyncio.ensure_future(self._haal_op(sessie, soort, ophalen))
+            self._lopend[soort] = taak
+        else:
+            self.statistieken['hergebruikt'] += 1
+        return await asyncio.shield(taak)
+    
+    async def _haal_op(self, sessie, soort, ophalen):
+        """Haal het formulier op en bewaar het als de sessie intussen niet veranderd is"""
+        try:
+            formulier = await ophalen()
+            self.statistieken['opgehaald'] += 1
+            if formulier is not None and sessie == self._sessie:
+                self._formulieren[soort] = formulier
+            return formulier
+        finally:
+            if sessie == self._sessie:
+                self._lopend.pop(soort, None)
+    
+    def verwerp(self, sessie, soort, formulier=None):
+        """
+        Vergeet het formulier nadat de server het token heeft afgewezen
+        
+        Args:
+            sessie: Sleutel van de sessie waarin het token werd afgewezen
+            soort (str): Soort formulier
+            formulier (optional): Het afgewezen formulier; een intussen opnieuw opgehaald
+                formulier blijft dan bewaard
+        """
+        if sessie != self._sessie:
+            return
+        if formulier is not None and self._formulieren.get(soort) is not formulier:
+            return
+        if self._formulieren.pop(soort, None) is not None:
+            self.statistieken['afgewezen'] += 1
+
@@ -0,0 +1,390 @@
+"""
+Upload Engine voor RentPro integratie
+Verantwoordelijk voor het aanmaken en bijwerken van producten via formulierposts
+
+In plaats van een browser te starten en elk veld in te typen wordt het
+Product/Edit formulier met HTTP opgehaald, wordt de volledige formulierinhoud
+(inclusief verborgen velden en het verificatie token) overgenomen, worden de
+waarden uit Excel erover gelegd en wordt het resultaat direct gepost. Producten
+worden gelijktijdig verwerkt, begrensd door een maximum aantal tegelijk.
+
+Voor nieuwe producten wordt het lege formulier met zijn token hergebruikt (zie
+token_manager.py): één verzoek per product in plaats van twee. Wijst de server
+het token af, dan wordt een vers formulier opgehaald en de post herhaald.
+
+Bij het bijwerken van bestaande producten worden de Excel waarden eerst
+vergeleken met de huidige waarden in het formulier (na normalisatie van
+getallen, booleans en witruimte). Producten zonder verschil worden niet
+verstuurd; bij de rest worden alleen de gewijzigde velden aangepast.
+
+Bij synchroniseren kan per product een verwachte basis meegegeven worden: als
+het opgehaalde formulier voor een te versturen veld niet meer de basis bevat
+(en ook niet al de nieuwe waarde), is het product in RentPro gewijzigd en wordt
+het niet verstuurd maar als VEROUDERD teruggemeld.
+"""
+import asyncio
+import re
+import time
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from urllib.parse import urljoin
+from modules.logger import logger
+from modules.rentpro.token_manager import is_token_afgewezen
+
+# Foutmeldingen van de ASP.NET validatie in een teruggestuurd formulier
+VALIDATIE_PATTERN = re.compile(
+    r'class\s*=\s*["\'][^"\']*\b(?:field-validation-error|validation-summary-errors)\b[^"\']*["\'][^>]*>(.*?)</(?:span|div)>',
+    re.IGNORECASE | re.DOTALL
+)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+PRODUCT_ID_PATTERN = re.compile(r'/Product/(?:Edit|Details)/(\d+)', re.IGNORECASE)
+LOGIN_PAD = '/Account/Login'
+
+# Celwaarden die een checkbox aanvinken
+AANGEVINKT_WAARDEN = {'true', 'waar', 'ja', 'yes', '1', 'x', 'on', 'aan'}
+
+# Getallen met punt of komma als scheidingsteken (12, 12.5, 12,50, 1.234,50), zonder
+# voorloopnullen zodat codes als 007 tekst blijven
+GETAL_PATTERN = re.compile(r'^-?(?:0|[1-9][\d.,]*|0[.,]\d+)$')
+
+# Uitkomsten van het verwerken van één product
+OPGESLAGEN = 'opgeslagen'
+ONGEWIJZIGD = 'ongewijzigd'
+MISLUKT = 'mislukt'
+VEROUDERD = 'verouderd'
+
+def formatteer_waarde(waarde):
+    """
+    Zet een celwaarde om naar de tekst die in het formulier verstuurd wordt
+    
+    Args:
+        waarde: Waarde uit Excel
+    
+    Returns:
+        str: Waarde voor het formulier (12.0 wordt "12", True wordt "true")
+    """
+    if isinstance(waarde, bool):
+        return 'true' if waarde else 'false'
+    if isinstance(waarde, float) and waarde.is_integer():
+        return str(int(waarde))
+    return str(waarde).strip()
+
+def normaliseer_waarde(tekst):
+    """
+    Breng een waarde in een vaste vorm om Excel en RentPro te kunnen vergelijken
+    
+    Args:
+        tekst (str): Waarde uit het formulier of uit Excel (na formatteer_waarde)
+    
+    Returns:
+        str: Waarde zonder dubbele witruimte, getallen als genormaliseerd decimaal getal
+    """
+    tekst = ' '.join(str(tekst).split())
+    if GETAL_PATTERN.match(tekst):
+        # Het laatste scheidingsteken is het decimaalteken, eerdere zijn duizendtallen
+        decimaal = max(tekst.rfind('.'), tekst.rfind(','))
+        if decimaal != -1:
+            tekst = tekst[:decimaal].replace('.', '').replace(',', '') + '.' + tekst[decimaal + 1:]
+        try:
+            getal = Decimal(tekst).normalize()
+            return format(getal, 'f') if getal != 0 else '0'
+        except InvalidOperation:
+            pass
+    return tekst
+
+def bepaal_wijzigingen(index, velden):
+    """
+    Vergelijk de Excel waarden met de huidige waarden in het formulier
+    
+    Args:
+        index (FormIndex): Index van het opgehaalde formulier
+        velden (dict): veld_id (of name) -> waarde uit Excel
+    
+    Returns:
+        dict: veld_id -> (huidige waarde, nieuwe waarde) voor de velden die verschillen
+    """
+    wijzigingen = {}
+    for veld_id, waarde in velden.items():
+        naam = _veldnaam(index, veld_id)
+        if naam is None:
+            # Onbekende velden worden bij het opbouwen van de payload gemeld
+            continue
+        
+        nieuw = _formulier_waarde(index, naam, formatteer_waarde(waarde))
+        huidige_waarden = [w for n, w in index.formulier if n == naam]
+        if naam in index.checkboxes:
+            # Vergelijk aangevinkt/niet aangevinkt, de verborgen "false" telt niet mee
+            huidig = 'true' if index.checkboxes[naam] in huidige_waarden else 'false'
+            nieuw = 'false' if nieuw is None else 'true'
+        else:
+            huidig = huidige_waarden[0] if huidige_waarden else ''
+        
+        if normaliseer_waarde(huidig) != normaliseer_waarde(nieuw):
+            wijzigingen[veld_id] = (huidig, nieuw)
+    return wijzigingen
+
+def bouw_payload(index, velden):
+    """
+    Bouw de te posten formulierinhoud: het opgehaalde formulier met de Excel waarden erover
+    
+    Args:
+        index (FormIndex): Index van het opgehaalde formulier
+        velden (dict): veld_id (of name) -> waarde uit Excel
+    
+    Returns:
+        tuple: (list met (naam, waarde) paren, list met veld-ID's die niet in het formulier staan)
+    """
+    nieuwe_waarden = {}
+    onbekend = []
+    for veld_id, waarde in velden.items():
+        naam = _veldnaam(index, veld_id)
+        if naam is None:
+            onbekend.append(veld_id)
+            continue
+        nieuwe_waarden[naam] = _formulier_waarde(index, naam, formatteer_waarde(waarde))
+    
+    payload = []
+    geplaatst = set()
+    for naam, waarde in index.formulier:
+        if naam not in nieuwe_waarden:
+            payload.append((naam, waarde))
+            continue
+        if naam not in geplaatst:
+            geplaatst.add(naam)
+            if nieuwe_waarden[naam] is not None:
+                payload.append((naam, nieuwe_waarden[naam]))
+        if naam in index.checkboxes and waarde != index.checkboxes[naam]:
+            # Verborgen "false" van ASP.NET achter de checkbox blijft altijd mee gaan
+            payload.append((naam, waarde))
+    
+    # Velden die in het opgehaalde formulier niet verstuurd werden (zoals een niet aangevinkte checkbox)
+    for naam, waarde in nieuwe_waarden.items():
+        if naam not in geplaatst and waarde is not None:
+            payload.append((naam, waarde))
+    
+    return payload, onbekend
+
+def _veldnaam(index, veld_id):
+    """Geef de name van een veld op id (of name), None als het veld niet in het formulier staat"""
+    return index.namen.get(veld_id) or (veld_id if veld_id in index.types else None)
+
+def _formulier_waarde(index, naam, tekst):
+    """Vertaal een tekst naar de waarde die het formulierveld verwacht (None: niet versturen)"""
+    if naam in index.checkboxes:
+        return index.checkboxes[naam] if tekst.lower() in AANGEVINKT_WAARDEN else None
+    
+    opties = index.opties.get(naam)
+    if opties and tekst not in (waarde for waarde, _ in opties):
+        # Excel bevat vaak de zichtbare tekst van een keuzelijst in plaats van de waarde
+        for waarde, optie_tekst in opties:
+            if optie_tekst.lower() == tekst.lower():
+                return waarde
+    return tekst
+
+def controleer_antwoord(response):
+    """
+    Bepaal of een formulierpost gelukt is
+    
+    Args:
+        response (TransportResponse): Antwoord op de post (na redirects)
+    
+    Returns:
+        tuple: (gelukt, product ID uit de uiteindelijke URL of None, foutmelding of None)
+    """
+    if LOGIN_PAD in response.url:
+        return False, None, "sessie verlopen"
+    if response.status_code != 200:
+        return False, None, f"HTTP {response.status_code}"
+    
+    meldingen = [
+        ' '.join(TAG_PATTERN.sub(' ', melding).split())
+        for melding in VALIDATIE_PATTERN.findall(response.text)
+    ]
+    meldingen = [melding for melding in meldingen if melding]
+    if meldingen:
+        return False, None, "; ".join(meldingen[:5])
+    
+    match = PRODUCT_ID_PATTERN.search(response.url)
+    return True, match.group(1) if match else None, None
+
+class UploadEngine:
+    """
+    Maakt producten aan of werkt ze bij met begrensde gelijktijdigheid
+    """
+    
+    def __init__(self, api_handler, max_gelijktijdig=8, alleen_wijzigingen=True):
+        """
+        Initialiseer de upload engine
+        
+        Args:
+            api_handler (ApiHandler): Ingelogde API handler
+            max_gelijktijdig (int): Maximum aantal producten dat tegelijk verwerkt wordt
+            alleen_wijzigingen (bool): Bestaande producten alleen versturen als er een veld verschilt
+        """
+        self.api_handler = api_handler
+        self.max_gelijktijdig = max(1, int(max_gelijktijdig))
+        self.alleen_wijzigingen = alleen_wijzigingen
+        self._gemeld_onbekend = set()
+    
+    async def upload(self, opdrachten, basis=None):
+        """
+        Verwerk alle opdrachten gelijktijdig
+        
+        Args:
+            opdrachten (list): Lijst van tuples (row_index, product_id of None voor nieuw, velden dict)
+            basis (dict, optional): product_id -> dict veld_id -> waarde die RentPro volgens de laatste
+                synchronisatie nog heeft; wijkt het formulier daarvan af, dan wordt het product niet verstuurd
+        
+        Returns:
+            dict: Statistieken met 'totaal', 'succesvol' ('gewijzigd' + 'ongewijzigd'), 'mislukt',
+                'mislukte_rijen', 'verouderd', 'verouderde_rijen', 'gewijzigde_velden'
+                (veld_id -> aantal producten), 'product_ids' (row_index -> product ID) en 'duur' (seconden)
+        """
+        totaal = len(opdrachten)
+        basis = basis or {}
+        statistieken = {
+            'totaal': totaal, 'succesvol': 0, 'gewijzigd': 0, 'ongewijzigd': 0, 'mislukt': 0,
+            'mislukte_rijen': [], 'verouderd': 0, 'verouderde_rijen': [],
+            'gewijzigde_velden': Counter(), 'product_ids': {}, 'duur': 0.0
+        }
+        if not totaal:
+            return statistieken
+        
+        start = time.monotonic()
+        semafoor = asyncio.Semaphore(self.max_gelijktijdig)
+        
+        async def _verwerk(row_index, product_id, velden):
+            async with semafoor:
+                try:
+                    return row_index, await self.upload_product(product_id, velden, row_index, basis.get(product_id))
+                except Exception as e:
+                    logger.logFout(f"Fout bij uploaden rij {row_index + 1}: {e}")
+                    return row_index, (MISLUKT, None, {})
+        
+        logger.logInfo(f"Uploaden van {totaal} producten gestart (max {self.max_gelijktijdig} gelijktijdig)")
+        taken = [asyncio.ensure_future(_verwerk(*opdracht)) for opdracht in opdrachten]
+        
+        try:
+            verwerkt = 0
+            for volgende in asyncio.as_completed(taken):
+                row_index, (uitkomst, product_id, wijzigingen) = await volgende
+                verwerkt += 1
+                
+                if uitkomst == VEROUDERD:
+                    statistieken['verouderd'] += 1
+                    statistieken['verouderde_rijen'].append(row_index)
+                elif uitkomst != MISLUKT:
+                    statistieken['succesvol'] += 1
+                    statistieken['gewijzigd' if uitkomst == OPGESLAGEN else 'ongewijzigd'] += 1
+                    statistieken['gewijzigde_velden'].update(wijzigingen.keys())
+                    if product_id:
+                        statistieken['product_ids'][row_index] = product_id
+                else:
+                    statistieken['mislukt'] += 1
+                    statistieken['mislukte_rijen'].append(row_index)
+                
+                # Log voortgang periodiek
+                if verwerkt % 25 == 0 or verwerkt == totaal:
+                    logger.logInfo(f"Voortgang: {verwerkt}/{totaal} producten verstuurd")
+        finally:
+            # Ruim openstaande taken op als de verwerking wordt afgebroken
+            for taak in taken:
+                if not taak.done():
+                    taak.cancel()
+        
+        statistieken['mislukte_rijen'].sort()
+        statistieken['verouderde_rijen'].sort()
+        statistieken['duur'] = time.monotonic() - start
+        logger.logInfo(
+            f"Upload klaar: {statistieken['gewijzigd']} opgeslagen, {statistieken['ongewijzigd']} ongewijzigd, "
+            f"{statistieken['mislukt']} mislukt in {statistieken['duur']:.1f} seconden"
+        )
+        return statistieken
+    
+    async def upload_product(self, product_id, velden, row_index=None, basis=None):
+        """
+        Haal het formulier op, vul de waarden in en verstuur het
+        Een bestaand product zonder verschillen wordt niet verstuurd, anders worden
+        alleen de gewijzigde velden aangepast. Als de sessie tussen ophalen en versturen
+        verloopt of de server het (hergebruikte) token afwijst, wordt het formulier één
+        keer opnieuw opgehaald met een nieuw token.
+        
+        Args:
+            product_id (str): ID van het product of None voor een nieuw product
+            velden (dict): veld_id -> waarde uit Excel
+            row_index (int, optional): Rij in Excel, voor de log
+            basis (dict, optional): veld_id -> waarde die het formulier volgens de laatste synchronisatie heeft
+        
+        Returns:
+            tuple: (OPGESLAGEN, ONGEWIJZIGD, VEROUDERD of MISLUKT, product ID of None,
+                dict veld_id -> (oud, nieuw) met de verstuurde wijzigingen)
+        """
+        omschrijving = f"product {product_id}" if product_id else "nieuw product"
+        if row_index is not None:
+            omschrijving += f" (rij {row_index + 1})"
+        
+        for poging in range(2):
+            formulier = await self.api_handler.get_product_form(product_id)
+            if formulier is None:
+                return MISLUKT, None, {}
+            index, formulier_url = formulier
+            
+            if product_id is not None and basis:
+                # Een veld dat in RentPro niet meer de basis is (en ook niet al de nieuwe waarde)
+                # is daar intussen gewijzigd; versturen zou die wijziging overschrijven
+                verwacht = {veld_id: basis[veld_id] for veld_id in velden if veld_id in basis}
+                afwijkend = set(bepaal_wijzigingen(index, verwacht)) & set(bepaal_wijzigingen(index, velden))
+                if afwijkend:
+                    logger.logInfo(
+                        f"{omschrijving}: {', '.join(sorted(afwijkend))} gewijzigd in RentPro sinds de laatste "
+                        f"synchronisatie, niet verstuurd"
+                    )
+                    return VEROUDERD, product_id, {}
+            
+            wijzigingen = {}
+            te_versturen = velden
+            if product_id is not None and self.alleen_wijzigingen:
+                wijzigingen = bepaal_wijzigingen(index, velden)
+                if not wijzigingen:
+                    return ONGEWIJZIGD, product_id, {}
+                te_versturen = {veld_id: velden[veld_id] for veld_id in wijzigingen}
+                logger.logInfo(
+                    f"{omschrijving}: {len(wijzigingen)} velden gewijzigd "
+                    f"({', '.join(f'{veld_id}: {oud!r} -> {nieuw!r}' for veld_id, (oud, nieuw) in list(wijzigingen.items())[:5])})"
+                )
+            
+            payload, onbekend = bouw_payload(index, te_versturen)
+            self._meld_onbekend(onbekend)
+            
+            # Een nieuw product mag niet dubbel aangemaakt worden, een update wel opnieuw versturen
+            response = await self.api_handler.submit_product_form(
+                urljoin(formulier_url, index.actie or formulier_url),
+                payload,
+                formulier_url,
+                herhaalbaar=product_id is not None
+            )
+            
+            # Doorgestuurd naar de loginpagina of token afgewezen: de post is niet verwerkt en kan veilig opnieuw
+            if LOGIN_PAD in response.url or is_token_afgewezen(response):
+                self.api_handler.verwerp_product_form(formulier, product_id)
+                if poging == 0:
+                    reden = "Sessie verlopen" if LOGIN_PAD in response.url else "Verificatie token afgewezen"
+                    logger.logWaarschuwing(f"{reden} bij opslaan {omschrijving}, formulier opnieuw ophalen")
+                    continue
+            
+            gelukt, nieuw_id, melding = controleer_antwoord(response)
+            if not gelukt:
+                logger.logFout(f"Opslaan {omschrijving} mislukt: {melding}")
+                if self.api_handler.debug_capture is not None:
+                    self.api_handler.debug_capture.dump(f"Opslaan {omschrijving} mislukt")
+                return MISLUKT, None, {}
+            return OPGESLAGEN, product_id or nieuw_id, wijzigingen
+        
+        return MISLUKT, None, {}
+    
+    def _meld_onbekend(self, onbekend):
+        """Waarschuw één keer per veld dat niet in het RentPro formulier voorkomt"""
+        for veld_id in onbekend:
+            if veld_id not in self._gemeld_onbekend:
+                self._gemeld_onbekend.add(veld_id)
+                logger.logWaarschuwing(f"Veld '{veld_id}' komt niet voor in het RentPro formulier, wordt overgeslagen")